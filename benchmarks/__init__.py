@@ -0,0 +1,8 @@
+"""Pofy benchmark suite.
+
+Run it with python -m benchmarks, see python -m benchmarks --help. Each case
+generates a synthetic document exercising a loader hot path, and measures load
+throughput, latency distribution and peak memory, compared to yaml.safe_load
+on the same input. Results are written as JSON, so runs of different commits
+can be compared with the --compare option.
+"""
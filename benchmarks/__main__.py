@@ -0,0 +1,117 @@
+"""Benchmark suite entry point."""
+from argparse import ArgumentParser
+from json import dump
+from json import load
+from pathlib import Path
+from platform import python_implementation
+from platform import python_version
+from subprocess import CalledProcessError
+from subprocess import DEVNULL
+from subprocess import check_output
+from sys import stderr
+from sys import stdout
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from yaml import __version__ as pyyaml_version
+
+from pofy import LIBYAML_AVAILABLE
+
+from benchmarks.cases import CASES
+from benchmarks.runner import run_case
+
+
+def main() -> None:
+    """Run the benchmarks, and write results as JSON."""
+    parser = ArgumentParser(
+        prog='python -m benchmarks',
+        description='Measure pofy loading performances.'
+    )
+    parser.add_argument(
+        '-c', '--case', action='append', dest='cases',
+        choices=[case.name for case in CASES],
+        help='Case to run, can be given several times. Runs all by default.'
+    )
+    parser.add_argument(
+        '-n', '--iterations', type=int, default=20,
+        help='Count of measured loads per case.'
+    )
+    parser.add_argument(
+        '-w', '--warmup', type=int, default=2,
+        help='Count of loads run before measuring.'
+    )
+    parser.add_argument(
+        '-o', '--output', type=Path,
+        help='File to write JSON results to. Defaults to standard output.'
+    )
+    parser.add_argument(
+        '--compare', type=Path,
+        help='JSON results of a previous run to compare with. The '
+             'comparison is printed on standard error.'
+    )
+    args = parser.parse_args()
+
+    results = {
+        'commit': _get_commit(),
+        'python': '{} {}'.format(python_implementation(), python_version()),
+        'pyyaml': pyyaml_version,
+        'libyaml': LIBYAML_AVAILABLE,
+        'cases': [],
+    }
+    for case in CASES:
+        if args.cases and case.name not in args.cases:
+            continue
+        results['cases'].append(
+            run_case(case, args.iterations, args.warmup)
+        )
+
+    if args.output is not None:
+        with open(args.output, 'w') as output_file:
+            dump(results, output_file, indent=2)
+    else:
+        dump(results, stdout, indent=2)
+        stdout.write('\n')
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as previous_file:
+            _print_comparison(load(previous_file), results)
+
+
+def _get_commit() -> Optional[str]:
+    try:
+        command = ['git', 'rev-parse', 'HEAD']
+        output = check_output(command, stderr=DEVNULL)
+        return output.decode('utf-8').strip()
+    except (CalledProcessError, OSError):
+        return None
+
+
+def _print_comparison(
+    previous: Dict[str, Any],
+    current: Dict[str, Any]
+) -> None:
+    previous_cases = {case['name']: case for case in previous['cases']}
+    lines: List[str] = [
+        '{:<16}{:>14}{:>14}{:>10}'.format(
+            'case', 'previous (s)', 'current (s)', 'change'
+        )
+    ]
+    for case in current['cases']:
+        previous_case = previous_cases.get(case['name'])
+        if previous_case is None:
+            continue
+
+        before = previous_case['latency']['median']
+        after = case['latency']['median']
+        lines.append('{:<16}{:>14.4f}{:>14.4f}{:>+9.1f}%'.format(
+            case['name'], before, after, (after / before - 1) * 100
+        ))
+
+    # Printed on standard error, as standard output can hold JSON results.
+    print('\n'.join(lines), file=stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""Benchmark cases & synthetic document generators.
+
+Each case writes its input files (if any) in a scratch directory, and returns
+the YAML source to load, along with the class and loader options to use.
+Generators are deterministic, so that results of different runs can be
+compared.
+"""
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Type
+
+from pofy import BaseField
+from pofy import BoolField
+from pofy import DictField
+from pofy import FloatField
+from pofy import IntField
+from pofy import ListField
+from pofy import ObjectField
+from pofy import StringField
+from pofy.tag_handlers.merge_handler import MergeHandler
+from pofy.tag_handlers.switch_handler import SwitchHandler
+
+
+class CaseInput:
+    """Input of a benchmark case.
+
+    Members:
+        source: The YAML document to load.
+        object_class: Class of the loaded object.
+        root_field: Field used to load the root node, if object_class isn't
+                    enough to infer it.
+        loader_options: Keyword arguments given to the pofy.Loader.
+        files: Additional YAML files read when loading the document (imported
+               or globbed), that the yaml.safe_load baseline loads too.
+        object_count: Count of objects built by the load, used to report the
+                      memory retained per object.
+
+    """
+
+    def __init__(
+        self,
+        source: str,
+        object_class: Type[Any],
+        loader_options: Optional[Dict[str, Any]] = None,
+        files: Optional[List[Path]] = None,
+        root_field: Optional[BaseField] = None,
+        object_count: Optional[int] = None
+    ):
+        """Initialize the case input. See class documentation for args."""
+        self.source = source
+        self.object_class = object_class
+        self.root_field = root_field
+        self.loader_options = loader_options if loader_options else {}
+        self.files = files if files is not None else []
+        self.object_count = object_count
+
+
+class Case:
+    """A named benchmark case.
+
+    Members:
+        name: Name of the case, used to select it and to compare results.
+        description: What the case exercises.
+        setup: Function generating the case input in the given directory.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        setup: Callable[[Path], CaseInput]
+    ):
+        """Initialize the case. See class documentation for args."""
+        self.name = name
+        self.description = description
+        self.setup = setup
+
+
+# Schema of an object with many scalar fields of all types.
+_WIDE_FIELD_COUNT = 100
+_WideSchema = type('Schema', (), {
+    'field_{}'.format(index): [
+        StringField(),
+        IntField(),
+        FloatField(),
+        BoolField()
+    ][index % 4]
+    for index in range(_WIDE_FIELD_COUNT)
+})
+WideObject = type('WideObject', (), {'Schema': _WideSchema})
+
+
+class TreeObject:
+    """Recursive object, used for deep nesting."""
+
+    class Schema:
+        """Pofy fields, children is defined below."""
+
+        value = IntField()
+        name = StringField()
+
+
+TreeObject.Schema.children = ListField(  # type: ignore
+    ObjectField(TreeObject)
+)
+
+
+class Collections:
+    """Object holding long collections."""
+
+    class Schema:
+        """Pofy fields."""
+
+        values = ListField(IntField())
+        mapping = DictField(StringField())
+
+
+class Item:
+    """Small object loaded many times."""
+
+    class Schema:
+        """Pofy fields."""
+
+        name = StringField()
+        count = IntField(minimum=0)
+        ratio = FloatField()
+        enabled = BoolField()
+        tags = ListField(StringField())
+
+
+class ItemList:
+    """List of items, possibly imported from other files."""
+
+    class Schema:
+        """Pofy fields."""
+
+        items = ListField(ObjectField(Item))
+
+
+class Point:
+    """Tiny object, loaded in large amounts."""
+
+    class Schema:
+        """Pofy fields."""
+
+        x = IntField()
+        y = IntField()
+        z = IntField()
+        label = StringField()
+
+
+def _scalar_value(field_index: int, value: int) -> str:
+    return [
+        'value_{}'.format(value),
+        str(value),
+        '{}.5'.format(value),
+        'true' if value % 2 else 'false'
+    ][field_index % 4]
+
+
+def _item(index: int, indent: str = '  ') -> str:
+    return (
+        '{indent}name: item_{index}\n'
+        '{indent}count: {index}\n'
+        '{indent}ratio: {index}.25\n'
+        '{indent}enabled: {enabled}\n'
+        '{indent}tags: [tag_a, tag_b]\n'
+    ).format(indent=indent, index=index,
+             enabled='true' if index % 2 else 'false')
+
+
+def _setup_wide_objects(__: Path) -> CaseInput:
+    lines = []
+    for object_index in range(200):
+        lines.append('-\n')
+        for index in range(_WIDE_FIELD_COUNT):
+            lines.append('  field_{}: {}\n'.format(
+                index,
+                _scalar_value(index, object_index)
+            ))
+
+    return CaseInput(
+        ''.join(lines),
+        list,
+        root_field=ListField(ObjectField(WideObject))
+    )
+
+
+def _setup_deep_nesting(__: Path) -> CaseInput:
+    depth = 40
+    lines = ['children:\n']
+    for tree_index in range(50):
+        indent = '  '
+        for level in range(depth):
+            lines.append('{}- value: {}\n'.format(indent, level))
+            lines.append('{}  name: tree_{}\n'.format(indent, tree_index))
+            lines.append('{}  children:\n'.format(indent))
+            indent += '    '
+        lines.append('{}[]\n'.format(indent))
+
+    return CaseInput(''.join(lines), TreeObject)
+
+
+def _setup_long_list(__: Path) -> CaseInput:
+    source = 'values:\n' + ''.join(
+        '  - {}\n'.format(index) for index in range(100000)
+    )
+    return CaseInput(source, Collections)
+
+
+def _setup_long_dict(__: Path) -> CaseInput:
+    source = 'mapping:\n' + ''.join(
+        '  key_{0}: value_{0}\n'.format(index) for index in range(50000)
+    )
+    return CaseInput(source, Collections)
+
+
+def _setup_import_tree(directory: Path) -> CaseInput:
+    files = []
+    for group_index in range(20):
+        group_lines = []
+        for leaf_index in range(10):
+            leaf_path = directory / 'leaf_{}_{}.yaml'.format(group_index,
+                                                             leaf_index)
+            leaf_path.write_text(_item(leaf_index, ''))
+            files.append(leaf_path)
+            group_lines.append('- !import {}\n'.format(leaf_path.name))
+
+        group_path = directory / 'group_{}.yaml'.format(group_index)
+        group_path.write_text(''.join(group_lines))
+        files.append(group_path)
+
+    # Each group is a list of imported items, merged in the root list.
+    source = 'items: !merge\n' + ''.join(
+        '  - !import group_{}.yaml\n'.format(index) for index in range(20)
+    )
+    return CaseInput(source, ItemList, {
+        'resolve_roots': [directory],
+        'tag_handlers': [MergeHandler()],
+    }, files)
+
+
+def _setup_glob_tree(directory: Path) -> CaseInput:
+    files = []
+    item_directory = directory / 'items'
+    item_directory.mkdir()
+    for index in range(500):
+        path = item_directory / 'item_{:04}.yaml'.format(index)
+        path.write_text(_item(index, ''))
+        files.append(path)
+
+    return CaseInput('items: !glob items/*.yaml\n', ItemList, {
+        'resolve_roots': [directory],
+    }, files)
+
+
+def _setup_tag_dense(__: Path) -> CaseInput:
+    lines = ['items:\n']
+    for index in range(1000):
+        lines += [
+            '  - name: !if(flag) item_{}\n'.format(index),
+            '    count: !switch [!if(missing) -1, {}]\n'.format(index),
+            '    ratio: !if(flag) {}.5\n'.format(index),
+            '    enabled: !if(missing) true\n',
+            '    tags: !merge [[tag_a], !if(flag) [tag_b]]\n',
+        ]
+
+    return CaseInput(''.join(lines), ItemList, {
+        'flags': {'flag'},
+        'tag_handlers': [MergeHandler(), SwitchHandler()],
+    })
+
+
+def _setup_error_heavy(__: Path) -> CaseInput:
+    lines = ['items:\n']
+    for index in range(1000):
+        lines += [
+            '  - name: [not, a, string]\n',
+            '    count: -{}\n'.format(index),
+            '    ratio: not_a_float\n',
+            '    enabled: maybe\n',
+            '    unknown: value\n',
+        ]
+
+    return CaseInput(''.join(lines), ItemList, {
+        'error_handler': _ignore_error,
+    })
+
+
+def _setup_small_objects(__: Path) -> CaseInput:
+    return _get_points_input(slots=False)
+
+
+def _setup_slotted_objects(__: Path) -> CaseInput:
+    return _get_points_input(slots=True)
+
+
+def _get_points_input(slots: bool) -> CaseInput:
+    count = 20000
+    source = ''.join(
+        '- {{x: {0}, y: {1}, z: {2}, label: point_{0}}}\n'.format(
+            index, index * 2, index * 3
+        )
+        for index in range(count)
+    )
+    return CaseInput(
+        source,
+        list,
+        root_field=ListField(ObjectField(Point, slots=slots)),
+        object_count=count
+    )
+
+
+def _ignore_error(*__: Any) -> None:
+    pass
+
+
+CASES = [
+    Case('wide_objects', '200 objects with 100 scalar fields each',
+         _setup_wide_objects),
+    Case('deep_nesting', '50 trees of 40 nested objects',
+         _setup_deep_nesting),
+    Case('long_list', 'ListField of 100k integers', _setup_long_list),
+    Case('long_dict', 'DictField of 50k strings', _setup_long_dict),
+    Case('import_tree', '20 imported files, importing 10 files each',
+         _setup_import_tree),
+    Case('glob_tree', '500 globbed files', _setup_glob_tree),
+    Case('tag_dense', '1000 objects with tags on every field',
+         _setup_tag_dense),
+    Case('error_heavy', '1000 objects where every field is invalid',
+         _setup_error_heavy),
+    Case('small_objects', '20k objects with 4 scalar fields',
+         _setup_small_objects),
+    Case('slotted_objects', 'Same as small_objects, with slots=True',
+         _setup_slotted_objects),
+]
@@ -0,0 +1,200 @@
+"""Benchmark measurement functions."""
+from gc import collect
+from pathlib import Path
+from statistics import mean
+from statistics import median
+from statistics import pstdev
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory
+from tracemalloc import start as start_tracemalloc
+from tracemalloc import stop as stop_tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from yaml import MappingNode
+from yaml import Node
+from yaml import SequenceNode
+from yaml import compose
+from yaml import load
+
+from pofy import Loader
+from pofy.parser_backend import ParserBackend
+from pofy.parser_backend import get_loader_class
+
+from benchmarks.cases import Case
+from benchmarks.cases import CaseInput
+
+
+def run_case(case: Case, iterations: int, warmup: int) -> Dict[str, Any]:
+    """Run a benchmark case.
+
+    Args:
+        case: The case to run.
+        iterations: Count of measured loads.
+        warmup: Count of loads run before measuring.
+
+    Return:
+        A JSON serializable dictionary holding the results.
+
+    """
+    with TemporaryDirectory() as directory:
+        case_input = case.setup(Path(directory))
+        load_pofy = _get_pofy_function(case_input)
+        load_baseline = _get_baseline_function(case_input)
+        node_count = _count_input_nodes(case_input)
+
+        latencies = _measure_latencies(load_pofy, iterations, warmup)
+        baseline_latencies = _measure_latencies(load_baseline, iterations,
+                                                warmup)
+        peak_memory, retained_memory = _measure_memory(load_pofy)
+        baseline_peak_memory, __ = _measure_memory(load_baseline)
+
+    pofy_median = median(latencies)
+    baseline_median = median(baseline_latencies)
+    results = {
+        'name': case.name,
+        'description': case.description,
+        'nodes': node_count,
+        'iterations': iterations,
+        'nodes_per_second': node_count / pofy_median,
+        'latency': _get_distribution(latencies),
+        'peak_memory_bytes': peak_memory,
+        'retained_memory_bytes': retained_memory,
+        'baseline': {
+            'nodes_per_second': node_count / baseline_median,
+            'latency': _get_distribution(baseline_latencies),
+            'peak_memory_bytes': baseline_peak_memory,
+        },
+        'ratio_to_safe_load': pofy_median / baseline_median,
+    }
+    if case_input.object_count is not None:
+        results['bytes_per_object'] = \
+            retained_memory / case_input.object_count
+
+    return results
+
+
+def _get_pofy_function(case_input: CaseInput) -> Callable[[], Any]:
+    # The loader is created once : the benchmark measures loading, not the
+    # setup of tag handlers.
+    loader = Loader(**case_input.loader_options)
+    source = case_input.source
+    object_class = case_input.object_class
+    root_field = case_input.root_field
+
+    def _load() -> Any:
+        return loader.load(source, object_class, root_field)
+
+    return _load
+
+
+def _get_baseline_function(case_input: CaseInput) -> Callable[[], Any]:
+    # The baseline uses the same parser backend as pofy, and loads the
+    # imported or globbed files too. Custom tags are ignored.
+    loader_class = _get_baseline_loader_class()
+
+    def _load() -> Any:
+        result = load(case_input.source, Loader=loader_class)
+        for path in case_input.files:
+            with open(path, 'r') as yaml_file:
+                load(yaml_file, Loader=loader_class)
+        return result
+
+    return _load
+
+
+def _get_baseline_loader_class() -> Any:
+    base_class = get_loader_class(ParserBackend.AUTO)
+
+    def _construct_tagged(loader: Any, __: str, node: Node) -> Any:
+        if isinstance(node, MappingNode):
+            return loader.construct_mapping(node)
+        if isinstance(node, SequenceNode):
+            return loader.construct_sequence(node)
+        return loader.construct_scalar(node)
+
+    loader_class = type('BaselineLoader', (base_class,), {})
+    loader_class.add_multi_constructor('!', _construct_tagged)
+    return loader_class
+
+
+def _count_input_nodes(case_input: CaseInput) -> int:
+    count = _count_nodes(compose(case_input.source))
+    for path in case_input.files:
+        with open(path, 'r') as yaml_file:
+            count += _count_nodes(compose(yaml_file))
+
+    return count
+
+
+def _count_nodes(node: Node) -> int:
+    if node is None:
+        return 0
+
+    count = 1
+    if isinstance(node, MappingNode):
+        for key, value in node.value:
+            count += _count_nodes(key) + _count_nodes(value)
+    elif isinstance(node, SequenceNode):
+        for item in node.value:
+            count += _count_nodes(item)
+
+    return count
+
+
+def _measure_latencies(
+    function: Callable[[], Any],
+    iterations: int,
+    warmup: int
+) -> List[float]:
+    for __ in range(warmup):
+        function()
+
+    latencies = []
+    for __ in range(iterations):
+        collect()
+        start = perf_counter()
+        function()
+        latencies.append(perf_counter() - start)
+
+    return latencies
+
+
+def _measure_memory(function: Callable[[], Any]) -> Tuple[int, int]:
+    # Tracing memory slows execution down, so it's measured in a separate
+    # run. The result is kept alive until memory is read : once garbage from
+    # the load is collected, the current traced memory is the memory retained
+    # by the result.
+    collect()
+    start_tracemalloc()
+    try:
+        result = function()
+        collect()
+        retained, peak = get_traced_memory()
+        del result
+    finally:
+        stop_tracemalloc()
+
+    return (peak, retained)
+
+
+def _get_distribution(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        'min': ordered[0],
+        'median': median(ordered),
+        'p90': _percentile(ordered, 0.9),
+        'p99': _percentile(ordered, 0.99),
+        'max': ordered[-1],
+        'mean': mean(ordered),
+        'stdev': pstdev(ordered),
+    }
+
+
+def _percentile(ordered: List[float], ratio: float) -> float:
+    index = min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))
+    return ordered[index]
@@ -5,6 +5,8 @@ from .common import ErrorCode
 from .common import ErrorHandler
 from .common import FieldNotDeclaredError
 from .common import ImportNotFoundError
+from .common import LoadError
+from .common import LoadOutcome
 from .common import UNDEFINED
 from .common import MissingRequiredFieldError
 from .common import MultipleMatchingHandlersError
@@ -14,8 +16,15 @@ from .common import SchemaError
 from .common import TypeResolveError
 from .common import UnexpectedNodeTypeError
 from .common import ValidationError
+from .common import YamlSource
 from .common import get_exception_type
 
+from .document_cache import DocumentCache
+
+from .error_collector import ErrorCollector
+from .error_collector import ErrorRecord
+
+from .fields.array_field import ArrayField
 from .fields.base_field import BaseField
 from .fields.bool_field import BoolField
 from .fields.dict_field import DictField
@@ -23,13 +32,35 @@ from .fields.enum_field import EnumField
 from .fields.float_field import FloatField
 from .fields.int_field import IntField
 from .fields.list_field import ListField
+from .fields.object_field import Construction
 from .fields.object_field import ObjectField
 from .fields.path_field import PathField
 from .fields.string_field import StringField
 
+from .load_manifest import FileRecord
+from .load_manifest import LoadManifest
+from .load_profiler import LoadProfiler
+from .load_stats import LoadStats
+
+from .loader import Loader
 from .loader import load
+from .loader import load_all
+from .loader import load_many
 from .loading_context import LoadingContext
 
+from .parser_backend import LIBYAML_AVAILABLE
+from .parser_backend import ParserBackend
+from .parser_backend import resolve_parser_backend
+
+from .reload_state import ReloadState
+
+from .result_cache import ResultCache
+
+from .schema_plan import SchemaPlan
+from .schema_plan import SchemaPlanCache
+from .schema_plan import field_fingerprint
+from .schema_plan import schema_fingerprint
+
 from .tag_handlers.env_handler import EnvHandler
 from .tag_handlers.glob_handler import GlobHandler
 from .tag_handlers.import_handler import ImportHandler
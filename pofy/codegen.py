@@ -0,0 +1,247 @@
+"""Generation of specialized object loaders.
+
+For each schema plan, a loader function is generated and compiled with exec.
+It dispatches mapping keys to per-field loading functions using a dictionary,
+and inlines the conversion of built-in scalar fields, bypassing the loading
+context for untagged scalar nodes. Whenever the fast path can't be taken (tag,
+unexpected node type, conversion or validation failure), the field is loaded
+through the loading context, so errors are reported exactly as they would be
+without generated code.
+"""
+from gettext import gettext as _
+from keyword import iskeyword
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import cast
+
+from yaml import Node
+from yaml import ScalarNode
+
+from pofy.common import ErrorCode
+from pofy.common import UNDEFINED
+from pofy.fields.base_field import BaseField
+from pofy.fields.bool_field import BoolField
+from pofy.fields.enum_field import EnumField
+from pofy.fields.float_field import FloatField
+from pofy.fields.int_field import IntField
+from pofy.fields.string_field import StringField
+from pofy.interfaces import ILoadingContext
+
+# Load the fields of the mapping node in the result object (or dictionary), and
+# return the names of the fields set in YAML.
+ObjectLoader = Callable[[ILoadingContext, Node, Any], Set[str]]
+
+_LOADER_TEMPLATE = '''\
+def load_object(context, node, result):
+    set_fields = set()
+    add_field = set_fields.add
+    for key_node, value_node in node.value:
+        if type(key_node) is ScalarNode and key_node.tag[:1] != '!':
+            key = key_node.value
+        else:
+            if context.load(key_field, key_node) is UNDEFINED:
+                continue
+            key = key_node.value
+
+        add_field(key)
+        load_value = dispatch.get(key)
+        if load_value is None:
+            context.error(FIELD_NOT_DECLARED, not_declared_message, key)
+            continue
+
+        load_value(context, value_node, result)
+
+    return set_fields
+'''
+
+_GENERIC_TEMPLATE = '''\
+def load_{index}(context, node, result):
+    value = context.load(field_{index}, node)
+    if value is not UNDEFINED:
+        {assign}
+'''
+
+_SCALAR_TEMPLATE = '''\
+def load_{index}(context, node, result):
+    if type(node) is ScalarNode and node.tag[:1] != '!':
+{convert}
+    value = context.load(field_{index}, node)
+    if value is not UNDEFINED:
+        {assign}
+'''
+
+
+def compile_object_loader(
+    fields: Dict[str, BaseField],
+    key_field: BaseField,
+    inline_scalars: bool = True,
+    into_dict: bool = False
+) -> ObjectLoader:
+    """Generate a loader function for the given fields.
+
+    Args:
+        fields: The fields of the object to load, indexed by name.
+        key_field: Field used to load tagged keys.
+        inline_scalars: If False, the conversion of scalar fields isn't
+                        inlined, and all values are loaded through the
+                        loading context.
+        into_dict: If True, the generated function stores values in a
+                   dictionary given instead of the result object, indexed by
+                   field name.
+
+    Return:
+        A function loading a mapping node into an object.
+
+    """
+    namespace: Dict[str, Any] = {
+        'FIELD_NOT_DECLARED': ErrorCode.FIELD_NOT_DECLARED,
+        'ScalarNode': ScalarNode,
+        'UNDEFINED': UNDEFINED,
+        'key_field': key_field,
+        'not_declared_message': _('Field {} is not declared.'),
+    }
+
+    sources = [_LOADER_TEMPLATE]
+    dispatch = {}
+    for index, (name, field) in enumerate(fields.items()):
+        namespace['field_{}'.format(index)] = field
+        sources.append(
+            _get_field_source(index, name, field, namespace, inline_scalars,
+                              into_dict)
+        )
+        dispatch[name] = 'load_{}'.format(index)
+
+    code = compile('\n'.join(sources), '<pofy generated loader>', 'exec')
+    exec(code, namespace) # pylint: disable=exec-used
+
+    namespace['dispatch'] = {
+        name: namespace[function_name]
+        for name, function_name in dispatch.items()
+    }
+
+    return cast(ObjectLoader, namespace['load_object'])
+
+
+def _get_field_source(
+    index: int,
+    name: str,
+    field: BaseField,
+    namespace: Dict[str, Any],
+    inline_scalars: bool,
+    into_dict: bool
+) -> str:
+    if into_dict:
+        assign = 'result[{!r}] = value'.format(name)
+    elif name.isidentifier() and not iskeyword(name):
+        assign = 'result.{} = value'.format(name)
+    else:
+        namespace['name_{}'.format(index)] = name
+        assign = 'setattr(result, name_{}, value)'.format(index)
+
+    convert = None
+    if inline_scalars:
+        convert = _get_convert_lines(index, field, namespace)
+
+    if convert is None:
+        return _GENERIC_TEMPLATE.format(index=index, assign=assign)
+
+    # The fast path is wrapped in a loop, so that conversion lines can break
+    # out of it to fall back to the generic path.
+    convert_lines = ['while True:']
+    convert_lines += ['    ' + line for line in convert + [assign, 'return']]
+    return _SCALAR_TEMPLATE.format(
+        index=index,
+        convert='\n'.join(' ' * 8 + line for line in convert_lines),
+        assign=assign
+    )
+
+
+# pylint: disable=protected-access
+def _get_convert_lines(
+    index: int,
+    field: BaseField,
+    namespace: Dict[str, Any]
+) -> Optional[List[str]]:
+    """Return the lines converting node.value to value, or None.
+
+    Lines should break out of the enclosing loop if the value can't be
+    converted, so that the field is loaded through the generic path.
+    """
+    # Custom validation callbacks need the node to be pushed in the context.
+    if field._validate is not None:
+        return None
+
+    field_type = type(field)
+    lines: List[str] = []
+    if field_type is StringField:
+        assert isinstance(field, StringField)
+        lines.append('value = node.value')
+        if field._pattern is not None:
+            namespace['pattern_{}'.format(index)] = field._pattern.match
+            lines.append('if not pattern_{}(value): break'.format(index))
+        if field._choices is not None:
+            namespace['choices_{}'.format(index)] = field._choices
+            lines.append('if value not in choices_{}: break'.format(index))
+
+    elif field_type is IntField:
+        assert isinstance(field, IntField)
+        lines += [
+            'try: value = int(node.value, {})'.format(field._base),
+            'except ValueError: break',
+        ]
+        lines += _get_bounds_lines(index, field._minimum, field._maximum,
+                                   namespace)
+
+    elif field_type is FloatField:
+        assert isinstance(field, FloatField)
+        lines += [
+            'try: value = float(node.value)',
+            'except ValueError: break',
+        ]
+        lines += _get_bounds_lines(index, field._minimum, field._maximum,
+                                   namespace)
+
+    elif field_type is BoolField:
+        assert isinstance(field, BoolField)
+        namespace['values_{}'.format(index)] = field._values
+        lines += [
+            'value = values_{}.get(node.value)'.format(index),
+            'if value is None: break',
+        ]
+
+    elif field_type is EnumField:
+        assert isinstance(field, EnumField)
+        namespace['values_{}'.format(index)] = field._values
+        key = 'node.value' if field._case_sensitive else 'node.value.lower()'
+        lines += [
+            'value = values_{}.get({})'.format(index, key),
+            'if value is None: break',
+        ]
+
+    else:
+        return None
+
+    return lines
+
+
+def _get_bounds_lines(
+    index: int,
+    minimum: Any,
+    maximum: Any,
+    namespace: Dict[str, Any]
+) -> List[str]:
+    lines = []
+    if minimum is not None:
+        namespace['minimum_{}'.format(index)] = minimum
+        lines.append('if value < minimum_{}: break'.format(index))
+
+    if maximum is not None:
+        namespace['maximum_{}'.format(index)] = maximum
+        lines.append('if value > maximum_{}: break'.format(index))
+
+    return lines
+
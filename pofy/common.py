@@ -3,7 +3,10 @@ from enum import Enum
 from inspect import getmembers
 from inspect import isclass
 from typing import Any
+from pathlib import Path
+from typing import IO
 from typing import Callable
+from typing import List
 from typing import Optional
 from typing import Type
 from typing import TypeVar
@@ -16,6 +19,10 @@ from yaml import Node
 class Undefined:
     """Dummy type representing a failed loading, used for type hints."""
 
+    def __reduce__(self) -> str:
+        """Unpickle as the UNDEFINED singleton, so identity checks work."""
+        return 'UNDEFINED'
+
 
 # Unique symbol used to differentiate an error from a valid None return when
 # loading a field.
@@ -23,6 +30,8 @@ UNDEFINED = Undefined()
 ObjectType = TypeVar('ObjectType')
 LoadResult = Union[ObjectType, Undefined]
 SchemaResolver = Callable[[Type[Any]], Optional[Type[Any]]]
+# YAML content, path to a YAML file, or text or binary stream.
+YamlSource = Union[str, bytes, Path, IO[str], IO[bytes]]
 
 
 def default_schema_resolver(cls: Type[Any]) -> Optional[Type[Any]]:
@@ -140,6 +149,79 @@ class SchemaError(PofyError):
     """Exception type raised for MULTIPLE_MATCHING_HANDLER error code."""
 
 
+class LoadError:
+    """Error collected while loading a document.
+
+    Unlike PofyError, it doesn't reference the YAML node, so it can be sent
+    across processes.
+
+    Members:
+        code: The error code, or None for YAML syntax errors and other
+              exceptions raised while loading.
+        message: The error description message.
+        location: Name of the document in which the error occured, if known.
+        line: Line of the error, starting at 0.
+        column: Column of the error, starting at 0.
+
+    """
+
+    def __init__(
+        self,
+        code: Optional[ErrorCode],
+        message: str,
+        location: Optional[str],
+        line: int,
+        column: int
+    ):
+        """Initialize the error. See class documentation for arguments."""
+        self.code = code
+        self.message = message
+        self.location = location
+        self.line = line
+        self.column = column
+
+    def __str__(self) -> str:
+        """Format the error the same way PofyError does."""
+        location = self.location if self.location is not None \
+            else '<Unkwnown>'
+        return '{file}:{line}:{column} : {message}'.format(
+            file=location,
+            line=self.line,
+            column=self.column,
+            message=self.message
+        )
+
+
+class LoadOutcome:
+    """Result of the loading of one of the sources given to load_many.
+
+    Members:
+        index: Index of the source in the sequence given to load_many.
+        location: Path of the source if it was a file, None otherwise.
+        result: The loaded object, or UNDEFINED if loading failed.
+        errors: The errors reported while loading the source.
+
+    """
+
+    def __init__(
+        self,
+        index: int,
+        location: Optional[str],
+        result: Any,
+        errors: List[LoadError]
+    ):
+        """Initialize the outcome. See class documentation for arguments."""
+        self.index = index
+        self.location = location
+        self.result = result
+        self.errors = errors
+
+    @property
+    def succeeded(self) -> bool:
+        """True if the source was loaded without any error."""
+        return self.result is not UNDEFINED and len(self.errors) == 0
+
+
 _CODE_TO_EXCEPTION_TYPE_MAPPING = {
     ErrorCode.BAD_TYPE_TAG_FORMAT: BadTypeFormatError,
     ErrorCode.FIELD_NOT_DECLARED: FieldNotDeclaredError,
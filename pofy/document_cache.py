@@ -0,0 +1,170 @@
+"""Cache of composed YAML documents.
+
+Imported or globbed files are often shared between several loadings. A
+DocumentCache keeps the composed nodes of those files, so they're parsed only
+once, as long as they don't change on disk.
+
+Cached nodes are handed out without being copied, they must be considered as
+immutable : tag handlers and fields should create new nodes instead of
+modifying the ones they load.
+"""
+from collections import OrderedDict
+from gettext import gettext as _
+from os import stat
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from yaml import Node
+
+# Modification time in nanoseconds, size & inode of a file.
+FileVersion = Tuple[int, int, int]
+
+
+class DocumentCache:
+    """Size-bounded LRU cache of composed YAML documents.
+
+    Documents are indexed by their resolved path, and are considered stale
+    when the modification time, size or inode of the file changes. The cache
+    is thread-safe, and can be shared between several calls to load.
+    """
+
+    def __init__(self, max_size: int = 256):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum count of documents to keep. When it's reached,
+                      the least recently used document is evicted.
+
+        """
+        assert max_size > 0, _('max_size must be strictly positive.')
+        self._max_size = max_size
+        self._lock = Lock()
+        self._entries: 'OrderedDict[str, Tuple[FileVersion, Node]]' = \
+            OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the cache configuration only, without cached documents.
+
+        This allows sending a cache to worker processes, which start with an
+        empty cache.
+        """
+        return {'max_size': self._max_size}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore an empty cache from pickled configuration."""
+        self.__init__(state['max_size'])  # type: ignore
+
+    @property
+    def hits(self) -> int:
+        """Count of documents returned from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Count of documents that had to be composed."""
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Count of documents dropped because the cache was full."""
+        return self._evictions
+
+    def __len__(self) -> int:
+        """Return the count of cached documents."""
+        return len(self._entries)
+
+    def get_document(
+        self,
+        path: Path,
+        compose: Callable[[], Optional[Node]]
+    ) -> Optional[Node]:
+        """Get the document at the given path, composing it if needed.
+
+        Args:
+            path: Path of the YAML document.
+            compose: Function composing the document, called if it's not
+                     cached or is stale. If it returns None, nothing is
+                     cached.
+
+        Return:
+            The root node of the document, or None if compose failed.
+
+        """
+        return self.get_documents([path], lambda __: [compose()])[0]
+
+    def get_documents(
+        self,
+        paths: Sequence[Path],
+        compose: Callable[[List[Path]], List[Optional[Node]]]
+    ) -> List[Optional[Node]]:
+        """Get several documents, composing all missing ones at once.
+
+        Args:
+            paths: Paths of the YAML documents.
+            compose: Function composing the documents at the given paths,
+                     called once with all paths that aren't cached or are
+                     stale, and returning the root nodes in the same order.
+                     None nodes aren't cached.
+
+        Return:
+            The root nodes of the documents, in the order of paths.
+
+        """
+        keys = [str(path.resolve()) for path in paths]
+        versions = [get_file_version(key) for key in keys]
+        result: List[Optional[Node]] = [None] * len(paths)
+        missing: List[int] = []
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == versions[index]:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    result[index] = entry[1]
+                else:
+                    self._misses += 1
+                    missing.append(index)
+
+        if len(missing) == 0:
+            return result
+
+        nodes = compose([paths[index] for index in missing])
+        assert len(nodes) == len(missing)
+
+        with self._lock:
+            for index, node in zip(missing, nodes):
+                result[index] = node
+                if node is None:
+                    continue
+
+                key = keys[index]
+                self._entries[key] = (versions[index], node)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached documents. Counters are left untouched."""
+        with self._lock:
+            self._entries.clear()
+
+
+def get_file_version(path: str) -> FileVersion:
+    """Return the modification time, size and inode of the given file."""
+    file_stat = stat(path)
+    return (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
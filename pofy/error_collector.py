@@ -0,0 +1,160 @@
+"""Error collector class & utilities.
+
+By default, the first error reported while loading raises a PofyError, and
+error handlers receive formatted messages. An ErrorCollector given as error
+handler instead records all errors as compact records, holding the message
+format and its arguments : messages are formatted only when they're read.
+"""
+from gettext import gettext as _
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from yaml import Node
+from yaml.error import Mark
+
+from pofy.common import ErrorCode
+
+
+class ErrorRecord:
+    """An error recorded by an ErrorCollector.
+
+    Members:
+        code: The error code.
+        mark: Start mark of the node on which the error occured.
+        message_format: The error message format.
+        args, kwargs: Arguments used to format the message. They're kept as
+                      given, so objects modified after the error was reported
+                      are formatted with their new value.
+
+    """
+
+    __slots__ = ('code', 'mark', 'message_format', 'args', 'kwargs')
+
+    def __init__(
+        self,
+        code: ErrorCode,
+        mark: Mark,
+        message_format: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any]
+    ):
+        """Initialize the record. See class documentation for arguments."""
+        self.code = code
+        self.mark = mark
+        self.message_format = message_format
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def message(self) -> str:
+        """The formatted error message."""
+        return self.message_format.format(*self.args, **self.kwargs)
+
+    @property
+    def location(self) -> Optional[str]:
+        """Name of the document in which the error occured, if known."""
+        return getattr(self.mark, 'name', None)
+
+    @property
+    def line(self) -> int:
+        """Line of the error, starting at 0."""
+        return int(self.mark.line)
+
+    @property
+    def column(self) -> int:
+        """Column of the error, starting at 0."""
+        return int(self.mark.column)
+
+    def __str__(self) -> str:
+        """Format the error the same way PofyError does."""
+        return '{file}:{line}:{column} : {message}'.format(
+            file=getattr(self.mark, 'name', '<Unkwnown>'),
+            line=self.mark.line,
+            column=self.mark.column,
+            message=self.message
+        )
+
+
+class ErrorCollector:
+    """Error handler recording errors instead of raising them."""
+
+    def __init__(self, max_errors: Optional[int] = None):
+        """Initialize the collector.
+
+        Args:
+            max_errors: Maximum count of errors to retain. Errors reported
+                        once it's reached are counted, but not recorded. If
+                        None, all errors are recorded.
+
+        """
+        if max_errors is not None:
+            assert max_errors > 0, _('max_errors must be strictly positive.')
+        self._max_errors = max_errors
+        self._records: List[ErrorRecord] = []
+        self._count = 0
+
+    @property
+    def errors(self) -> List[ErrorRecord]:
+        """Recorded errors, in the order they were reported."""
+        return self._records
+
+    @property
+    def count(self) -> int:
+        """Count of reported errors, including the ones not recorded."""
+        return self._count
+
+    @property
+    def truncated(self) -> bool:
+        """True if some errors weren't recorded because of max_errors."""
+        return self._count > len(self._records)
+
+    def __len__(self) -> int:
+        """Return the count of recorded errors."""
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[ErrorRecord]:
+        """Iterate over recorded errors."""
+        return iter(self._records)
+
+    def __call__(self, node: Node, code: ErrorCode, message: str) -> None:
+        """Record an already formatted error.
+
+        This allows using the collector where a regular error handler is
+        expected. The loading context calls collect instead.
+        """
+        self.collect(node, code, '{}', (message,), {})
+
+    def collect(
+        self,
+        node: Node,
+        code: ErrorCode,
+        message_format: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any]
+    ) -> None:
+        """Record an error.
+
+        Args:
+            node: The node on which the error occured.
+            code: The error code.
+            message_format: The error message format.
+            args, kwargs: Arguments used to format the message.
+
+        """
+        self._count += 1
+        max_errors = self._max_errors
+        if max_errors is not None and len(self._records) >= max_errors:
+            return
+
+        self._records.append(
+            ErrorRecord(code, node.start_mark, message_format, args, kwargs)
+        )
+
+    def clear(self) -> None:
+        """Drop all recorded errors, and reset the error count."""
+        self._records = []
+        self._count = 0
@@ -0,0 +1,364 @@
+"""Streaming composition of YAML documents.
+
+pofy fields work on YAML nodes. Composing a whole document before loading it
+means keeping the full node graph in memory while converting it. The
+StreamingComposer instead consumes parser events as fields iterate over
+mapping and sequence nodes : collection nodes are returned with a lazy value,
+whose children are composed on demand and can be garbage collected once
+converted.
+
+Nodes that can be referenced or inspected several times are composed eagerly :
+anchored nodes (they can be referenced by aliases), nodes with a custom tag
+(tag handlers can inspect or copy them) and mapping keys.
+
+Lazy node values are iterated lazily only once : children aren't retained, so
+that they can be garbage collected. Taking the length of a lazy node value or
+indexing it before iterating over it composes all the children and keeps them,
+the value then behaving as a list. If a field skips a lazy node (on error, or
+if it doesn't iterate over it), the remaining children are composed and
+buffered when the next sibling is requested, so they're still available to
+anyone holding the node.
+"""
+from collections import deque
+from gettext import gettext as _
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Type
+
+from yaml import AliasEvent
+from yaml import MappingEndEvent
+from yaml import MappingNode
+from yaml import MappingStartEvent
+from yaml import Node
+from yaml import ScalarEvent
+from yaml import ScalarNode
+from yaml import SequenceEndEvent
+from yaml import SequenceNode
+from yaml import SequenceStartEvent
+from yaml import StreamEndEvent
+from yaml import StreamStartEvent
+from yaml.composer import ComposerError
+
+from pofy.parser_backend import ParserBackend
+from pofy.parser_backend import create_loader
+
+
+class LazyMappingNode(MappingNode):  # type: ignore
+    """Mapping node whose (key, value) pairs are composed on iteration."""
+
+
+class LazySequenceNode(SequenceNode):  # type: ignore
+    """Sequence node whose items are composed on iteration."""
+
+
+class StreamingComposer:
+    """Compose a YAML document lazily, as its nodes are iterated over."""
+
+    def __init__(self, source: Any, backend: ParserBackend):
+        """Initialize the composer.
+
+        Args:
+            source: A string or a stream containing a YAML document.
+            backend: The parser backend to use.
+
+        """
+        self._parser = create_loader(source, backend)
+        self._anchors: Dict[str, Node] = {}
+        self._root: Optional[Node] = None
+
+    def get_root(self) -> Optional[Node]:
+        """Start parsing the document, and return its root node.
+
+        Return:
+            The root node, or None if the document is empty.
+
+        """
+        return self.get_next_root()
+
+    def get_next_root(self) -> Optional[Node]:
+        """Start parsing the next document of the stream.
+
+        Unconsumed nodes of the previous document are buffered.
+
+        Return:
+            The root node of the next document, or None if the end of the
+            stream is reached.
+
+        """
+        parser = self._parser
+        if parser.check_event(StreamStartEvent):
+            parser.get_event()
+
+        if self._root is not None:
+            self._end_document()
+
+        if parser.check_event(StreamEndEvent):
+            return None
+
+        parser.get_event() # Drop the DOCUMENT-START event.
+        self._root = self.compose_node(lazy=True)
+        return self._root
+
+    def close(self) -> None:
+        """Consume the end of the document.
+
+        Unconsumed nodes of the document are buffered, and ComposerError is
+        raised if the stream contains more than one document.
+        """
+        parser = self._parser
+        root = self._root
+        if root is None:
+            return
+
+        self._end_document()
+        if not parser.check_event(StreamEndEvent):
+            event = parser.get_event()
+            raise ComposerError(
+                _('expected a single document in the stream'),
+                root.start_mark,
+                _('but found another document'),
+                event.start_mark
+            )
+
+    def dispose(self) -> None:
+        """Release the parser."""
+        self._parser.dispose()
+
+    def _end_document(self) -> None:
+        assert self._root is not None
+        drain(self._root)
+        self._parser.get_event() # Drop the DOCUMENT-END event.
+        self._root = None
+        self._anchors = {}
+
+    def compose_node(self, lazy: bool) -> Node:
+        """Compose the next node of the stream.
+
+        Args:
+            lazy: If False, the node is fully composed, otherwise collection
+                  nodes are composed lazily, when possible.
+
+        """
+        parser = self._parser
+        if parser.check_event(AliasEvent):
+            event = parser.get_event()
+            anchor = event.anchor
+            if anchor not in self._anchors:
+                raise ComposerError(
+                    None, None,
+                    _('found undefined alias {}').format(anchor),
+                    event.start_mark
+                )
+            return self._anchors[anchor]
+
+        event = parser.peek_event()
+        anchor = event.anchor
+        if anchor is not None:
+            if anchor in self._anchors:
+                raise ComposerError(
+                    _('found duplicate anchor {}; first occurrence')
+                    .format(anchor),
+                    self._anchors[anchor].start_mark,
+                    _('second occurrence'),
+                    event.start_mark
+                )
+            lazy = False
+
+        if event.tag is not None and event.tag.startswith('!'):
+            lazy = False
+
+        if parser.check_event(ScalarEvent):
+            node = self._compose_scalar_node()
+        elif parser.check_event(SequenceStartEvent):
+            node = self._compose_collection_node(
+                SequenceNode,
+                LazySequenceNode,
+                lazy
+            )
+        else:
+            assert parser.check_event(MappingStartEvent)
+            node = self._compose_collection_node(
+                MappingNode,
+                LazyMappingNode,
+                lazy
+            )
+
+        if anchor is not None:
+            self._anchors[anchor] = node
+
+        return node
+
+    def _compose_scalar_node(self) -> Node:
+        event = self._parser.get_event()
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = self._parser.resolve(ScalarNode, event.value, event.implicit)
+
+        return ScalarNode(
+            tag,
+            event.value,
+            event.start_mark,
+            event.end_mark,
+            style=event.style
+        )
+
+    def _compose_collection_node(
+        self,
+        node_class: Type[Node],
+        lazy_node_class: Type[Node],
+        lazy: bool
+    ) -> Node:
+        start_event = self._parser.get_event()
+        tag = start_event.tag
+        if tag is None or tag == '!':
+            tag = self._parser.resolve(node_class, None, start_event.implicit)
+
+        if lazy:
+            node_class = lazy_node_class
+
+        node = node_class(
+            tag,
+            [],
+            start_event.start_mark,
+            None,
+            flow_style=start_event.flow_style
+        )
+
+        children = _LazyChildren(self, node, lazy)
+        if lazy:
+            node.value = children
+        else:
+            node.value = list(children)
+
+        return node
+
+
+def drain(node: Node) -> None:
+    """Compose and buffer the remaining children of a lazy node.
+
+    Does nothing if the node isn't lazy.
+    """
+    if isinstance(node, (LazyMappingNode, LazySequenceNode)):
+        value = node.value
+        assert isinstance(value, _LazyChildren)
+        value.drain()
+
+
+class _LazyChildren:
+    """Iterator composing the children of a collection node on demand.
+
+    It can be iterated lazily once. Its length or items can be read before
+    iterating over it, in which case all the children are composed and kept,
+    and it can then be iterated any number of times.
+    """
+
+    def __init__(
+        self,
+        composer: StreamingComposer,
+        node: Node,
+        lazy: bool
+    ):
+        self._composer = composer
+        self._node = node
+        self._lazy = lazy
+        self._is_mapping = isinstance(node, MappingNode)
+        self._end_event_type = \
+            MappingEndEvent if self._is_mapping else SequenceEndEvent
+        self._last_child: Optional[Node] = None
+        self._buffer: Optional[Deque[Any]] = None
+        self._items: Optional[List[Any]] = None
+        self._started = False
+        self._done = False
+
+    def __iter__(self) -> Iterator[Any]:
+        items = self._items
+        if items is not None:
+            return iter(items)
+
+        if self._started:
+            raise RuntimeError(_(
+                'Children of a streamed YAML node can be iterated only once. '
+                'Read them in a list first to iterate over them again.'
+            ))
+
+        self._started = True
+        return self
+
+    def __next__(self) -> Any:
+        buffer = self._buffer
+        if buffer is not None:
+            if len(buffer) == 0:
+                raise StopIteration
+            return buffer.popleft()
+
+        if self._done:
+            raise StopIteration
+
+        last_child = self._last_child
+        if last_child is not None:
+            # The previous child could have been skipped by the consumer,
+            # its events have to be consumed before going on.
+            drain(last_child)
+            self._last_child = None
+
+        composer = self._composer
+        parser = composer._parser # pylint: disable=protected-access
+        if parser.check_event(self._end_event_type):
+            self._node.end_mark = parser.get_event().end_mark
+            self._done = True
+            raise StopIteration
+
+        if self._is_mapping:
+            key = composer.compose_node(lazy=False)
+            value = composer.compose_node(lazy=self._lazy)
+            self._last_child = value
+            return (key, value)
+
+        item = composer.compose_node(lazy=self._lazy)
+        self._last_child = item
+        return item
+
+    def __len__(self) -> int:
+        return len(self._get_items())
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._get_items()[index]
+
+    def drain(self) -> None:
+        """Buffer all remaining children."""
+        if self._buffer is not None:
+            return
+
+        buffer: Deque[Any] = deque()
+        next_child = self.__next__
+        try:
+            while True:
+                buffer.append(next_child())
+        except StopIteration:
+            pass
+
+        self._buffer = buffer
+
+    def _get_items(self) -> List[Any]:
+        items = self._items
+        if items is not None:
+            return items
+
+        # TypeError, as list() and other consumers asking for a length hint
+        # once iteration started ignore it.
+        if self._started:
+            raise TypeError(_(
+                'Children of a streamed YAML node can\'t be read after they '
+                'were iterated over.'
+            ))
+
+        self.drain()
+        assert self._buffer is not None
+        items = list(self._buffer)
+        self._buffer.clear()
+        self._items = items
+        return items
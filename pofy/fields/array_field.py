@@ -0,0 +1,247 @@
+"""Array field class & utilities.
+
+ArrayField loads numeric sequences into NumPy arrays. NumPy is an optional
+dependency of pofy (pip install pofy[numpy]), this module can be imported
+without it, but ArrayField can't be instantiated.
+"""
+from gettext import gettext as _
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Union
+from typing import cast
+
+from yaml import Node
+from yaml import ScalarNode
+
+from pofy.common import ErrorCode
+from pofy.common import UNDEFINED
+from pofy.fields.base_field import BaseField
+from pofy.fields.base_field import ValidateCallback
+from pofy.fields.float_field import FloatField
+from pofy.fields.int_field import IntField
+from pofy.interfaces import ILoadingContext
+
+# Wether numpy is installed.
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    NUMPY_AVAILABLE = False
+
+Shape = Sequence[Optional[int]]
+
+
+class ArrayField(BaseField):
+    """NumPy array YAML object field.
+
+    Items are converted in a single vectorized pass. When it fails (tagged
+    items, invalid values, notations NumPy can't parse like hexadecimal
+    integers), items are loaded one by one with a FloatField or an IntField,
+    so that errors point at the offending item node.
+    """
+
+    def __init__(
+        self,
+        dtype: Any = 'float64',
+        shape: Optional[Shape] = None,
+        minimum: Optional[Union[int, float]] = None,
+        maximum: Optional[Union[int, float]] = None,
+        required: bool = False,
+        validate: Optional[ValidateCallback] = None
+    ):
+        """Initialize the array field.
+
+        Args:
+            dtype: NumPy data type of the array, must be a float or integer
+                   type.
+            shape: Expected shape of the array. Each dimension is a nested
+                   sequence in YAML. Dimensions set to None accept any
+                   length, but all rows must have the same length. Defaults
+                   to one dimension of any length.
+            minimum: Minimum value of the items. If an item is out of bound,
+                     a VALIDATION_ERROR will be raised. Items are also
+                     checked against the range of dtype.
+            maximum: Maximum value of the items. If an item is out of bound,
+                     a VALIDATION_ERROR will be raised. Items are also
+                     checked against the range of dtype.
+            required: See BaseField constructor.
+            validate: See BaseField constructor.
+
+        """
+        super().__init__(required=required, validate=validate)
+        assert NUMPY_AVAILABLE, \
+            _('ArrayField requires numpy, install pofy[numpy].')
+        self._dtype = numpy.dtype(dtype)
+        assert self._dtype.kind in 'fiu', \
+            _('dtype must be a float or integer type.')
+
+        if shape is None:
+            shape = (None,)
+        assert len(shape) > 0, _('shape must have at least one dimension.')
+        self._shape = tuple(shape)
+
+        # Bounds are clamped to the range of dtype, so that items that would
+        # overflow it are reported on their node by the item field.
+        self._item_field: BaseField
+        if self._dtype.kind == 'f':
+            float_info = numpy.finfo(self._dtype)
+            self._minimum = _clamp(minimum, float(float_info.min), max)
+            self._maximum = _clamp(maximum, float(float_info.max), min)
+            self._item_field = FloatField(
+                minimum=self._minimum,
+                maximum=self._maximum
+            )
+        else:
+            int_info = numpy.iinfo(self._dtype)
+            self._minimum = _clamp(minimum, int(int_info.min), max)
+            self._maximum = _clamp(maximum, int(int_info.max), min)
+            self._item_field = IntField(
+                minimum=cast(int, self._minimum),
+                maximum=cast(int, self._maximum)
+            )
+
+    def _load(self, context: ILoadingContext) -> Any:
+        if not context.expect_sequence():
+            return UNDEFINED
+
+        # Node values are read once in lists, as in streaming mode they can
+        # be iterated only once.
+        items: List[Node] = list(context.current_node().value)
+        if not _check_length(context, items, self._shape[0]):
+            return UNDEFINED
+
+        dimensions = [len(items)]
+        for length in self._shape[1:]:
+            rows = self._load_rows(context, items, length)
+            if rows is None:
+                return UNDEFINED
+
+            dimensions.append(len(rows[0]) if rows else length or 0)
+            items = [item for row in rows for item in row]
+
+        if len(items) > 0 and self._is_plain(items):
+            result = self._convert(context, items)
+        else:
+            result = self._load_items(context, items)
+
+        if result is UNDEFINED:
+            return UNDEFINED
+
+        return result.reshape(dimensions)
+
+    @staticmethod
+    def _load_rows(
+        context: ILoadingContext,
+        rows: List[Node],
+        length: Optional[int]
+    ) -> Optional[List[List[Node]]]:
+        row_field = _RowField(length)
+        result = []
+        valid = True
+        for row in rows:
+            items = context.load(row_field, row)
+            if items is UNDEFINED:
+                valid = False
+            else:
+                result.append(items)
+
+        if not valid:
+            return None
+
+        return result
+
+    @staticmethod
+    def _is_plain(items: List[Node]) -> bool:
+        for item in items:
+            if type(item) is not ScalarNode or item.tag[:1] == '!':
+                return False
+
+        return True
+
+    def _convert(self, context: ILoadingContext, items: List[Node]) -> Any:
+        # Float items overflowing dtype become infinite, and are caught by
+        # the bounds check below.
+        try:
+            strings = numpy.array([item.value for item in items])
+            with numpy.errstate(over='ignore'):
+                result = strings.astype(self._dtype)
+        except (ValueError, OverflowError):
+            return self._load_items(context, items)
+
+        out_of_bounds = (result < self._minimum) | (result > self._maximum)
+        if not out_of_bounds.any():
+            return result
+
+        # The item field reports errors on the offending nodes.
+        for index in numpy.flatnonzero(out_of_bounds):
+            context.load(self._item_field, items[index])
+
+        return UNDEFINED
+
+    def _load_items(self, context: ILoadingContext, items: List[Node]) -> Any:
+        values = []
+        valid = True
+        for item in items:
+            value = context.load(self._item_field, item)
+            if value is UNDEFINED:
+                valid = False
+            values.append(value)
+
+        if not valid:
+            return UNDEFINED
+
+        return numpy.array(values, dtype=self._dtype)
+
+
+class _RowField(BaseField):
+    """Load the items of a nested sequence of an array, checking its length.
+
+    Rows without an explicit length must have the length of the first one.
+    """
+
+    def __init__(self, length: Optional[int]):
+        super().__init__()
+        self._length = length
+
+    def _load(self, context: ILoadingContext) -> Any:
+        if not context.expect_sequence():
+            return UNDEFINED
+
+        items = list(context.current_node().value)
+        if self._length is None:
+            self._length = len(items)
+        elif not _check_length(context, items, self._length):
+            return UNDEFINED
+
+        return items
+
+
+def _clamp(
+    bound: Optional[Union[int, float]],
+    limit: Union[int, float],
+    select: Callable[[Union[int, float], Union[int, float]], Union[int, float]]
+) -> Union[int, float]:
+    if bound is None:
+        return limit
+
+    return select(bound, limit)
+
+
+def _check_length(
+    context: ILoadingContext,
+    items: List[Node],
+    length: Optional[int]
+) -> bool:
+    if length is not None and len(items) != length:
+        context.error(
+            ErrorCode.VALIDATION_ERROR,
+            _('Expected {} items, got {}.'),
+            length,
+            len(items)
+        )
+        return False
+
+    return True
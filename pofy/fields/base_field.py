@@ -10,6 +10,7 @@ from pofy.common import ErrorCode
 from pofy.common import UNDEFINED
 from pofy.interfaces import IBaseField
 from pofy.interfaces import ILoadingContext
+from pofy.load_stats import PHASE_VALIDATE
 
 
 ValidateCallback = Callable[[ILoadingContext, Any], bool]
@@ -57,7 +58,17 @@ class BaseField(IBaseField):
         field_value = self._load(context)
 
         validate = self._validate
-        if validate is not None and not validate(context, field_value):
+        if validate is None:
+            return field_value
+
+        stats = context.get_stats()
+        if stats is not None:
+            with stats.phase(PHASE_VALIDATE):
+                valid = validate(context, field_value)
+        else:
+            valid = validate(context, field_value)
+
+        if not valid:
             return UNDEFINED
 
         return field_value
@@ -66,6 +77,12 @@ class BaseField(IBaseField):
     def _load(self, context: ILoadingContext) -> Any:
         """Deserialize this field using the given node.
 
+        In streaming mode, the value of untagged mapping and sequence nodes
+        is composed as it's iterated, and can be iterated only once. Its
+        length and items can be read before iterating over it, in which case
+        all children are composed and kept. Fields needing several passes
+        should read it once in a list.
+
         Args:
             node: YAML node containing field value.
             context: Loading context, handling include resolving and error
@@ -1,40 +1,61 @@
 """Boolean field class & utilities."""
 from gettext import gettext as _
 from typing import Any
+from typing import Dict
+from typing import Optional
 
 from pofy.common import ErrorCode
 from pofy.common import UNDEFINED
 from pofy.fields.base_field import ScalarField
+from pofy.fields.base_field import ValidateCallback
 from pofy.interfaces import ILoadingContext
 
 
 class BoolField(ScalarField):
     """Boolean YAML object field."""
 
+    TRUE_VALUES = (
+        'y', 'Y', 'yes', 'Yes', 'YES',
+        'true', 'True', 'TRUE',
+        'on', 'On', 'ON'
+    )
+
+    FALSE_VALUES = (
+        'n', 'N', 'no', 'No', 'NO',
+        'false', 'False', 'FALSE',
+        'off', 'Off', 'OFF'
+    )
+
+    def __init__(
+        self,
+        required: bool = False,
+        validate: Optional[ValidateCallback] = None
+    ):
+        """Initialize bool field.
+
+        Args:
+            required: See BaseField constructor.
+            validate: See BaseField constructor.
+
+        """
+        super().__init__(required=required, validate=validate)
+        # Built here, so that child classes can override accepted values.
+        self._values: Dict[str, bool] = {
+            value: False for value in self.FALSE_VALUES
+        }
+        self._values.update({value: True for value in self.TRUE_VALUES})
+
     def _convert(self, context: ILoadingContext) -> Any:
         node = context.current_node()
-        true_values = [
-            'y', 'Y', 'yes', 'Yes', 'YES',
-            'true', 'True', 'TRUE',
-            'on', 'On', 'ON'
-        ]
-        false_values = [
-            'n', 'N', 'no', 'No', 'NO',
-            'false', 'False', 'FALSE'
-            'off', 'Off', 'OFF'
-        ]
-
-        value = node.value
-        if value in true_values:
-            return True
-
-        if value in false_values:
-            return False
+
+        value = self._values.get(node.value)
+        if value is not None:
+            return value
 
         context.error(
             ErrorCode.VALUE_ERROR,
             _('Boolean value should be one of {}'),
-            ', '.join(true_values + false_values)
+            ', '.join(self.TRUE_VALUES + self.FALSE_VALUES)
         )
 
         return UNDEFINED
@@ -2,6 +2,7 @@
 from enum import Enum
 from gettext import gettext as _
 from typing import Any
+from typing import Dict
 from typing import Optional
 from typing import Type
 
@@ -19,25 +20,60 @@ class EnumField(ScalarField):
         self,
         enum_class: Type[Enum],
         required: bool = False,
-        validate: Optional[ValidateCallback] = None
+        validate: Optional[ValidateCallback] = None,
+        by_value: bool = False,
+        case_sensitive: bool = True,
+        aliases: Optional[Dict[str, Enum]] = None
     ):
-        """Initialize string field.
+        """Initialize enum field.
 
         Args:
             enum_class: The type of the enum to deserialize.
             required: See BaseField constructor.
             validate: See BaseField constructor.
+            by_value: If True, members are referred to by their value,
+                      converted to a string, instead of their name.
+            case_sensitive: If False, YAML values are matched ignoring case.
+            aliases: Additional strings accepted for members of the enum.
 
         """
         super().__init__(required=required, validate=validate)
         self._enum_class = enum_class
+        self._case_sensitive = case_sensitive
+
+        if by_value:
+            members = {str(member.value): member for member in enum_class}
+        else:
+            members = dict(enum_class.__members__)
+
+        if aliases is not None:
+            for alias, member in aliases.items():
+                assert isinstance(member, enum_class), \
+                    _('Aliases must refer to members of {}.').format(
+                        enum_class
+                    )
+                members[alias] = member
+
+        self._values: Dict[str, Enum] = {}
+        for key, member in members.items():
+            if not case_sensitive:
+                key = key.lower()
+            assert self._values.get(key, member) is member, \
+                _('Value {} refers to several members of {}.').format(
+                    key, enum_class
+                )
+            self._values[key] = member
 
     def _convert(self, context: ILoadingContext) -> Any:
         string_value = context.current_node().value
 
-        for member in self._enum_class:
-            if member.name == string_value:
-                return member
+        if self._case_sensitive:
+            member = self._values.get(string_value)
+        else:
+            member = self._values.get(string_value.lower())
+
+        if member is not None:
+            return member
 
         context.error(
             ErrorCode.VALIDATION_ERROR,
@@ -1,8 +1,12 @@
 """List field class & utilities."""
 from gettext import gettext as _
 from typing import Any
+from typing import Iterable
+from typing import Iterator
 from typing import Optional
 
+from yaml import Node
+
 from pofy.common import UNDEFINED
 from pofy.fields.base_field import BaseField
 from pofy.fields.base_field import ValidateCallback
@@ -17,6 +21,7 @@ class ListField(BaseField):
         item_field: BaseField,
         required: bool = False,
         validate: Optional[ValidateCallback] = None,
+        lazy: bool = False
     ):
         """Initialize the list field.
 
@@ -24,18 +29,33 @@ class ListField(BaseField):
             item_field: Field used to load list items.
             required: See BaseField constructor.
             validate: See BaseField constructor.
+            lazy: If True, the field value is an iterator loading items as
+                  they are iterated, instead of a list. Items failing to load
+                  are skipped, and errors are reported while iterating. The
+                  iterator can be consumed only once. In streaming mode, items
+                  of a lazy root sequence are composed on demand too.
 
         """
         super().__init__(required=required, validate=validate)
         assert isinstance(item_field, BaseField), \
             _('item_field must be an implementation of BaseField.')
         self._item_field = item_field
+        self._lazy = lazy
 
     def _load(self, context: ILoadingContext) -> Any:
         if not context.expect_sequence():
             return UNDEFINED
 
         node = context.current_node()
+        if self._lazy:
+            # The location is captured now, as the node stack will have
+            # changed when the iterator is consumed.
+            return self._iter_items(
+                context,
+                node.value,
+                context.current_location()
+            )
+
         result = []
         for item_node in node.value:
             item = context.load(self._item_field, item_node)
@@ -45,3 +65,15 @@ class ListField(BaseField):
             result.append(item)
 
         return result
+
+    def _iter_items(
+        self,
+        context: ILoadingContext,
+        item_nodes: Iterable[Node],
+        location: Optional[str]
+    ) -> Iterator[Any]:
+        item_field = self._item_field
+        for item_node in item_nodes:
+            item = context.load(item_field, item_node, location)
+            if item is not UNDEFINED:
+                yield item
@@ -1,30 +1,50 @@
 """Object field class & utilities."""
 from gettext import gettext as _
-from inspect import getmembers
+from contextlib import contextmanager
+from enum import Enum
 from inspect import isclass
-from inspect import ismethod
 from typing import Any
 from typing import Callable
 from typing import Dict
-from typing import Iterable
+from typing import Iterator
 from typing import Optional
 from typing import Set
+from typing import Tuple
 from typing import Type
 from typing import cast
 
 from pofy.common import ErrorCode
-from pofy.common import SchemaResolver
 from pofy.common import UNDEFINED
 from pofy.fields.base_field import BaseField
 from pofy.fields.base_field import ValidateCallback
-from pofy.fields.string_field import StringField
 from pofy.interfaces import ILoadingContext
+from pofy.load_profiler import LoadProfiler
+from pofy.load_stats import LoadStats
+from pofy.load_stats import PHASE_POST_LOAD
+from pofy.load_stats import PHASE_VALIDATE
+from pofy.load_stats import get_class_name
+from pofy.schema_plan import SchemaPlan
 
 
 _TYPE_FORMAT_MSG = _("""\
 Type tag should be in the form !type:path.to.Type, got {}""")
 
 
+class Construction(Enum):
+    """How loaded objects are created and populated."""
+
+    # Call the class without arguments, then set each field with setattr.
+    SETATTR = 'setattr'
+
+    # Create the object with __new__, bypassing __init__, then set all fields
+    # at once by updating its __dict__.
+    DICT_UPDATE = 'dict_update'
+
+    # Call the class once, with the loaded fields as keyword arguments. Works
+    # with dataclasses, named tuples, attrs classes...
+    KWARGS = 'kwargs'
+
+
 class ObjectField(BaseField):
     """Object YAML object field."""
 
@@ -33,6 +53,8 @@ class ObjectField(BaseField):
         object_class: Type[Any] = object,
         required: bool = False,
         validate: Optional[ValidateCallback] = None,
+        slots: bool = False,
+        construction: Construction = Construction.SETATTR
     ):
         """Initialize object field.
 
@@ -40,12 +62,23 @@ class ObjectField(BaseField):
             required: See BaseField constructor.
             validate: See BaseField constructor.
             object_class: The class of the object to create.
+            slots: If True, create instances of a companion class storing
+                   fields in __slots__, to save memory. See
+                   pofy.slotted_class.
+            construction: How objects are created and populated, see
+                          Construction.
 
         """
         super().__init__(required=required, validate=validate)
         assert isclass(object_class), \
             _('object_class must be a type')
+        assert isinstance(construction, Construction), \
+            _('construction must be a Construction value.')
+        assert not slots or construction == Construction.SETATTR, \
+            _('slots can only be used with Construction.SETATTR.')
         self._object_class = object_class
+        self._slots = slots
+        self._construction = construction
 
     def _load(self, context: ILoadingContext) -> Any:
         if not context.expect_mapping():
@@ -55,7 +88,7 @@ class ObjectField(BaseField):
         if object_class is None:
             return UNDEFINED
 
-        return _load(object_class, context)
+        return _load(object_class, context, self._slots, self._construction)
 
     def _resolve_type(self, context: ILoadingContext) -> Optional[Type[Any]]:
         node = context.current_node()
@@ -127,141 +160,168 @@ def _get_type(
     return cast(Type[Any], resolved_type)
 
 
-def _load(object_class: Type[Any], context: ILoadingContext) -> Any:
-    fields = _get_fields(object_class, context)
+def _load(
+    object_class: Type[Any],
+    context: ILoadingContext,
+    slots: bool,
+    construction: Construction
+) -> Any:
+    plan = context.get_schema_plan(object_class)
 
-    if fields is None:
+    if plan is None:
+        context.error(
+            ErrorCode.SCHEMA_ERROR,
+            _('No Schema class found for type {}, check that your schema is '
+              'correctly configured.'),
+            object_class.__name__
+        )
+        return UNDEFINED
+
+    instance_class = object_class
+    if slots:
+        instance_class = plan.get_slotted_class(object_class)
+
+    stats = context.get_stats()
+    profiler = context.get_profiler()
+    if stats is not None or profiler is not None:
+        return _load_instrumented(object_class, instance_class, construction,
+                                  plan, context, stats, profiler)
+
+    result, set_fields = _create_object(instance_class, construction, plan,
+                                        context, True)
+    if result is UNDEFINED:
         return UNDEFINED
 
-    result, set_fields = _load_object(object_class, fields, context)
-    if _validate_object(result, fields, set_fields, context):
+    for post_load_method in plan.post_load_hooks:
+        post_load_method(result)
+
+    if _validate_object(result, plan, set_fields, context):
         return result
 
     return UNDEFINED
 
 
-def _load_object(
+def _load_instrumented(
     object_class: Type[Any],
-    fields: Dict[str, BaseField],
-    context: ILoadingContext
+    instance_class: Type[Any],
+    construction: Construction,
+    plan: SchemaPlan,
+    context: ILoadingContext,
+    stats: Optional[LoadStats],
+    profiler: Optional[LoadProfiler]
 ) -> Any:
-    node = context.current_node()
-    result = object_class()
-    set_fields = set()
+    if stats is not None:
+        stats.objects[get_class_name(object_class)] += 1
 
-    for name_node, value_node in node.value:
-        field_name = context.load(StringField(), name_node)
-        if field_name is UNDEFINED:
-            continue
+    result, set_fields = _create_object(instance_class, construction, plan,
+                                        context, False)
+    if result is UNDEFINED:
+        return UNDEFINED
 
-        field_name = name_node.value
-        set_fields.add(field_name)
-        if field_name not in fields:
-            context.error(
-                ErrorCode.FIELD_NOT_DECLARED,
-                _('Field {} is not declared.'), field_name
-            )
-            continue
+    for post_load_method in plan.post_load_hooks:
+        with _measure_hook(stats, PHASE_POST_LOAD, profiler,
+                           post_load_method):
+            post_load_method(result)
 
-        field = fields[field_name]
-        field_value = context.load(field, value_node)
-        if field_value is UNDEFINED:
-            continue
+    valid_object = _check_required_fields(plan, set_fields, context)
+    for validate in plan.validate_hooks:
+        with _measure_hook(stats, PHASE_VALIDATE, profiler, validate):
+            if not validate(context, result):
+                valid_object = False
 
-        setattr(result, field_name, field_value)
+    if valid_object:
+        return result
+
+    return UNDEFINED
 
-    schema_resolver = context.get_schema_resolver()
-    _post_load(result, schema_resolver)
 
-    return (result, set_fields)
+@contextmanager
+def _measure_hook(
+    stats: Optional[LoadStats],
+    phase: str,
+    profiler: Optional[LoadProfiler],
+    hook: Callable[..., Any]
+) -> Iterator[None]:
+    if stats is not None and profiler is not None:
+        with stats.phase(phase), profiler.frame(_get_hook_label(hook)):
+            yield
+    elif stats is not None:
+        with stats.phase(phase):
+            yield
+    else:
+        assert profiler is not None
+        with profiler.frame(_get_hook_label(hook)):
+            yield
+
+
+def _get_hook_label(hook: Callable[..., Any]) -> str:
+    return '{}()'.format(getattr(hook, '__qualname__', repr(hook)))
+
+
+def _create_object(
+    instance_class: Type[Any],
+    construction: Construction,
+    plan: SchemaPlan,
+    context: ILoadingContext,
+    inline_scalars: bool
+) -> Tuple[Any, Set[str]]:
+    node = context.current_node()
+    if construction == Construction.SETATTR:
+        result = instance_class()
+        load_fields = plan.get_loader(inline_scalars)
+        return (result, load_fields(context, node, result))
+
+    values: Dict[str, Any] = {}
+    load_fields = plan.get_loader(inline_scalars, into_dict=True)
+    set_fields = load_fields(context, node, values)
+
+    if construction == Construction.DICT_UPDATE:
+        result = instance_class.__new__(instance_class)  # type: ignore
+        result.__dict__.update(values)
+        return (result, set_fields)
+
+    # Required fields are checked before calling the constructor, as it
+    # would most likely fail if they're missing.
+    if not _check_required_fields(plan, set_fields, context):
+        return (UNDEFINED, set_fields)
+
+    try:
+        return (instance_class(**values), set_fields)
+    except (TypeError, ValueError) as error:
+        context.error(
+            ErrorCode.VALUE_ERROR,
+            _('Can\'t create {} object : {}'),
+            instance_class.__name__, error
+        )
+        return (UNDEFINED, set_fields)
 
 
 def _validate_object(
     obj: Any,
-    fields: Dict[str, BaseField],
+    plan: SchemaPlan,
+    set_fields: Set[str],
+    context: ILoadingContext
+) -> bool:
+    valid_object = _check_required_fields(plan, set_fields, context)
+    for validate in plan.validate_hooks:
+        if not validate(context, obj):
+            valid_object = False
+
+    return valid_object
+
+
+def _check_required_fields(
+    plan: SchemaPlan,
     set_fields: Set[str],
     context: ILoadingContext
 ) -> bool:
-    object_class = obj.__class__
     valid_object = True
-    for name, field in fields.items():
-        if field.required and name not in set_fields:
+    for name in plan.required_fields:
+        if name not in set_fields:
             valid_object = False
             context.error(
                 ErrorCode.MISSING_REQUIRED_FIELD,
                 _('Missing required field {}'), name
             )
 
-    schema_resolver = context.get_schema_resolver()
-    for validate in _get_methods(object_class, 'validate', schema_resolver):
-        if not validate(context, obj):
-            valid_object = False
-
     return valid_object
-
-
-def _post_load(obj: Any, schema_resolver: SchemaResolver) -> Any:
-    object_class = obj.__class__
-    for post_load_method in _get_methods(
-        object_class,
-        'post_load',
-        schema_resolver
-    ):
-        post_load_method(obj)
-
-
-def _is_field(member: Any) -> bool:
-    return isinstance(member, BaseField)
-
-
-def _get_schema_classes(
-    cls: Type[Any],
-    schema_resolver: SchemaResolver
-) -> Iterable[Type[Any]]:
-    for base in cls.__bases__:
-        for schema_class in _get_schema_classes(base, schema_resolver):
-            yield schema_class
-
-    schema = schema_resolver(cls)
-    if schema is not None:
-        yield schema
-
-
-def _get_fields(cls: Type[Any], context: ILoadingContext) \
-        -> Optional[Dict[str, BaseField]]:
-    schema_resolver = context.get_schema_resolver()
-    schema_classes = list(_get_schema_classes(cls, schema_resolver))
-
-    if len(schema_classes) == 0:
-        context.error(
-            ErrorCode.SCHEMA_ERROR,
-            _('No Schema class found for type {}, check that your schema is '
-              'correctly configured.'),
-            cls.__name__
-        )
-        return None
-
-    fields = {}
-    for schema_it in schema_classes:
-        for name, field in getmembers(schema_it, _is_field):
-            fields[name] = field
-
-    return fields
-
-
-def _get_methods(
-    cls: Type[Any],
-    method_name: str,
-    schema_resolver: SchemaResolver
-) \
-        -> Iterable[Callable[..., Any]]:
-    def _method_filter(member: Any) -> bool:
-        return ismethod(member) and member.__name__ == method_name
-
-    for base in cls.__bases__:
-        for method in _get_methods(base, method_name, schema_resolver):
-            yield method
-
-    schema_class = schema_resolver(cls)
-    for __, method in getmembers(schema_class, _method_filter):
-        yield method
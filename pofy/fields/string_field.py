@@ -2,6 +2,8 @@
 from gettext import gettext as _
 from re import compile as re_compile
 from typing import Any
+from typing import FrozenSet
+from typing import Iterable
 from typing import Optional
 from typing import Pattern
 
@@ -19,7 +21,8 @@ class StringField(ScalarField):
         self,
         required: bool = False,
         validate: Optional[ValidateCallback] = None,
-        pattern: Optional[str] = None
+        pattern: Optional[str] = None,
+        choices: Optional[Iterable[str]] = None
     ):
         """Initialize string field.
 
@@ -29,6 +32,9 @@ class StringField(ScalarField):
             pattern: Pattern the deserialized strings should match. If defined
                      and the string doesn't match, a VALIDATION_ERROR will be
                      raised.
+            choices: Values the deserialized strings should be one of. If
+                     defined and the string isn't one of them, a
+                     VALIDATION_ERROR will be raised.
 
         """
         super().__init__(required=required, validate=validate)
@@ -41,6 +47,12 @@ class StringField(ScalarField):
             self._pattern_str = pattern
             self._pattern = re_compile(pattern)
 
+        self._choices: Optional[FrozenSet[str]] = None
+        if choices is not None:
+            assert not isinstance(choices, str), \
+                _('choices must be a collection of strings.')
+            self._choices = frozenset(choices)
+
     def _convert(self, context: ILoadingContext) -> Any:
         value = context.current_node().value
 
@@ -53,4 +65,13 @@ class StringField(ScalarField):
             )
             return UNDEFINED
 
+        if self._choices is not None and value not in self._choices:
+            context.error(
+                ErrorCode.VALIDATION_ERROR,
+                _('Value {} should be one of {}'),
+                value,
+                ', '.join(sorted(self._choices))
+            )
+            return UNDEFINED
+
         return value
@@ -2,11 +2,24 @@
 from abc import abstractmethod
 from typing import Any
 from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Type
 
 from yaml import Node
 
 from pofy.common import ErrorCode
 from pofy.common import SchemaResolver
+from pofy.load_manifest import LoadManifest
+from pofy.load_profiler import LoadProfiler
+from pofy.load_stats import LoadStats
+from pofy.parser_backend import ParserBackend
+
+if TYPE_CHECKING:
+    from pofy.document_cache import ( # pylint: disable=cyclic-import
+        DocumentCache
+    )
+    from pofy.reload_state import ReloadState # pylint: disable=cyclic-import
+    from pofy.schema_plan import SchemaPlan # pylint: disable=cyclic-import
 
 
 class IBaseField:
@@ -59,6 +72,37 @@ class ILoadingContext:
     def get_schema_resolver(self) -> SchemaResolver:
         """Return a function returning the schema for the given type."""
 
+    @abstractmethod
+    def get_document_cache(self) -> Optional['DocumentCache']:
+        """Return the cache of composed documents, if any."""
+
+    @abstractmethod
+    def get_parser_backend(self) -> ParserBackend:
+        """Return the parser backend to use to compose YAML documents."""
+
+    @abstractmethod
+    def get_stats(self) -> Optional[LoadStats]:
+        """Return the statistics to populate, or None if disabled."""
+
+    @abstractmethod
+    def get_profiler(self) -> Optional[LoadProfiler]:
+        """Return the profiler to populate, or None if disabled."""
+
+    @abstractmethod
+    def get_manifest(self) -> Optional[LoadManifest]:
+        """Return the manifest recording what the loading depends on."""
+
+    @abstractmethod
+    def get_reload_state(self) -> Optional['ReloadState']:
+        """Return the state recording documents for reloading, if any."""
+
+    @abstractmethod
+    def get_schema_plan(self, cls: Type[Any]) -> Optional['SchemaPlan']:
+        """Return the schema plan of the given type.
+
+        Return None if no schema is defined for this type.
+        """
+
     @abstractmethod
     def current_node(self) -> Node:
         """Return the currently loaded node."""
@@ -0,0 +1,300 @@
+"""Load manifest class & utilities.
+
+A LoadManifest can be given to pofy.load, to know what a loading depended on :
+the files that were read (the loaded file itself, and imported or globbed
+files, and the files and glob patterns !import and !glob looked for), the
+environment variables read by !env and the flags tested by !if.
+It can be used to build cache keys, or to decide if a document has to be
+loaded again.
+
+Files are hashed when they're recorded, which reads them once more : when no
+manifest is given, nothing is recorded. A file modified between the moment it
+was read for loading and the moment it's hashed is recorded as modified, as
+its content isn't the loaded one anymore. When loading with a ReloadState, the
+files imported by reused documents aren't read, and aren't recorded either.
+"""
+from hashlib import sha256
+from os import environ
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from yaml import Node
+
+from pofy.document_cache import FileVersion
+from pofy.document_cache import get_file_version
+
+# Size of the chunks read when hashing files.
+_CHUNK_SIZE = 1 << 16
+
+# Digest of files modified while they were loaded, that never matches.
+_UNKNOWN_DIGEST = ''
+
+
+class FileRecord:
+    """A file read during a loading.
+
+    Members:
+        path: Resolved path of the file.
+        digest: SHA-256 hex digest of the file content, or an empty string
+                if the file was modified while it was loaded.
+        size: Size of the file, in bytes.
+        mtime_ns: Modification time of the file, in nanoseconds.
+        location: Name of the document importing the file, or None if it's
+                  the loaded file itself.
+        line: Line of the node importing the file, starting at 0.
+        column: Column of the node importing the file, starting at 0.
+
+    """
+
+    __slots__ = ('path', 'digest', 'size', 'mtime_ns', 'location', 'line',
+                 'column')
+
+    def __init__(
+        self,
+        path: str,
+        digest: str,
+        size: int,
+        mtime_ns: int,
+        location: Optional[str],
+        line: int,
+        column: int
+    ):
+        """Initialize the record. See class documentation for arguments."""
+        self.path = path
+        self.digest = digest
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.location = location
+        self.line = line
+        self.column = column
+
+    def is_modified(self) -> bool:
+        """Return True if the file was modified or deleted since recorded.
+
+        The content is hashed again only if the size or modification time of
+        the file changed.
+        """
+        if self.digest == _UNKNOWN_DIGEST:
+            return True
+
+        try:
+            mtime_ns, size, __ = get_file_version(self.path)
+        except OSError:
+            return True
+
+        if size == self.size and mtime_ns == self.mtime_ns:
+            return False
+
+        try:
+            return _hash_file(self.path) != self.digest
+        except OSError:
+            return True
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the record as a JSON serializable dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class LoadManifest:
+    """Files, environment variables and flags a loading depended on.
+
+    Members:
+        files: Records of the files read, in reading order. Files read
+               several times are recorded once.
+        env: Values of the environment variables read, None for variables
+             that weren't defined.
+        flags: Flags tested, with True if they were defined.
+        missing: Resolved paths of the files looked for by !import or
+                 !try-import that didn't exist.
+        globs: Root directories and glob patterns of !glob tags, with the
+               resolved paths of the matched files.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty manifest."""
+        self.files: List[FileRecord] = []
+        self.env: Dict[str, Optional[str]] = {}
+        self.flags: Dict[str, bool] = {}
+        self.missing: List[str] = []
+        self.globs: List[Tuple[str, str, List[str]]] = []
+        self._paths: Set[str] = set()
+
+    def add_file(
+        self,
+        path: Path,
+        node: Optional[Node] = None,
+        version: Optional[FileVersion] = None
+    ) -> None:
+        """Record a file read during the loading.
+
+        Args:
+            path: Path of the file.
+            node: The node importing the file, or None for the loaded file
+                  itself.
+            version: Version of the file when it was read for loading, see
+                     pofy.document_cache.get_file_version. If the file
+                     changed since, it's recorded as modified.
+
+        """
+        resolved = str(path.resolve())
+        if resolved in self._paths:
+            return
+
+        # The file is stat'ed again after hashing, to detect modifications
+        # made while it's hashed.
+        file_version = get_file_version(resolved)
+        digest = _hash_file(resolved)
+        if get_file_version(resolved) != file_version or \
+                (version is not None and version != file_version):
+            digest = _UNKNOWN_DIGEST
+
+        location = None
+        line = 0
+        column = 0
+        if node is not None:
+            mark = node.start_mark
+            location = getattr(mark, 'name', None)
+            line = mark.line
+            column = mark.column
+
+        self._paths.add(resolved)
+        self.files.append(FileRecord(
+            resolved,
+            digest,
+            file_version[1],
+            file_version[0],
+            location,
+            line,
+            column
+        ))
+
+    def add_missing(self, path: Path) -> None:
+        """Record a file looked for during the loading that didn't exist."""
+        resolved = str(path.resolve())
+        if resolved not in self._paths:
+            self._paths.add(resolved)
+            self.missing.append(resolved)
+
+    def add_glob(self, root: Path, pattern: str, paths: List[Path]) -> None:
+        """Record the files matched by a glob pattern in a root directory."""
+        self.globs.append((
+            str(root.resolve()),
+            pattern,
+            [str(path.resolve()) for path in paths]
+        ))
+
+    def add_env(self, name: str, value: Optional[str]) -> None:
+        """Record an environment variable read during the loading."""
+        self.env[name] = value
+
+    def add_flag(self, flag: str, defined: bool) -> None:
+        """Record a flag tested during the loading."""
+        self.flags[flag] = defined
+
+    def update(self, other: 'LoadManifest') -> None:
+        """Add the records of another manifest to this one."""
+        for record in other.files:
+            if record.path not in self._paths:
+                self._paths.add(record.path)
+                self.files.append(record)
+
+        for path in other.missing:
+            self.add_missing(Path(path))
+
+        self.globs.extend(other.globs)
+        self.env.update(other.env)
+        self.flags.update(other.flags)
+
+    def changed_files(self) -> List[Path]:
+        """Return the recorded files modified or deleted since the loading."""
+        return [Path(record.path) for record in self.files
+                if record.is_modified()]
+
+    def is_stale(self) -> bool:
+        """Return True if loading again could give a different result.
+
+        That is, if a recorded file changed, if a missing file was created,
+        if a glob pattern matches other files, or if a recorded environment
+        variable has a different value. Flags aren't checked, as they're
+        given by the caller.
+        """
+        for name, value in self.env.items():
+            if environ.get(name) != value:
+                return True
+
+        for path in self.missing:
+            if Path(path).is_file():
+                return True
+
+        for root, pattern, matched in self.globs:
+            if _glob_files(Path(root), pattern) != matched:
+                return True
+
+        for record in self.files:
+            if record.is_modified():
+                return True
+
+        return False
+
+    def digest(self) -> str:
+        """Return a SHA-256 hex digest of the manifest.
+
+        It identifies the content of the recorded files, the values of the
+        recorded environment variables and flags, but not modification times.
+        """
+        hasher = sha256()
+        for record in self.files:
+            hasher.update('file\0{}\0{}\0'.format(record.path, record.digest)
+                          .encode('utf-8'))
+
+        for path in self.missing:
+            hasher.update('missing\0{}\0'.format(path).encode('utf-8'))
+
+        for root, pattern, matched in self.globs:
+            hasher.update('glob\0{}\0{}\0{}\0'.format(
+                root, pattern, '\0'.join(matched)
+            ).encode('utf-8'))
+
+        for name, value in sorted(self.env.items()):
+            hasher.update('env\0{}\0{!r}\0'.format(name, value)
+                          .encode('utf-8'))
+
+        for flag, defined in sorted(self.flags.items()):
+            hasher.update('flag\0{}\0{}\0'.format(flag, defined)
+                          .encode('utf-8'))
+
+        return hasher.hexdigest()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the manifest as a JSON serializable dictionary."""
+        return {
+            'files': [record.as_dict() for record in self.files],
+            'env': dict(self.env),
+            'flags': dict(self.flags),
+            'missing': list(self.missing),
+            'globs': [[root, pattern, list(matched)]
+                      for root, pattern, matched in self.globs],
+        }
+
+
+def _glob_files(root: Path, pattern: str) -> List[str]:
+    # Same matching as GlobHandler.
+    return [str(path.resolve()) for path in root.glob(pattern)
+            if path.is_file()]
+
+
+def _hash_file(path: str) -> str:
+    hasher = sha256()
+    with open(path, 'rb') as input_file:
+        chunk = input_file.read(_CHUNK_SIZE)
+        while chunk:
+            hasher.update(chunk)
+            chunk = input_file.read(_CHUNK_SIZE)
+
+    return hasher.hexdigest()
@@ -0,0 +1,197 @@
+"""Loading profiler class & utilities.
+
+A LoadProfiler given to pofy.load measures the time spent loading each YAML
+node. Time is aggregated by stack : the list of frames leading from the root
+node to the loaded node, each frame being labeled with the position of the
+node in the schema (mapping key or sequence index) and in the YAML source
+(file:line). Validation and post-load hooks get their own frames.
+
+Results can be written in the folded stacks format, used by flame graph tools
+(flamegraph.pl, speedscope, inferno...) :
+
+    <root> (config.yaml:1);services (config.yaml:2);[3] (config.yaml:9) 1200
+
+Each line is a stack, and the self time spent in it, in microseconds.
+"""
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any
+from typing import Dict
+from typing import IO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from yaml import MappingNode
+from yaml import Node
+from yaml import ScalarNode
+from yaml import SequenceNode
+
+Stack = Tuple[str, ...]
+
+
+class ProfileEntry:
+    """Time spent in a given stack.
+
+    Members:
+        stack: Labels of the frames, from the root node.
+        calls: Count of times the stack was entered.
+        self_time: Time spent in the stack itself, excluding children frames,
+                   in seconds.
+        total_time: Time spent in the stack, including children frames, in
+                    seconds.
+
+    """
+
+    def __init__(self, stack: Stack):
+        """Initialize an empty entry."""
+        self.stack = stack
+        self.calls = 0
+        self.self_time = 0.0
+        self.total_time = 0.0
+
+
+class LoadProfiler:
+    """Attribute loading time to YAML nodes and hooks."""
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self._entries: Dict[Stack, ProfileEntry] = {}
+        self._frames: List[_Frame] = []
+
+    def get_entries(self) -> List[ProfileEntry]:
+        """Return the profiled stacks, by decreasing total time."""
+        return sorted(
+            self._entries.values(),
+            key=lambda entry: entry.total_time,
+            reverse=True
+        )
+
+    def get_folded_stacks(self) -> List[str]:
+        """Return the profile in the folded stacks format.
+
+        Return:
+            One line per stack, with the self time spent in it, in
+            microseconds.
+
+        """
+        return [
+            '{} {}'.format(';'.join(stack), int(entry.self_time * 1e6))
+            for stack, entry in sorted(self._entries.items())
+        ]
+
+    def write_folded_stacks(self, output: IO[str]) -> None:
+        """Write the profile in the folded stacks format to a stream."""
+        for line in self.get_folded_stacks():
+            output.write(line)
+            output.write('\n')
+
+    def push_node(self, node: Node, parent: Optional[Node]) -> None:
+        """Start measuring the time spent loading a node.
+
+        Args:
+            node: The node being loaded.
+            parent: The previously loaded node, if any.
+
+        """
+        segment = self._get_segment(node, parent)
+        mark = node.start_mark
+        label = '{} ({}:{})'.format(segment, getattr(mark, 'name', '?'),
+                                    mark.line + 1)
+        self._push(label, node)
+
+    def pop(self) -> None:
+        """Stop measuring the time spent in the last pushed frame."""
+        now = perf_counter()
+        frame = self._frames.pop()
+        total_time = now - frame.start
+        entry = frame.entry
+        entry.total_time += total_time
+        entry.self_time += total_time - frame.children_time
+        if len(self._frames) > 0:
+            self._frames[-1].children_time += total_time
+
+    @contextmanager
+    def frame(self, label: str) -> Iterator[None]:
+        """Measure the time spent in a block, in a frame of its own."""
+        self._push(label, None)
+        try:
+            yield
+        finally:
+            self.pop()
+
+    def _push(self, label: str, node: Optional[Node]) -> None:
+        frames = self._frames
+        if len(frames) > 0:
+            stack = frames[-1].entry.stack + (label.replace(';', ','),)
+        else:
+            stack = (label.replace(';', ','),)
+
+        entry = self._entries.get(stack)
+        if entry is None:
+            entry = ProfileEntry(stack)
+            self._entries[stack] = entry
+
+        entry.calls += 1
+        frames.append(_Frame(entry, node, perf_counter()))
+
+    def _get_segment(self, node: Node, parent: Optional[Node]) -> str:
+        if parent is None:
+            return '<root>'
+
+        # Used if the node was created or loaded by a tag handler.
+        parent_tag = str(parent.tag)
+        frames = self._frames
+        if len(frames) > 0 and frames[-1].node is parent:
+            segment = frames[-1].get_child_segment(node)
+            if segment is not None:
+                return segment
+
+        return parent_tag
+
+
+class _Frame:
+    def __init__(self, entry: ProfileEntry, node: Optional[Node],
+                 start: float):
+        self.entry = entry
+        self.node = node
+        self.start = start
+        self.children_time = 0.0
+        self._segments: Optional[Dict[int, str]] = None
+
+    def get_child_segment(self, child: Node) -> Optional[str]:
+        """Return the key or index of the child node in this frame node."""
+        segments = self._segments
+        if segments is None:
+            segments = _get_segments(self.node)
+            self._segments = segments
+
+        return segments.get(id(child))
+
+
+def _get_segments(node: Any) -> Dict[int, str]:
+    # Lazy nodes of the streaming composer can't be inspected.
+    if not isinstance(node.value, list):
+        return {}
+
+    if isinstance(node, MappingNode):
+        return {
+            id(value): _get_key_label(key)
+            for key, value in node.value
+        }
+
+    if isinstance(node, SequenceNode):
+        return {
+            id(item): '[{}]'.format(index)
+            for index, item in enumerate(node.value)
+        }
+
+    return {}
+
+
+def _get_key_label(key: Node) -> str:
+    if isinstance(key, ScalarNode):
+        return str(key.value)
+
+    return '<key>'
@@ -0,0 +1,119 @@
+"""Loading statistics class & utilities.
+
+A LoadStats object can be given to pofy.load, to know where loading time is
+spent. Collecting statistics has a cost : when stats are enabled, all nodes are
+loaded through the loading context (the scalar fast path of generated object
+loaders is disabled), so that every node is counted. When no LoadStats is
+given, nothing is collected.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from pofy.common import ErrorCode
+
+# Phases between which loading time is split.
+PHASE_READ = 'read'
+PHASE_COMPOSE = 'compose'
+PHASE_CONVERT = 'convert'
+PHASE_VALIDATE = 'validate'
+PHASE_POST_LOAD = 'post_load'
+
+
+class LoadStats:
+    """Counters and timings collected during a loading.
+
+    Members:
+        nodes: Count of nodes loaded through the loading context.
+        objects: Count of objects built, by class name.
+        tag_handlers: Count of nodes dispatched to tag handlers, by handler
+                      class name.
+        files: (path, size in bytes) of each file composed by path handlers.
+        cache_hits: Count of documents found in the document cache.
+        cache_misses: Count of documents that weren't found in the document
+                      cache, and had to be composed.
+        errors: Count of errors reported, by error code.
+        phase_times: Exclusive wall time spent in each phase, in seconds.
+                     Time spent reading a root stream is counted as compose
+                     time. In streaming mode, composition is interleaved with
+                     conversion, and is counted as convert time.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.nodes = 0
+        self.objects: 'Counter[str]' = Counter()
+        self.tag_handlers: 'Counter[str]' = Counter()
+        self.files: List[Tuple[str, int]] = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.errors: 'Counter[ErrorCode]' = Counter()
+        self.phase_times: Dict[str, float] = {
+            PHASE_READ: 0.0,
+            PHASE_COMPOSE: 0.0,
+            PHASE_CONVERT: 0.0,
+            PHASE_VALIDATE: 0.0,
+            PHASE_POST_LOAD: 0.0,
+        }
+        # Stack of [phase, start time] of the phases being measured.
+        self._phases: List[List[Any]] = []
+
+    @property
+    def bytes_read(self) -> int:
+        """Total size of the files composed by path handlers."""
+        return sum(size for __, size in self.files)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the time spent in a phase.
+
+        Phases can be nested : time spent in a nested phase isn't counted in
+        the enclosing one.
+
+        Args:
+            name: Name of the phase, one of the PHASE_* constants.
+
+        """
+        phases = self._phases
+        now = perf_counter()
+        if len(phases) > 0:
+            parent = phases[-1]
+            self._add_time(parent[0], now - parent[1])
+        phases.append([name, now])
+
+        try:
+            yield
+        finally:
+            now = perf_counter()
+            current = phases.pop()
+            self._add_time(current[0], now - current[1])
+            if len(phases) > 0:
+                phases[-1][1] = now
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a JSON serializable dictionary."""
+        return {
+            'nodes': self.nodes,
+            'objects': dict(self.objects),
+            'tag_handlers': dict(self.tag_handlers),
+            'files': [list(file_info) for file_info in self.files],
+            'bytes_read': self.bytes_read,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'errors': {code.name: count for code, count in self.errors.items()},
+            'phase_times': dict(self.phase_times),
+        }
+
+    def _add_time(self, name: str, duration: float) -> None:
+        self.phase_times[name] = self.phase_times.get(name, 0.0) + duration
+
+
+def get_class_name(cls: type) -> str:
+    """Return the name used to count objects of the given class."""
+    return '{}.{}'.format(cls.__module__, cls.__qualname__)
@@ -1,24 +1,42 @@
-"""Pofy deserializing function."""
+"""Pofy deserializing functions & classes."""
+from collections import abc
+from contextlib import contextmanager
+from concurrent.futures import Executor
+from copy import copy
 from gettext import gettext as _
+from hashlib import sha256
 from inspect import isclass
-from io import TextIOBase
+from io import IOBase
+from multiprocessing import Pool
 from pathlib import Path
-from typing import IO
+from typing import Any
+from typing import Dict
 from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Set
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 from typing import Union
 from typing import cast
 
-from yaml import compose
+from yaml import Node
+from yaml import MarkedYAMLError
 
+from pofy.common import ErrorCode
 from pofy.common import ErrorHandler
+from pofy.common import LoadError
+from pofy.common import LoadOutcome
+from pofy.document_cache import DocumentCache
+from pofy.document_cache import get_file_version
+from pofy.event_composer import StreamingComposer
 from pofy.common import UNDEFINED
 from pofy.common import LoadResult
 from pofy.common import SchemaResolver
+from pofy.common import YamlSource
+from pofy.common import default_schema_resolver
 from pofy.fields.base_field import BaseField
 from pofy.fields.bool_field import BoolField
 from pofy.fields.dict_field import DictField
@@ -27,7 +45,24 @@ from pofy.fields.int_field import IntField
 from pofy.fields.list_field import ListField
 from pofy.fields.object_field import ObjectField
 from pofy.fields.string_field import StringField
+from pofy.load_manifest import LoadManifest
+from pofy.load_profiler import LoadProfiler
+from pofy.load_stats import LoadStats
+from pofy.load_stats import PHASE_COMPOSE
+from pofy.load_stats import PHASE_CONVERT
 from pofy.loading_context import LoadingContext
+from pofy.schema_plan import DEFAULT_SCHEMA_PLANS
+from pofy.schema_plan import SchemaPlanCache
+from pofy.schema_plan import describe_value
+from pofy.source_buffer import is_binary_stream
+from pofy.source_buffer import read_file
+from pofy.source_buffer import read_stream
+from pofy.parser_backend import ParserBackend
+from pofy.parser_backend import compose_document
+from pofy.parser_backend import compose_documents
+from pofy.parser_backend import should_map_files
+from pofy.reload_state import ReloadState
+from pofy.result_cache import ResultCache
 from pofy.tag_handlers.env_handler import EnvHandler
 from pofy.tag_handlers.glob_handler import GlobHandler
 from pofy.tag_handlers.if_handler import IfHandler
@@ -46,21 +81,600 @@ _ROOT_FIELDS_MAPPING = {
 ObjectType = TypeVar('ObjectType')
 
 
+class Loader:
+    """Deserialize YAML documents with a given configuration.
+
+    Tag handlers, flags and caches are set up once, when the loader is
+    created, so calling load several times is cheaper than calling pofy.load
+    with the same parameters. Schema plans and composed documents are cached
+    in the loader and shared between calls.
+    """
+
+    def __init__(
+        self,
+        resolve_roots: Optional[Iterable[Path]] = None,
+        tag_handlers: Optional[Iterable[TagHandler]] = None,
+        error_handler: Optional[ErrorHandler] = None,
+        flags: Optional[Set[str]] = None,
+        schema_resolver: Optional[SchemaResolver] = None,
+        parser_backend: ParserBackend = ParserBackend.AUTO,
+        document_cache: Optional[DocumentCache] = None,
+        schema_plans: Optional[SchemaPlanCache] = None,
+        streaming: bool = False,
+        glob_executor: Optional[Executor] = None,
+        result_cache: Optional[ResultCache] = None
+    ):
+        """Initialize the loader.
+
+        See pofy.load for a description of the parameters not listed here.
+
+        Args:
+            schema_plans: Cache of schema plans. If None, the loader creates
+                          its own cache.
+
+        """
+        all_tag_handlers: List[TagHandler] = []
+
+        if tag_handlers is not None:
+            for handler_it in tag_handlers:
+                assert isinstance(handler_it, TagHandler), \
+                    _('tag_handlers items should be subclass of TagHandler')
+            all_tag_handlers.extend(tag_handlers)
+
+        all_tag_handlers.append(ImportHandler(resolve_roots))
+        all_tag_handlers.append(
+            GlobHandler(resolve_roots, executor=glob_executor)
+        )
+        all_tag_handlers.append(EnvHandler())
+        all_tag_handlers.append(IfHandler())
+
+        if error_handler is not None:
+            assert callable(error_handler), \
+                _('error_handler must be a callable object.')
+
+        if schema_plans is None:
+            schema_plans = SchemaPlanCache()
+
+        self._resolve_roots = list(resolve_roots) \
+            if resolve_roots is not None else []
+        self._tag_handlers = all_tag_handlers
+        self._error_handler = error_handler
+        self._flags = set(flags) if flags is not None else set()
+        self._schema_resolver = schema_resolver
+        self._parser_backend = parser_backend
+        self._document_cache = document_cache
+        self._schema_plans = schema_plans
+        self._streaming = streaming
+        self._result_cache = result_cache
+        self._root_fields: Dict[Type[Any], BaseField] = {}
+
+    @property
+    def document_cache(self) -> Optional[DocumentCache]:
+        """Cache of composed documents used by this loader, if any."""
+        return self._document_cache
+
+    @property
+    def schema_plans(self) -> SchemaPlanCache:
+        """Cache of schema plans used by this loader."""
+        return self._schema_plans
+
+    def load(
+        self,
+        source: YamlSource,
+        object_class: Optional[Type[ObjectType]] = None,
+        root_field: Optional[BaseField] = None,
+        stats: Optional[LoadStats] = None,
+        profiler: Optional[LoadProfiler] = None,
+        reload_state: Optional[ReloadState] = None,
+        manifest: Optional[LoadManifest] = None
+    ) -> LoadResult[ObjectType]:
+        """Deserialize a YAML document into an object.
+
+        See pofy.load for a description of the parameters.
+        """
+        return self._load(source, object_class, root_field,
+                          self._error_handler, stats, profiler, reload_state,
+                          manifest)
+
+    def load_all(
+        self,
+        source: YamlSource,
+        object_class: Optional[Type[ObjectType]] = None,
+        root_field: Optional[BaseField] = None
+    ) -> Iterator[Tuple[int, LoadResult[ObjectType]]]:
+        """Deserialize each document of a YAML stream into an object.
+
+        See pofy.load_all for a description of the parameters.
+        """
+        _check_source(source)
+
+        assert isclass(object_class), _('object_class must be a type')
+        if root_field is None:
+            assert object_class is not None
+            root_field = self._get_root_field(object_class)
+
+        backend = self._parser_backend
+        opened_source = _open_source(source, self._streaming, backend)
+        with opened_source as (yaml_source, node_path):
+            if self._streaming:
+                nodes = _compose_streaming(yaml_source, backend)
+            else:
+                nodes = compose_documents(yaml_source, backend)
+
+            for index, node in enumerate(nodes):
+                # Each document gets its own context, so that nothing loaded
+                # from a document leaks in the following ones.
+                context = self._create_context(self._error_handler)
+                result = context.load(root_field, node, node_path)
+                if result is UNDEFINED:
+                    yield index, UNDEFINED
+                else:
+                    yield index, cast(ObjectType, result)
+
+    def load_many(
+        self,
+        sources: Iterable[Union[str, Path]],
+        object_class: Optional[Type[ObjectType]] = None,
+        root_field: Optional[BaseField] = None,
+        workers: int = 1,
+        chunk_size: int = 1
+    ) -> Iterator[LoadOutcome]:
+        """Deserialize several independent YAML documents.
+
+        See pofy.load_many for a description of the parameters.
+        """
+        assert workers > 0, _('workers must be strictly positive.')
+        assert chunk_size > 0, _('chunk_size must be strictly positive.')
+        assert isclass(object_class), _('object_class must be a type')
+
+        indexed_sources = enumerate(sources)
+        if workers == 1:
+            for index, source in indexed_sources:
+                yield self._load_outcome(index, source, object_class,
+                                         root_field)
+            return
+
+        # The loader configuration is sent once to each worker, by the pool
+        # initializer. The loader error handler isn't used by load_many, and
+        # can't always be pickled.
+        worker_loader = copy(self)
+        worker_loader._error_handler = None
+        worker_loader._root_fields = {}
+        with Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(worker_loader, object_class, root_field)
+        ) as pool:
+            for outcome in pool.imap(_load_in_worker, indexed_sources,
+                                     chunk_size):
+                yield outcome
+
+    def _load(
+        self,
+        source: YamlSource,
+        object_class: Optional[Type[ObjectType]],
+        root_field: Optional[BaseField],
+        error_handler: Optional[ErrorHandler],
+        stats: Optional[LoadStats] = None,
+        profiler: Optional[LoadProfiler] = None,
+        reload_state: Optional[ReloadState] = None,
+        manifest: Optional[LoadManifest] = None
+    ) -> LoadResult[ObjectType]:
+        _check_source(source)
+
+        assert isclass(object_class), _('object_class must be a type')
+        if self._result_cache is not None and reload_state is None:
+            key = self._get_cache_key(source, object_class, root_field)
+            if key is not None:
+                return self._load_cached(key, source, object_class,
+                                         root_field, error_handler, stats,
+                                         profiler, manifest)
+
+        return self._load_uncached(source, object_class, root_field,
+                                   error_handler, stats, profiler,
+                                   reload_state, manifest)
+
+    def _load_uncached(
+        self,
+        source: YamlSource,
+        object_class: Optional[Type[ObjectType]],
+        root_field: Optional[BaseField],
+        error_handler: Optional[ErrorHandler],
+        stats: Optional[LoadStats],
+        profiler: Optional[LoadProfiler],
+        reload_state: Optional[ReloadState],
+        manifest: Optional[LoadManifest]
+    ) -> LoadResult[ObjectType]:
+        context = self._create_context(error_handler, stats, profiler,
+                                       reload_state, manifest)
+        return self._load_in_context(context, source, object_class,
+                                     root_field, stats, reload_state,
+                                     manifest)
+
+    def _load_in_context(
+        self,
+        context: LoadingContext,
+        source: YamlSource,
+        object_class: Optional[Type[ObjectType]],
+        root_field: Optional[BaseField],
+        stats: Optional[LoadStats],
+        reload_state: Optional[ReloadState],
+        manifest: Optional[LoadManifest]
+    ) -> LoadResult[ObjectType]:
+        if root_field is None:
+            assert object_class is not None
+            root_field = self._get_root_field(object_class)
+
+        if reload_state is not None:
+            assert self._document_cache is not None, \
+                _('Loading with a reload state requires a document cache.')
+            reload_state.start_load()
+
+        # The loaded file is stat'ed before being read, so that the manifest
+        # can detect modifications made while loading it.
+        root_path: Optional[Path] = None
+        root_version = None
+        if manifest is not None:
+            node_path = _get_node_path(source)
+            if node_path is not None and Path(node_path).is_file():
+                root_path = Path(node_path)
+                root_version = get_file_version(node_path)
+
+        opened_source = _open_source(source, self._streaming,
+                                     self._parser_backend)
+        with opened_source as (yaml_source, node_path):
+            if manifest is not None and root_path is not None:
+                manifest.add_file(root_path, version=root_version)
+
+            if stats is not None:
+                result = self._load_with_stats(context, yaml_source,
+                                               root_field, node_path, stats)
+            elif self._streaming:
+                result = _load_streaming(context, yaml_source, root_field,
+                                         node_path)
+            else:
+                node = compose_document(yaml_source,
+                                        context.get_parser_backend())
+                result = context.load(root_field, node, node_path)
+
+        if reload_state is not None:
+            reload_state.end_load()
+
+        return cast(LoadResult[ObjectType], result)
+
+    def _load_cached(
+        self,
+        key: str,
+        source: YamlSource,
+        object_class: Optional[Type[ObjectType]],
+        root_field: Optional[BaseField],
+        error_handler: Optional[ErrorHandler],
+        stats: Optional[LoadStats],
+        profiler: Optional[LoadProfiler],
+        manifest: Optional[LoadManifest]
+    ) -> LoadResult[ObjectType]:
+        cache = self._result_cache
+        assert cache is not None
+        cached = cache.get(key)
+        if cached is not None:
+            result, cached_manifest = cached
+            if manifest is not None:
+                manifest.update(cached_manifest)
+            return cast(ObjectType, result)
+
+        recorded = LoadManifest()
+        context = self._create_context(error_handler, stats, profiler, None,
+                                       recorded)
+        result = self._load_in_context(context, source, object_class,
+                                       root_field, stats, None, recorded)
+        # Results are stored only if no error was reported while loading,
+        # and if inputs didn't change during the loading.
+        if result is not UNDEFINED and context.get_error_count() == 0 and \
+                not recorded.is_stale():
+            cache.put(key, result, recorded)
+
+        if manifest is not None:
+            manifest.update(recorded)
+
+        return result
+
+    def _get_cache_key(
+        self,
+        source: YamlSource,
+        object_class: Optional[Type[Any]],
+        root_field: Optional[BaseField]
+    ) -> Optional[str]:
+        """Return the result cache key of a loading, or None.
+
+        The key identifies the root document (its content, or the path of
+        its file, which is recorded in the manifest), the schema fingerprint
+        of the loaded class or root field, the flags, the resolve roots, the
+        tag handlers with their attributes and the salt of the result cache.
+        Streamed loadings aren't cached.
+        """
+        if self._streaming:
+            return None
+
+        hasher = sha256()
+        if isinstance(source, str):
+            hasher.update(b'string\0')
+            hasher.update(source.encode('utf-8', 'surrogatepass'))
+        elif isinstance(source, bytes):
+            hasher.update(b'bytes\0')
+            hasher.update(source)
+        else:
+            node_path = _get_node_path(source)
+            if node_path is None or not Path(node_path).is_file():
+                return None
+            hasher.update('file\0{}'.format(Path(node_path).resolve())
+                          .encode('utf-8', 'surrogatepass'))
+
+        schema_resolver = self._schema_resolver or default_schema_resolver
+        if root_field is not None:
+            schema = self._schema_plans.get_field_fingerprint(
+                root_field,
+                schema_resolver
+            )
+        else:
+            assert object_class is not None
+            schema = self._schema_plans.get_fingerprint(object_class,
+                                                        schema_resolver)
+
+        parts = [schema]
+        parts += sorted(self._flags)
+        parts += [str(root.resolve()) for root in self._resolve_roots]
+        parts += [
+            '{}.{}({})'.format(type(handler).__module__,
+                               type(handler).__qualname__,
+                               describe_value(vars(handler)))
+            for handler in self._tag_handlers
+        ]
+        assert self._result_cache is not None
+        parts.append(self._result_cache.salt)
+        for part in parts:
+            hasher.update(b'\0')
+            hasher.update(part.encode('utf-8', 'surrogatepass'))
+
+        return hasher.hexdigest()
+
+    def _load_outcome(
+        self,
+        index: int,
+        source: Union[str, Path],
+        object_class: Optional[Type[Any]],
+        root_field: Optional[BaseField]
+    ) -> LoadOutcome:
+        errors: List[LoadError] = []
+
+        def _collect_error(node: Node, code: ErrorCode, message: str) -> None:
+            mark = node.start_mark
+            errors.append(LoadError(code, message, getattr(mark, 'name', None),
+                                    mark.line, mark.column))
+
+        location = str(source) if isinstance(source, Path) else None
+        result: Any = UNDEFINED
+        try:
+            result = self._load(source, object_class, root_field,
+                                _collect_error)
+        except MarkedYAMLError as error:
+            mark = error.problem_mark
+            errors.append(LoadError(None, str(error), location,
+                                    mark.line if mark else 0,
+                                    mark.column if mark else 0))
+        # Other failures (unreadable files, exceptions raised by hooks or tag
+        # handlers) are reported for this source only, so that they don't
+        # stop the loading of the following ones.
+        except Exception as error: # pylint: disable=broad-except
+            message = '{}: {}'.format(type(error).__name__, error)
+            errors.append(LoadError(None, message, location, 0, 0))
+
+        return LoadOutcome(index, location, result, errors)
+
+    def _load_with_stats(
+        self,
+        context: LoadingContext,
+        source: YamlSource,
+        root_field: BaseField,
+        node_path: Optional[str],
+        stats: LoadStats
+    ) -> Any:
+        if self._streaming:
+            with stats.phase(PHASE_CONVERT):
+                return _load_streaming(context, source, root_field,
+                                       node_path)
+
+        with stats.phase(PHASE_COMPOSE):
+            node = compose_document(source, context.get_parser_backend())
+
+        with stats.phase(PHASE_CONVERT):
+            return context.load(root_field, node, node_path)
+
+    def _create_context(
+        self,
+        error_handler: Optional[ErrorHandler],
+        stats: Optional[LoadStats] = None,
+        profiler: Optional[LoadProfiler] = None,
+        reload_state: Optional[ReloadState] = None,
+        manifest: Optional[LoadManifest] = None
+    ) -> LoadingContext:
+        return LoadingContext(
+            error_handler=error_handler,
+            tag_handlers=self._tag_handlers,
+            flags=self._flags,
+            schema_resolver=self._schema_resolver,
+            schema_plans=self._schema_plans,
+            parser_backend=self._parser_backend,
+            document_cache=self._document_cache,
+            stats=stats,
+            profiler=profiler,
+            reload_state=reload_state,
+            manifest=manifest
+        )
+
+    def _get_root_field(self, object_class: Type[Any]) -> BaseField:
+        root_field = self._root_fields.get(object_class)
+        if root_field is not None:
+            return root_field
+
+        root_field = _ROOT_FIELDS_MAPPING.get(object_class)
+        if root_field is None:
+            root_field = ObjectField(object_class=object_class)
+
+        self._root_fields[object_class] = root_field
+        return root_field
+
+
+def _load_streaming(
+    context: LoadingContext,
+    source: YamlSource,
+    root_field: BaseField,
+    node_path: Optional[str]
+) -> Any:
+    composer = StreamingComposer(source, context.get_parser_backend())
+    dispose = True
+    try:
+        node = composer.get_root()
+        result = context.load(root_field, node, node_path)
+        if isinstance(result, abc.Iterator):
+            # Lazy root sequence : the end of the document is composed while
+            # the result is iterated, the composer has to stay alive.
+            dispose = False
+            return _iter_and_close(composer, result)
+
+        composer.close()
+    finally:
+        if dispose:
+            composer.dispose()
+
+    return result
+
+
+def _iter_and_close(
+    composer: StreamingComposer,
+    items: Iterator[Any]
+) -> Iterator[Any]:
+    try:
+        yield from items
+        composer.close()
+    finally:
+        composer.dispose()
+
+
+# Loader used by load_many worker processes, set by _init_worker.
+_WORKER_STATE: Optional[Tuple[Loader, Any, Optional[BaseField]]] = None
+
+
+def _init_worker(
+    loader: Loader,
+    object_class: Optional[Type[Any]],
+    root_field: Optional[BaseField]
+) -> None:
+    global _WORKER_STATE # pylint: disable=global-statement
+    _WORKER_STATE = (loader, object_class, root_field)
+
+
+def _load_in_worker(indexed_source: Tuple[int, Union[str, Path]]) \
+        -> LoadOutcome:
+    assert _WORKER_STATE is not None
+    loader, object_class, root_field = _WORKER_STATE
+    index, source = indexed_source
+    return loader._load_outcome( # pylint: disable=protected-access
+        index,
+        source,
+        object_class,
+        root_field
+    )
+
+
+def _compose_streaming(
+    source: YamlSource,
+    backend: ParserBackend
+) -> Iterator[Node]:
+    composer = StreamingComposer(source, backend)
+    try:
+        node = composer.get_next_root()
+        while node is not None:
+            yield node
+            node = composer.get_next_root()
+    finally:
+        composer.dispose()
+
+
+def _check_source(source: YamlSource) -> None:
+    assert isinstance(source, (str, bytes, Path, IOBase)), \
+        _('source parameter must be a string, bytes, a Path or a stream.')
+
+
+@contextmanager
+def _open_source(
+    source: YamlSource,
+    streaming: bool,
+    backend: ParserBackend
+) -> Iterator[Tuple[Any, Optional[str]]]:
+    """Return the source to give to the parser, and the path of the source.
+
+    Files and binary streams are read at once, see pofy.source_buffer. When
+    streaming, a lazily loaded document is composed after load returns : the
+    buffer is left open, and files aren't memory-mapped. They aren't either
+    when the backend doesn't parse them as streams, see should_map_files.
+    """
+    if isinstance(source, Path):
+        use_mmap = not streaming and should_map_files(backend)
+        buffer = read_file(source, use_mmap=use_mmap)
+    elif is_binary_stream(source) and not streaming:
+        buffer = read_stream(source)
+    else:
+        yield source, _get_node_path(source)
+        return
+
+    try:
+        yield buffer, _get_node_path(source)
+    finally:
+        if not streaming:
+            buffer.close()
+
+
+def _get_node_path(source: YamlSource) -> Optional[str]:
+    if isinstance(source, Path):
+        return str(source)
+
+    if isinstance(source, IOBase) and isinstance(getattr(source, 'name', None),
+                                                 str):
+        return cast(str, getattr(source, 'name'))
+
+    return None
+
+
 def load(
-    source: Union[str, IO[str]],
+    source: YamlSource,
     object_class: Optional[Type[ObjectType]] = None,
     resolve_roots: Optional[Iterable[Path]] = None,
     tag_handlers: Optional[Iterable[TagHandler]] = None,
     error_handler: Optional[ErrorHandler] = None,
     root_field: Optional[BaseField] = None,
     flags: Optional[Set[str]] = None,
-    schema_resolver: Optional[SchemaResolver] = None
+    schema_resolver: Optional[SchemaResolver] = None,
+    parser_backend: ParserBackend = ParserBackend.AUTO,
+    document_cache: Optional[DocumentCache] = None,
+    streaming: bool = False,
+    glob_executor: Optional[Executor] = None,
+    stats: Optional[LoadStats] = None,
+    profiler: Optional[LoadProfiler] = None,
+    reload_state: Optional[ReloadState] = None,
+    manifest: Optional[LoadManifest] = None,
+    result_cache: Optional[ResultCache] = None
 ) -> LoadResult[ObjectType]:
     """Deserialize a YAML document into an object.
 
+    Calling this function creates a new Loader each time. When loading
+    several documents with the same parameters, create a Loader once and call
+    its load method instead.
+
     Args:
-        source :            Either a string containing YAML, or a stream to a
-                            YAML source.
+        source :            A string or bytes containing YAML, the Path of a
+                            YAML file, or a text or binary stream. Files and
+                            binary streams are read at once, large files are
+                            memory-mapped. See pofy.source_buffer.
         object_class :      Class of the object to create. It will infer the
                             root field to use from this type (Scalar, list,
                             dictionary, or object).
@@ -80,51 +694,139 @@ def load(
                             given type, or None if not found. By default, it
                             will search for a nested class named 'Schema' in
                             the deserialized type.
+        parser_backend:     Parser used to compose YAML documents. By default,
+                            libyaml is used if PyYAML was built with it. Use
+                            pofy.resolve_parser_backend to know which backend
+                            is effectively used.
+        document_cache:     Cache of composed documents, used to avoid parsing
+                            again files imported or globbed by several calls
+                            to load. If None, files are parsed each time they
+                            are imported.
+        streaming:          If True, the document is composed while it's
+                            loaded, instead of being fully composed first.
+                            This lowers peak memory usage on big documents,
+                            see pofy.event_composer.
+        glob_executor:      Executor used to read and compose files matched
+                            by !glob tags concurrently. See GlobHandler.
+        stats:              If set, counters and timings about the loading
+                            are collected in this object. See LoadStats.
+        profiler:           If set, loading time is attributed to YAML nodes
+                            and hooks in this profiler. See LoadProfiler.
+        reload_state:       If set, imported or globbed documents converted
+                            by a previous call with the same state are
+                            reused, if their files didn't change. Requires a
+                            document_cache. See pofy.reload_state.
+        manifest:           If set, the files read, the environment variables
+                            and the flags the loading depends on are recorded
+                            in this object. See LoadManifest.
+        result_cache:       Cache storing loaded results on disk. A result is
+                            returned from it if the files and environment
+                            variables it was loaded from didn't change. See
+                            pofy.result_cache.
 
     """
-    assert isinstance(source, (str, TextIOBase)), \
-        _('source parameter must be a string or Text I/O.')
+    loader = Loader(
+        resolve_roots=resolve_roots,
+        tag_handlers=tag_handlers,
+        error_handler=error_handler,
+        flags=flags,
+        schema_resolver=schema_resolver,
+        parser_backend=parser_backend,
+        document_cache=document_cache,
+        schema_plans=DEFAULT_SCHEMA_PLANS,
+        streaming=streaming,
+        glob_executor=glob_executor,
+        result_cache=result_cache
+    )
+
+    return loader.load(source, object_class, root_field, stats, profiler,
+                       reload_state, manifest)
 
-    all_tag_handlers: List[TagHandler] = []
 
-    if tag_handlers is not None:
-        for handler_it in tag_handlers:
-            assert isinstance(handler_it, TagHandler), \
-                _('tag_handlers items should be subclass of TagHandler')
-        all_tag_handlers.extend(tag_handlers)
+def load_all(
+    source: YamlSource,
+    object_class: Optional[Type[ObjectType]] = None,
+    resolve_roots: Optional[Iterable[Path]] = None,
+    tag_handlers: Optional[Iterable[TagHandler]] = None,
+    error_handler: Optional[ErrorHandler] = None,
+    root_field: Optional[BaseField] = None,
+    flags: Optional[Set[str]] = None,
+    schema_resolver: Optional[SchemaResolver] = None,
+    parser_backend: ParserBackend = ParserBackend.AUTO,
+    document_cache: Optional[DocumentCache] = None,
+    streaming: bool = False,
+    glob_executor: Optional[Executor] = None
+) -> Iterator[Tuple[int, LoadResult[ObjectType]]]:
+    """Deserialize each document of a YAML stream into an object.
 
-    all_tag_handlers.append(ImportHandler(resolve_roots))
-    all_tag_handlers.append(GlobHandler(resolve_roots))
-    all_tag_handlers.append(EnvHandler())
-    all_tag_handlers.append(IfHandler())
+    Documents are composed and loaded one at a time, as the returned generator
+    is iterated, so only one document is kept in memory. Each document is
+    loaded with a new loading context. See pofy.load for a description of the
+    parameters.
 
-    if error_handler is not None:
-        assert callable(error_handler), \
-            _('error_handler must be a callable object.')
+    Return:
+        A generator of (index, result) tuples, index being the position of
+        the document in the stream, starting at 0.
 
-    context = LoadingContext(
+    """
+    loader = Loader(
+        resolve_roots=resolve_roots,
+        tag_handlers=tag_handlers,
         error_handler=error_handler,
-        tag_handlers=all_tag_handlers,
         flags=flags,
-        schema_resolver=schema_resolver
+        schema_resolver=schema_resolver,
+        parser_backend=parser_backend,
+        document_cache=document_cache,
+        schema_plans=DEFAULT_SCHEMA_PLANS,
+        streaming=streaming,
+        glob_executor=glob_executor
     )
 
-    assert isclass(object_class), _('object_class must be a type')
-    if root_field is None:
-        assert object_class is not None
-        root_field = _ROOT_FIELDS_MAPPING.get(object_class)
+    return loader.load_all(source, object_class, root_field)
+
 
-    if root_field is None:
-        assert object_class is not None
-        root_field = ObjectField(object_class=object_class)
+def load_many(
+    sources: Iterable[Union[str, Path]],
+    object_class: Optional[Type[ObjectType]] = None,
+    workers: int = 1,
+    chunk_size: int = 1,
+    resolve_roots: Optional[Iterable[Path]] = None,
+    tag_handlers: Optional[Iterable[TagHandler]] = None,
+    root_field: Optional[BaseField] = None,
+    flags: Optional[Set[str]] = None,
+    schema_resolver: Optional[SchemaResolver] = None,
+    parser_backend: ParserBackend = ParserBackend.AUTO,
+    document_cache: Optional[DocumentCache] = None
+) -> Iterator[LoadOutcome]:
+    """Deserialize several independent YAML documents, in parallel.
 
-    node = compose(source) # type: ignore
-    node_path = None
-    if isinstance(source, TextIOBase) and hasattr(source, 'name'):
-        node_path = source.name
+    Errors aren't raised : they're collected for each source, and returned in
+    the LoadOutcome of this source, along with the loaded object. This
+    includes YAML syntax errors and other exceptions, like errors reading a
+    file. See pofy.load for a description of the parameters not listed here.
 
-    result = context.load(root_field, node, node_path)
-    if result is UNDEFINED:
-        return UNDEFINED
+    Args:
+        sources:            YAML strings, or Path objects to YAML files.
+        workers:            Count of worker processes. Loader configuration
+                            (tag handlers, flags, schema resolver...) is sent
+                            once to each worker, so it must be picklable, as
+                            well as loaded objects. If 1, sources are loaded
+                            in the calling process.
+        chunk_size:         Count of sources sent at once to a worker.
+
+    Return:
+        A generator of LoadOutcome, in the order of sources.
+
+    """
+    loader = Loader(
+        resolve_roots=resolve_roots,
+        tag_handlers=tag_handlers,
+        flags=flags,
+        schema_resolver=schema_resolver,
+        parser_backend=parser_backend,
+        document_cache=document_cache,
+        schema_plans=DEFAULT_SCHEMA_PLANS
+    )
 
-    return cast(ObjectType, result)
+    return loader.load_many(sources, object_class, root_field, workers,
+                            chunk_size)
@@ -2,6 +2,7 @@
 from gettext import gettext as _
 from typing import Any
 from typing import Callable
+from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Optional
@@ -16,14 +17,30 @@ from yaml import SequenceNode
 
 from pofy.common import ErrorCode
 from pofy.common import SchemaResolver
+from pofy.common import UNDEFINED
 from pofy.common import default_schema_resolver
 from pofy.common import get_exception_type
+from pofy.document_cache import DocumentCache
+from pofy.error_collector import ErrorCollector
 from pofy.interfaces import IBaseField
 from pofy.interfaces import ILoadingContext
+from pofy.load_manifest import LoadManifest
+from pofy.load_profiler import LoadProfiler
+from pofy.load_stats import LoadStats
+from pofy.parser_backend import ParserBackend
+from pofy.parser_backend import resolve_parser_backend
+from pofy.reload_state import MISSING
+from pofy.reload_state import ReloadState
+from pofy.schema_plan import DEFAULT_SCHEMA_PLANS
+from pofy.schema_plan import SchemaPlan
+from pofy.schema_plan import SchemaPlanCache
 from pofy.tag_handlers.tag_handler import TagHandler
 
 ErrorHandler = Optional[Callable[[Node, ErrorCode, str], Any]]
-NodeStack = List[Tuple[Node, Optional[str]]]
+
+# Handlers that can match a tag, with a boolean telling if the handler needs
+# the node to be tested with TagHandler.match.
+TagCandidates = Tuple[Tuple[TagHandler, bool], ...]
 
 
 class LoadingContext(ILoadingContext):
@@ -34,18 +51,81 @@ class LoadingContext(ILoadingContext):
         error_handler: ErrorHandler,
         tag_handlers: Iterable[TagHandler],
         flags: Optional[Set[str]] = None,
-        schema_resolver: Optional[SchemaResolver] = None
+        schema_resolver: Optional[SchemaResolver] = None,
+        schema_plans: Optional[SchemaPlanCache] = None,
+        parser_backend: ParserBackend = ParserBackend.AUTO,
+        document_cache: Optional[DocumentCache] = None,
+        stats: Optional[LoadStats] = None,
+        profiler: Optional[LoadProfiler] = None,
+        reload_state: Optional[ReloadState] = None,
+        manifest: Optional[LoadManifest] = None
     ):
-        """Initialize context."""
+        """Initialize context.
+
+        Args:
+            error_handler: Called when an error occurs. If None, errors will
+                           raise a PofyError. If it's an ErrorCollector,
+                           errors are recorded and formatted lazily.
+            tag_handlers: Tag handlers used to load tagged nodes.
+            flags: Flags defined for this loading.
+            schema_resolver: Function returning the schema of a given type.
+            schema_plans: Cache of schema plans. If None, a cache shared by
+                          all contexts will be used.
+            parser_backend: Parser used to compose YAML documents.
+            document_cache: Cache used to store composed imported files.
+            stats: If set, statistics about the loading are collected in
+                   this object.
+            profiler: If set, loading time is attributed to YAML nodes in
+                      this profiler.
+            reload_state: If set, documents converted by a previous loading
+                          with the same state are reused if they didn't
+                          change. See pofy.reload_state.
+            manifest: If set, files, environment variables and flags the
+                      loading depends on are recorded in this object.
+
+        """
         self._error_handler = error_handler
-        self._tag_handlers = list(tag_handlers)
-        self._node_stack: NodeStack = []
+        self._error_collector: Optional[ErrorCollector] = None
+        if isinstance(error_handler, ErrorCollector):
+            # Collectors record errors without formatting messages.
+            self._error_collector = error_handler
+        self._tag_handlers: List[TagHandler] = []
+        self._tag_candidates: Dict[str, TagCandidates] = {}
+        for handler_it in tag_handlers:
+            self.add_tag_handler(handler_it)
+        self._node_stack: List[Node] = []
+        # Locations are pushed only by nodes loaded with a location, so the
+        # current one is always at the top.
+        self._location_stack: List[str] = []
         self._flags = flags if flags is not None else set()
         if schema_resolver is not None:
             self._schema_resolver = schema_resolver
         else:
             self._schema_resolver = default_schema_resolver
 
+        if schema_plans is not None:
+            self._schema_plans = schema_plans
+        else:
+            self._schema_plans = DEFAULT_SCHEMA_PLANS
+
+        self._parser_backend = resolve_parser_backend(parser_backend)
+        self._document_cache = document_cache
+        self._stats = stats
+        self._profiler = profiler
+        self._reload_state = reload_state
+        self._manifest = manifest
+        self._error_count = 0
+        # Instrumentation is done in separate methods, so that it costs
+        # nothing when disabled.
+        if stats is not None:
+            self.load = self._load_with_stats  # type: ignore
+        if reload_state is not None:
+            self._reloaded_load = self.load
+            self.load = self._load_with_reload_state  # type: ignore
+        if profiler is not None:
+            self._profiled_load = self.load
+            self.load = self._load_with_profiler  # type: ignore
+
     def load(
         self,
         field: IBaseField,
@@ -65,67 +145,178 @@ class LoadingContext(ILoadingContext):
                        same path, except until another child path is pushed.
 
         """
-        if len(self._node_stack) > 0:
-            assert self._node_stack[-1][0] != node
+        node_stack = self._node_stack
+        if len(node_stack) > 0:
+            assert node_stack[-1] is not node
 
-        self._node_stack.append((node, location))
+        node_stack.append(node)
+        if location is not None:
+            self._location_stack.append(location)
 
         try:
             tag_handler = self._get_tag_handler(node)
             if tag_handler is not None:
+                if self._stats is not None:
+                    self._stats.tag_handlers[type(tag_handler).__name__] += 1
                 result = tag_handler.load(self, field)
             else:
                 result = field.load(self)
         finally:
-            self._node_stack.pop()
+            node_stack.pop()
+            if location is not None:
+                self._location_stack.pop()
 
         return result
 
+    def _load_with_stats(
+        self,
+        field: IBaseField,
+        node: Node,
+        location: Optional[str] = None
+    ) -> Any:
+        assert self._stats is not None
+        self._stats.nodes += 1
+        return LoadingContext.load(self, field, node, location)
+
+    def _load_with_profiler(
+        self,
+        field: IBaseField,
+        node: Node,
+        location: Optional[str] = None
+    ) -> Any:
+        profiler = self._profiler
+        assert profiler is not None
+        parent = self._node_stack[-1] if len(self._node_stack) else None
+        profiler.push_node(node, parent)
+        try:
+            return self._profiled_load(field, node, location)
+        finally:
+            profiler.pop()
+
+    def _load_with_reload_state(
+        self,
+        field: IBaseField,
+        node: Node,
+        location: Optional[str] = None
+    ) -> Any:
+        state = self._reload_state
+        assert state is not None
+        path = state.get_path(node)
+        if path is None:
+            return self._reloaded_load(field, node, location)
+
+        if location is None:
+            location = self.current_location()
+        result = state.get_result(node, field, location)
+        if result is not MISSING:
+            return result
+
+        error_count = self._error_count
+        state.begin_document(path)
+        result = MISSING
+        try:
+            result = self._reloaded_load(field, node, location)
+        finally:
+            valid = result is not MISSING and result is not UNDEFINED and \
+                self._error_count == error_count
+            state.end_document(node, field, location, result, valid)
+
+        return result
+
+    def add_tag_handler(self, handler: TagHandler) -> None:
+        """Register a tag handler in this context.
+
+        Args:
+            handler: The handler to add. It has the lowest priority of all
+                     handlers already registered.
+
+        """
+        assert isinstance(handler, TagHandler), \
+            _('handler should be a subclass of TagHandler')
+        self._tag_handlers.append(handler)
+        self._tag_candidates.clear()
+
     def is_defined(self, flag: str) -> bool:
-        return flag in self._flags
+        defined = flag in self._flags
+        if self._manifest is not None:
+            self._manifest.add_flag(flag, defined)
+
+        return defined
 
     def get_schema_resolver(self) -> SchemaResolver:
         return self._schema_resolver
 
+    def get_document_cache(self) -> Optional[DocumentCache]:
+        return self._document_cache
+
+    def get_parser_backend(self) -> ParserBackend:
+        return self._parser_backend
+
+    def get_stats(self) -> Optional[LoadStats]:
+        return self._stats
+
+    def get_profiler(self) -> Optional[LoadProfiler]:
+        return self._profiler
+
+    def get_manifest(self) -> Optional[LoadManifest]:
+        return self._manifest
+
+    def get_error_count(self) -> int:
+        """Return the count of errors reported in this context."""
+        return self._error_count
+
+    def get_reload_state(self) -> Optional[ReloadState]:
+        return self._reload_state
+
+    def get_schema_plan(self, cls: Type[Any]) -> Optional[SchemaPlan]:
+        return self._schema_plans.get(cls, self._schema_resolver)
+
     def current_node(self) -> Node:
         """Return the currently loaded node."""
         nodes = self._node_stack
         assert len(nodes) > 0
-        return nodes[-1][0]
+        return nodes[-1]
 
     def current_location(self) -> Optional[str]:
         """Return the location of the document owning the current node.
 
         If no path can be found, returs None.
         """
-        for __, location in reversed(self._node_stack):
-            if location is not None:
-                return location
+        locations = self._location_stack
+        if len(locations) > 0:
+            return locations[-1]
 
         return None
 
+    # Error messages are translated only when the check fails, as calling
+    # gettext on each loaded node is costly.
     def expect_scalar(self, message: Optional[str] = None) -> bool:
         """Return false and raise an error if the current node isn't scalar."""
+        if isinstance(self.current_node(), ScalarNode):
+            return True
+
         if message is None:
             message = _('Expected a scalar value.')
-        return self._expect_node(
-            ScalarNode,
-            message
-        )
+        self.error(ErrorCode.UNEXPECTED_NODE_TYPE, message)
+        return False
 
     def expect_sequence(self) -> bool:
         """Return false and raise if the current node isn't a sequence."""
-        return self._expect_node(
-            SequenceNode,
-            _('Expected a sequence value.')
-        )
+        if isinstance(self.current_node(), SequenceNode):
+            return True
+
+        self.error(ErrorCode.UNEXPECTED_NODE_TYPE,
+                   _('Expected a sequence value.'))
+        return False
 
     def expect_mapping(self) -> bool:
         """Return false and raise if the current node isn't a mapping."""
-        return self._expect_node(
-            MappingNode,
-            _('Expected a mapping value.')
-        )
+        if isinstance(self.current_node(), MappingNode):
+            return True
+
+        self.error(ErrorCode.UNEXPECTED_NODE_TYPE,
+                   _('Expected a mapping value.'))
+        return False
 
     def error(
         self,
@@ -146,7 +337,16 @@ class LoadingContext(ILoadingContext):
 
         """
         assert len(self._node_stack) > 0
-        node, __ = self._node_stack[-1]
+        node = self._node_stack[-1]
+        self._error_count += 1
+        if self._stats is not None:
+            self._stats.errors[code] += 1
+
+        collector = self._error_collector
+        if collector is not None:
+            collector.collect(node, code, message_format, args, kwargs)
+            return
+
         message = message_format.format(*args, **kwargs)
         if self._error_handler is not None:
             self._error_handler(node, code, message)
@@ -154,33 +354,19 @@ class LoadingContext(ILoadingContext):
             exception_type = get_exception_type(code)
             raise exception_type(node, message)
 
-    def _expect_node(
-        self,
-        node_type: Type[Node],
-        error_format: str,
-        *args: Any,
-        **kwargs: Any
-    ) -> bool:
-        current_node = self.current_node()
-        if not isinstance(current_node, node_type):
-            self.error(
-                ErrorCode.UNEXPECTED_NODE_TYPE,
-                error_format,
-                *args,
-                **kwargs
-            )
-            return False
-
-        return True
-
     def _get_tag_handler(self, node: Node) -> Optional[TagHandler]:
         tag = node.tag
         if not tag.startswith('!'):
             return None
 
+        candidates = self._tag_candidates.get(tag)
+        if candidates is None:
+            candidates = self._get_tag_candidates(tag)
+            self._tag_candidates[tag] = candidates
+
         found_handler = None
-        for handler in self._tag_handlers:
-            if not handler.match(node):
+        for handler, check_node in candidates:
+            if check_node and not handler.match(node):
                 continue
 
             if found_handler is not None:
@@ -193,3 +379,14 @@ class LoadingContext(ILoadingContext):
             found_handler = handler
 
         return found_handler
+
+    def _get_tag_candidates(self, tag: str) -> TagCandidates:
+        candidates = []
+        for handler in self._tag_handlers:
+            # Handlers overriding match can't be resolved only from the tag.
+            if type(handler).match is not TagHandler.match:
+                candidates.append((handler, True))
+            elif handler.match_tag(tag):
+                candidates.append((handler, False))
+
+        return tuple(candidates)
@@ -0,0 +1,136 @@
+"""YAML parser backend selection & utilities.
+
+PyYAML comes with a pure python parser, and optionally with bindings to the
+libyaml C library, which composes documents much faster. Both produce the same
+node graph, and marks holding the same file name, line and column.
+"""
+from enum import Enum
+from gettext import gettext as _
+from typing import Any
+from typing import Iterator
+from typing import Optional
+from typing import cast
+
+from yaml import Node
+from yaml import SafeLoader
+from yaml import __with_libyaml__
+
+from pofy.source_buffer import NamedBuffer
+
+# Wether PyYAML was built with libyaml bindings.
+LIBYAML_AVAILABLE: bool = __with_libyaml__
+
+if LIBYAML_AVAILABLE:
+    from yaml import CSafeLoader
+
+
+class ParserBackend(Enum):
+    """Parser used to compose YAML documents."""
+
+    # Use libyaml if available, the pure python parser otherwise.
+    AUTO = 'auto'
+
+    # Use libyaml bindings. Fails if PyYAML wasn't built with libyaml.
+    LIBYAML = 'libyaml'
+
+    # Use the pure python parser.
+    PYTHON = 'python'
+
+
+def resolve_parser_backend(backend: ParserBackend) -> ParserBackend:
+    """Return the backend effectively used when requesting the given one.
+
+    Args:
+        backend: The requested backend.
+
+    Return:
+        Either ParserBackend.LIBYAML or ParserBackend.PYTHON.
+
+    """
+    assert isinstance(backend, ParserBackend), \
+        _('backend must be a ParserBackend value.')
+
+    if backend == ParserBackend.AUTO:
+        if LIBYAML_AVAILABLE:
+            return ParserBackend.LIBYAML
+        return ParserBackend.PYTHON
+
+    if backend == ParserBackend.LIBYAML:
+        assert LIBYAML_AVAILABLE, \
+            _('PyYAML was built without libyaml bindings.')
+
+    return backend
+
+
+def should_map_files(backend: ParserBackend) -> bool:
+    """Return True if large files parsed with a backend should be mmap'ed.
+
+    libyaml reads memory-mapped files as streams, without copying them. The
+    pure python parser is given the whole content as bytes, which would copy
+    the mapping : files are then read normally.
+    """
+    return resolve_parser_backend(backend) == ParserBackend.LIBYAML
+
+
+def compose_document(source: Any, backend: ParserBackend) -> Optional[Node]:
+    """Compose a single YAML document, using the given parser backend.
+
+    Args:
+        source: A string or a stream containing the YAML document.
+        backend: The parser backend to use.
+
+    Return:
+        The root node of the document, or None if the document is empty.
+
+    """
+    loader = create_loader(source, backend)
+    try:
+        return cast(Optional[Node], loader.get_single_node())
+    finally:
+        loader.dispose()
+
+
+def compose_documents(source: Any, backend: ParserBackend) -> Iterator[Node]:
+    """Compose the documents of a YAML stream one at a time.
+
+    Args:
+        source: A string or a stream containing YAML documents.
+        backend: The parser backend to use.
+
+    Return:
+        An iterator over the root nodes of the documents.
+
+    """
+    loader = create_loader(source, backend)
+    try:
+        while loader.check_node():
+            yield loader.get_node()
+    finally:
+        loader.dispose()
+
+
+def create_loader(source: Any, backend: ParserBackend) -> Any:
+    """Create a PyYAML loader parsing the given source.
+
+    Args:
+        source: A string or a stream containing YAML documents.
+        backend: The parser backend to use.
+
+    """
+    loader_class = get_loader_class(backend)
+    if isinstance(source, NamedBuffer) and loader_class is SafeLoader:
+        # The python reader decodes bytes at once, but streams chunk by
+        # chunk. Marks take the name of the reader.
+        loader = loader_class(source.getvalue())
+        loader.name = source.name
+        return loader
+
+    return loader_class(source)
+
+
+def get_loader_class(backend: ParserBackend) -> Any:
+    """Return the PyYAML loader class implementing the given backend."""
+    if resolve_parser_backend(backend) == ParserBackend.LIBYAML:
+        return CSafeLoader
+
+    return SafeLoader
@@ -0,0 +1,245 @@
+"""Reload state class & utilities.
+
+A ReloadState given to successive calls to Loader.load records, for each
+imported or globbed document, the object it was converted to, and the files
+this conversion depended on. When the same document is loaded again, if none
+of those files changed, the previously converted object is reused instead of
+being converted again, along with everything it contains : validation and
+post-load hooks aren't run again either. Only the documents that changed and
+the documents importing them are converted again.
+
+Unchanged documents are recognized by their root node : a loader using a
+reload state must have a DocumentCache, that returns the same node as long as
+a file isn't modified.
+
+Reused objects are shared between results of successive loads. Within a
+single load, each import of a document gets its own object, as without a
+reload state : an object is reused at most once per load.
+
+Documents using !env, !glob or a !try-import that didn't find its file aren't
+reused, as their result can change without any file being modified. Documents
+matched by a !glob can be reused though.
+"""
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from yaml import Node
+
+from pofy.document_cache import FileVersion
+from pofy.document_cache import get_file_version
+
+# Versions of the files a converted document depends on, by resolved path.
+Dependencies = Dict[str, Optional[FileVersion]]
+
+
+class ReloadState:
+    """Converted documents and their dependencies, kept between loads."""
+
+    def __init__(self) -> None:
+        """Initialize an empty state."""
+        # Root nodes of loaded documents, and their resolved path, by node id.
+        self._documents: Dict[int, Tuple[Node, str]] = {}
+        self._entries: Dict[_EntryKey, _Entry] = {}
+        self._frames: List[_Frame] = []
+        # Versions of files stat'ed during the current load.
+        self._versions: Dependencies = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """Count of documents whose converted object was reused."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Count of documents that had to be converted."""
+        return self._misses
+
+    def changed_files(self) -> List[Path]:
+        """Return the recorded files that were modified or deleted.
+
+        This can be used to skip reloading when nothing changed.
+        """
+        recorded: Dependencies = {}
+        for entry in self._entries.values():
+            recorded.update(entry.dependencies)
+
+        return [
+            Path(path) for path, version in sorted(recorded.items())
+            if _stat_file(path) != version
+        ]
+
+    def start_load(self) -> None:
+        """Start recording a new load."""
+        self._generation += 1
+        self._versions = {}
+        self._frames = []
+
+    def end_load(self) -> None:
+        """Drop documents and entries that weren't used by the last load."""
+        generation = self._generation
+        self._entries = {
+            key: entry for key, entry in self._entries.items()
+            if entry.generation == generation
+        }
+        used_nodes = {key[0] for key in self._entries}
+        self._documents = {
+            node_id: document
+            for node_id, document in self._documents.items()
+            if node_id in used_nodes
+        }
+
+    def add_document(self, path: Path, node: Node) -> None:
+        """Record the root node of a document read from a file.
+
+        Args:
+            path: Path of the document.
+            node: Root node of the document.
+
+        """
+        key = str(path.resolve())
+        self._documents[id(node)] = (node, key)
+        self._add_dependency(key)
+
+    def mark_volatile(self) -> None:
+        """Prevent documents being converted from being reused."""
+        for frame in self._frames:
+            frame.volatile = True
+
+    def get_path(self, node: Node) -> Optional[str]:
+        """Return the path of a recorded document root node, if any."""
+        document = self._documents.get(id(node))
+        if document is None or document[0] is not node:
+            return None
+
+        return document[1]
+
+    def get_result(
+        self,
+        node: Node,
+        field: Any,
+        location: Optional[str]
+    ) -> Any:
+        """Return the reusable result of a document, or MISSING.
+
+        Args:
+            node: Root node of the document.
+            field: Field used to load the document.
+            location: Location of the document in the loading context.
+
+        """
+        entry = self._entries.get((id(node), id(field), location))
+        if entry is None or entry.field is not field:
+            return MISSING
+
+        # The object is already used by the current load : the document is
+        # converted again, so that separate imports don't share objects.
+        if entry.generation == self._generation:
+            return MISSING
+
+        for path, version in entry.dependencies.items():
+            if self._get_version(path) != version:
+                return MISSING
+
+        self._hits += 1
+        # Documents nested in a reused one are still in use.
+        generation = self._generation
+        entry.generation = generation
+        for nested_key in entry.nested:
+            nested_entry = self._entries.get(nested_key)
+            if nested_entry is not None:
+                nested_entry.generation = generation
+
+        if len(self._frames) > 0:
+            parent = self._frames[-1]
+            parent.dependencies.update(entry.dependencies)
+            parent.nested.append((id(node), id(field), location))
+            parent.nested.extend(entry.nested)
+
+        return entry.result
+
+    def begin_document(self, path: str) -> None:
+        """Start recording the dependencies of a converted document."""
+        self._misses += 1
+        frame = _Frame()
+        frame.dependencies[path] = self._get_version(path)
+        self._frames.append(frame)
+
+    def end_document(
+        self,
+        node: Node,
+        field: Any,
+        location: Optional[str],
+        result: Any,
+        valid: bool
+    ) -> None:
+        """Store the converted document, if it can be reused.
+
+        Args:
+            node, field, location: See get_result.
+            result: The converted object.
+            valid: False if errors were reported while converting the
+                   document.
+
+        """
+        frame = self._frames.pop()
+        key = (id(node), id(field), location)
+        if len(self._frames) > 0:
+            parent = self._frames[-1]
+            parent.dependencies.update(frame.dependencies)
+            parent.volatile = parent.volatile or frame.volatile
+            parent.nested.append(key)
+            parent.nested.extend(frame.nested)
+
+        if valid and not frame.volatile:
+            self._entries[key] = _Entry(field, result, frame.dependencies,
+                                        frame.nested, self._generation)
+
+    def _add_dependency(self, path: str) -> None:
+        if len(self._frames) > 0:
+            self._frames[-1].dependencies[path] = self._get_version(path)
+
+    def _get_version(self, path: str) -> Optional[FileVersion]:
+        versions = self._versions
+        if path not in versions:
+            versions[path] = _stat_file(path)
+
+        return versions[path]
+
+
+# Returned by get_result when no reusable result is found.
+MISSING = object()
+
+# Root node id, field id and location of a converted document.
+_EntryKey = Tuple[int, int, Optional[str]]
+
+
+class _Entry:
+    def __init__(self, field: Any, result: Any, dependencies: Dependencies,
+                 nested: List[_EntryKey], generation: int):
+        self.field = field
+        self.result = result
+        self.dependencies = dependencies
+        # Keys of the documents loaded while converting this one.
+        self.nested = nested
+        self.generation = generation
+
+
+class _Frame:
+    def __init__(self) -> None:
+        self.dependencies: Dependencies = {}
+        self.nested: List[_EntryKey] = []
+        self.volatile = False
+
+
+def _stat_file(path: str) -> Optional[FileVersion]:
+    try:
+        return get_file_version(path)
+    except OSError:
+        return None
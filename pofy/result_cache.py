@@ -0,0 +1,223 @@
+"""Persistent cache of loaded results.
+
+A ResultCache stores loaded objects in a directory, so that processes loading
+the same unchanged documents, like command line tools started repeatedly, can
+skip composing and converting them entirely.
+
+Each entry records the LoadManifest of the loading that produced it. An entry
+is returned only if the manifest isn't stale : recorded files are stat'ed, and
+hashed again only if their size or modification time changed.
+
+Entries are pickled : the cache directory must only be writable by trusted
+users, as unpickling data can execute arbitrary code.
+"""
+import pickle
+from gettext import gettext as _
+from os import fdopen
+from os import remove
+from os import replace
+from os import scandir
+from os import utime
+from pathlib import Path
+from tempfile import mkstemp
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from pofy.load_manifest import LoadManifest
+
+# Incremented when the layout of entries changes, so that entries written by
+# other versions are ignored.
+_FORMAT_VERSION = 1
+
+_ENTRY_SUFFIX = '.pofy'
+
+
+class ResultCache:
+    """Size-bounded LRU cache of loaded results, stored in a directory.
+
+    Entries are written atomically, so the cache can be shared by several
+    processes. When the total size of the entries exceeds max_size, the least
+    recently used ones are removed. Entries that can't be read are removed,
+    and the document is loaded normally.
+
+    Entries are keyed by the loaded document, the schema fingerprint, and the
+    loader configuration, tag handler attributes included. The code of hooks,
+    validation callbacks and tag handlers is only identified by its qualified
+    name : change the salt when that code changes, so that previous entries
+    are ignored.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_size: int = 64 * 1024 * 1024,
+        salt: str = ''
+    ):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory where entries are stored. It's created if it
+                       doesn't exist.
+            max_size: Maximum total size of the entries, in bytes.
+            salt: String added to the key of each entry, like the version of
+                  the application. Caches with different salts don't share
+                  entries, even in the same directory.
+
+        """
+        assert isinstance(directory, Path), _('directory must be a Path.')
+        assert max_size > 0, _('max_size must be strictly positive.')
+        directory.mkdir(parents=True, exist_ok=True)
+        self._directory = directory
+        self._max_size = max_size
+        self._salt = salt
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def directory(self) -> Path:
+        """Directory where entries are stored."""
+        return self._directory
+
+    @property
+    def salt(self) -> str:
+        """String added to the key of each entry."""
+        return self._salt
+
+    @property
+    def hits(self) -> int:
+        """Count of results returned from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Count of lookups that didn't find a valid entry."""
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Count of entries removed because the cache was full."""
+        return self._evictions
+
+    def get(self, key: str) -> Optional[Tuple[Any, LoadManifest]]:
+        """Return a cached result and its manifest, or None.
+
+        Stale or unreadable entries are removed.
+
+        Args:
+            key: Key of the entry, see Loader for how it's computed.
+
+        """
+        path = self._get_path(key)
+        try:
+            with open(str(path), 'rb') as entry_file:
+                version, entry_key, manifest = pickle.load(entry_file)
+                if version != _FORMAT_VERSION or entry_key != key or \
+                        manifest.is_stale():
+                    raise _InvalidEntry()
+                result = pickle.load(entry_file)
+        except FileNotFoundError:
+            self._misses += 1
+            return None
+        # Corrupted entries can raise about any exception when unpickled.
+        except Exception: # pylint: disable=broad-except
+            self._misses += 1
+            _remove(path)
+            return None
+
+        # The modification time of entries is their last use time.
+        try:
+            utime(str(path))
+        except OSError:
+            pass
+
+        self._hits += 1
+        return result, manifest
+
+    def put(self, key: str, result: Any, manifest: LoadManifest) -> bool:
+        """Store a loaded result.
+
+        Args:
+            key: Key of the entry.
+            result: The loaded object.
+            manifest: Manifest of the loading that produced the result.
+
+        Return:
+            False if the result couldn't be pickled or written.
+
+        """
+        try:
+            header = pickle.dumps((_FORMAT_VERSION, key, manifest),
+                                  pickle.HIGHEST_PROTOCOL)
+            data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+
+        # The entry is written in a temporary file then renamed, so that
+        # other processes never read a partially written entry.
+        try:
+            handle, temp_path = mkstemp(dir=str(self._directory), prefix='.',
+                                        suffix='.tmp')
+        except OSError:
+            return False
+
+        try:
+            with fdopen(handle, 'wb') as temp_file:
+                temp_file.write(header)
+                temp_file.write(data)
+            replace(temp_path, str(self._get_path(key)))
+        except OSError:
+            _remove(Path(temp_path))
+            return False
+
+        self._evict()
+        return True
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for __, __, path in self._list_entries():
+            _remove(path)
+
+    def _get_path(self, key: str) -> Path:
+        return self._directory / (key + _ENTRY_SUFFIX)
+
+    def _list_entries(self) -> List[Tuple[int, int, Path]]:
+        """Return the (modification time, size, path) of the entries."""
+        entries = []
+        for entry in scandir(str(self._directory)):
+            if not entry.name.endswith(_ENTRY_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, Path(entry.path)))
+
+        return entries
+
+    def _evict(self) -> None:
+        entries = self._list_entries()
+        total_size = sum(entry[1] for entry in entries)
+        if total_size <= self._max_size:
+            return
+
+        entries.sort()
+        for __, size, path in entries:
+            if total_size <= self._max_size:
+                break
+            _remove(path)
+            total_size -= size
+            self._evictions += 1
+
+
+class _InvalidEntry(Exception):
+    """Raised when an entry is stale or was written by another version."""
+
+
+def _remove(path: Path) -> None:
+    try:
+        remove(str(path))
+    except OSError:
+        pass
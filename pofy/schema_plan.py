@@ -0,0 +1,539 @@
+"""Schema plan class & utilities.
+
+A schema plan aggregates everything pofy needs to know about a class to load
+it (fields, required fields, validation and post-load hooks). Computing it
+requires walking the class hierarchy and inspecting each schema class, so
+plans are built once per (class, schema resolver) pair and cached.
+
+Plans also compute schema fingerprints : stable hashes of the fields of a
+class, that can be used to invalidate anything derived from a schema, like
+persistent caches of loaded results.
+"""
+from enum import Enum
+from hashlib import sha256
+from inspect import getmembers
+from inspect import isclass
+from inspect import ismethod
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Pattern
+from typing import Set
+from typing import Tuple
+from typing import Type
+from weakref import WeakKeyDictionary
+from weakref import ref
+
+from pofy.codegen import ObjectLoader
+from pofy.codegen import compile_object_loader
+from pofy.common import SchemaResolver
+from pofy.common import default_schema_resolver
+from pofy.fields.base_field import BaseField
+from pofy.fields.string_field import StringField
+from pofy.slotted_class import get_slotted_class
+
+Hook = Callable[..., Any]
+_Description = Tuple[str, Tuple['ref[Type[Any]]', ...]]
+
+# Count of schema resolvers plans are kept for, for each class. Building a
+# loader with a new resolver (a lambda for example) for each load would make
+# the cache grow without bound otherwise.
+_MAX_RESOLVER_PLANS = 8
+
+
+class SchemaPlan:
+    """Precomputed loading informations for a given class.
+
+    Members:
+        schema_classes: Schema classes of the class and its bases, base
+                        classes first.
+        fields: Fields declared for the class, including inherited ones.
+        required_fields: Names of the required fields, in declaration order.
+        validate_hooks: Validate methods of the class schemas, base classes
+                        first.
+        post_load_hooks: Post-load methods of the class schemas, base classes
+                         first.
+        key_field: Field used to load mapping keys that can't be read
+                   directly from the YAML node (tagged keys).
+
+    """
+
+    key_field = StringField()
+
+    def __init__(
+        self,
+        fields: Dict[str, BaseField],
+        validate_hooks: Iterable[Hook],
+        post_load_hooks: Iterable[Hook],
+        schema_classes: Iterable[Type[Any]] = ()
+    ):
+        """Initialize the schema plan.
+
+        Args:
+            fields: Fields declared for the class.
+            validate_hooks: Validate methods of the class schemas.
+            post_load_hooks: Post-load methods of the class schemas.
+            schema_classes: Schema classes the fields were found in.
+
+        """
+        self.schema_classes: Tuple[Type[Any], ...] = tuple(schema_classes)
+        self.fields = fields
+        self.required_fields: Tuple[str, ...] = tuple(
+            name for name, field in fields.items() if field.required
+        )
+        self.validate_hooks: Tuple[Hook, ...] = tuple(validate_hooks)
+        self.post_load_hooks: Tuple[Hook, ...] = tuple(post_load_hooks)
+        self._loaders: Dict[Tuple[bool, bool], ObjectLoader] = {}
+        # Classes are weakly referenced : plans are values of a dictionary
+        # weakly keyed by class, they would keep the classes alive otherwise.
+        self._slotted_class: Optional['ref[Type[Any]]'] = None
+        self._description: Optional[_Description] = None
+        self._fingerprint: Optional[str] = None
+
+    def get_loader(
+        self,
+        inline_scalars: bool = True,
+        into_dict: bool = False
+    ) -> ObjectLoader:
+        """Return the generated loader function for this plan.
+
+        The loader is generated on first call, see pofy.codegen.
+
+        Args:
+            inline_scalars: If False, return a loader loading all fields
+                            through the loading context.
+            into_dict: If True, return a loader storing values in a
+                       dictionary instead of an object.
+
+        """
+        key = (inline_scalars, into_dict)
+        loader = self._loaders.get(key)
+        if loader is None:
+            loader = compile_object_loader(self.fields, self.key_field,
+                                           inline_scalars, into_dict)
+            self._loaders[key] = loader
+
+        return loader
+
+    def get_slotted_class(self, cls: Type[Any]) -> Type[Any]:
+        """Return the slotted companion class of the planned class.
+
+        See pofy.slotted_class.
+
+        Args:
+            cls: The class this plan was built for.
+
+        """
+        slotted_class_ref = self._slotted_class
+        if slotted_class_ref is not None:
+            slotted_class = slotted_class_ref()
+            if slotted_class is not None:
+                return slotted_class
+
+        slotted_class = get_slotted_class(cls, tuple(self.fields))
+        self._slotted_class = ref(slotted_class)
+        return slotted_class
+
+    def get_description(self) -> Tuple[str, Tuple[Type[Any], ...]]:
+        """Return a description of this plan, and the classes it references.
+
+        The description lists schema classes, fields with their parameters
+        and hooks. Referenced classes (by object fields for example) only
+        appear by name, see schema_fingerprint. Referenced classes that were
+        garbage collected are omitted.
+        """
+        description = self._description
+        if description is None:
+            describer = _Describer()
+            text = describer.describe({
+                'schemas': self.schema_classes,
+                'fields': self.fields,
+                'validate': self.validate_hooks,
+                'post_load': self.post_load_hooks,
+            })
+            references = tuple(ref(cls) for cls in describer.references)
+            description = (text, references)
+            self._description = description
+
+        text, references = description
+        classes = (cls_ref() for cls_ref in references)
+        return text, tuple(cls for cls in classes if cls is not None)
+
+
+class SchemaPlanCache:
+    """Cache of schema plans, indexed by class and schema resolver.
+
+    Classes are weakly referenced, so plans of classes that are garbage
+    collected are dropped automatically. Plans are kept for a few schema
+    resolvers per class, the oldest ones are dropped first. Call clear or
+    invalidate when schemas are modified at runtime.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._lock = Lock()
+        self._plans: 'WeakKeyDictionary[Type[Any], _ResolverPlans]' = \
+            WeakKeyDictionary()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the cache as an empty one.
+
+        Plans hold generated code and can't be pickled. Worker processes build
+        their plans again when needed.
+        """
+        return {}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore an empty cache."""
+        self.__init__()  # type: ignore
+
+    def get(
+        self,
+        cls: Type[Any],
+        schema_resolver: SchemaResolver
+    ) -> Optional[SchemaPlan]:
+        """Get the schema plan for the given class.
+
+        Args:
+            cls: The class to get the plan for.
+            schema_resolver: Schema resolver used to find schema classes.
+
+        Return:
+            The plan, or None if no schema class was found for cls.
+
+        """
+        resolver_plans = self._plans.get(cls)
+        if resolver_plans is not None and schema_resolver in resolver_plans:
+            return resolver_plans[schema_resolver]
+
+        # Plans are built outside of the lock : building the same plan twice
+        # concurrently is harmless, as the result is the same.
+        plan = build_schema_plan(cls, schema_resolver)
+        with self._lock:
+            resolver_plans = self._plans.setdefault(cls, {})
+            if schema_resolver not in resolver_plans and \
+                    len(resolver_plans) >= _MAX_RESOLVER_PLANS:
+                del resolver_plans[next(iter(resolver_plans))]
+            resolver_plans[schema_resolver] = plan
+
+        return plan
+
+    def get_fingerprint(
+        self,
+        cls: Type[Any],
+        schema_resolver: SchemaResolver
+    ) -> str:
+        """Return the schema fingerprint of a class, see schema_fingerprint.
+
+        The fingerprint is computed once, and memoized in the class plan until
+        the class or one of the classes it references is invalidated.
+        """
+        # pylint: disable=protected-access
+        plan = self.get(cls, schema_resolver)
+        if plan is not None and plan._fingerprint is not None:
+            return plan._fingerprint
+
+        fingerprint = self._compute_fingerprint(
+            _describe_type(cls),
+            [cls],
+            schema_resolver
+        )
+        if plan is not None:
+            plan._fingerprint = fingerprint
+
+        return fingerprint
+
+    def get_field_fingerprint(
+        self,
+        field: BaseField,
+        schema_resolver: SchemaResolver
+    ) -> str:
+        """Return the fingerprint of a field, see field_fingerprint."""
+        describer = _Describer()
+        description = describer.describe(field)
+        return self._compute_fingerprint(description, describer.references,
+                                         schema_resolver)
+
+    def _compute_fingerprint(
+        self,
+        description: str,
+        references: Iterable[Type[Any]],
+        schema_resolver: SchemaResolver
+    ) -> str:
+        # All classes reachable from the root are described, sorted by name,
+        # so that the result doesn't depend on the order plans were built in,
+        # and recursive schemas are handled.
+        descriptions: Dict[str, str] = {}
+        visited: Set[Type[Any]] = set()
+        pending = list(references)
+        while len(pending) > 0:
+            cls = pending.pop()
+            if cls in visited:
+                continue
+            visited.add(cls)
+            plan = self.get(cls, schema_resolver)
+            if plan is None:
+                continue
+            plan_description, plan_references = plan.get_description()
+            descriptions[_describe_type(cls)] = plan_description
+            pending.extend(plan_references)
+
+        hasher = sha256()
+        for part in [_describe_type(schema_resolver), description]:
+            hasher.update(part.encode('utf-8', 'surrogatepass'))
+            hasher.update(b'\0')
+
+        for name, plan_description in sorted(descriptions.items()):
+            for part in [name, plan_description]:
+                hasher.update(part.encode('utf-8', 'surrogatepass'))
+                hasher.update(b'\0')
+
+        return hasher.hexdigest()
+
+    def invalidate(self, cls: Type[Any]) -> None:
+        """Drop the cached plans of the given class.
+
+        Plans of child classes are dropped too, as they depend on the schema
+        of the given class. Fingerprints memoized in the remaining plans are
+        reset, as they can cover the class through the fields referencing it.
+        """
+        # pylint: disable=protected-access
+        with self._lock:
+            for cached_class in list(self._plans.keys()):
+                if issubclass(cached_class, cls):
+                    del self._plans[cached_class]
+
+            for resolver_plans in self._plans.values():
+                for plan in resolver_plans.values():
+                    if plan is not None:
+                        plan._fingerprint = None
+
+    def clear(self) -> None:
+        """Drop all cached plans."""
+        with self._lock:
+            self._plans.clear()
+
+
+_ResolverPlans = Dict[SchemaResolver, Optional[SchemaPlan]]
+
+# Cache used by loading contexts when none is explicitly given.
+DEFAULT_SCHEMA_PLANS = SchemaPlanCache()
+
+
+def schema_fingerprint(
+    cls: Type[Any],
+    schema_resolver: SchemaResolver = default_schema_resolver,
+    schema_plans: Optional[SchemaPlanCache] = None
+) -> str:
+    """Return a stable hash of the schema of a class.
+
+    The fingerprint covers the schema classes of the class and its bases, the
+    names, types and parameters of their fields, and the identity (qualified
+    name) of hooks and validation callbacks. Classes referenced by fields,
+    like the classes of object fields, are covered recursively. It changes
+    whenever a field definition changes, but not between processes loading
+    the same code.
+
+    Args:
+        cls: The class to get the fingerprint of.
+        schema_resolver: Schema resolver used to find schema classes.
+        schema_plans: Cache of schema plans where the fingerprint is
+                      memoized. If None, the cache shared by loading contexts
+                      is used.
+
+    Return:
+        A SHA-256 hex digest.
+
+    """
+    if schema_plans is None:
+        schema_plans = DEFAULT_SCHEMA_PLANS
+
+    return schema_plans.get_fingerprint(cls, schema_resolver)
+
+
+def field_fingerprint(
+    field: BaseField,
+    schema_resolver: SchemaResolver = default_schema_resolver,
+    schema_plans: Optional[SchemaPlanCache] = None
+) -> str:
+    """Return a stable hash of a field definition.
+
+    Like schema_fingerprint, for a field instance, like a root field. It isn't
+    memoized.
+
+    Args:
+        field: The field to get the fingerprint of.
+        schema_resolver: See schema_fingerprint.
+        schema_plans: See schema_fingerprint.
+
+    """
+    if schema_plans is None:
+        schema_plans = DEFAULT_SCHEMA_PLANS
+
+    return schema_plans.get_field_fingerprint(field, schema_resolver)
+
+
+def describe_value(value: Any) -> str:
+    """Return a deterministic description of a value.
+
+    Values are described like field parameters in schema fingerprints :
+    containers recursively, classes and callables by qualified name, and
+    other objects by their string representation if it doesn't contain their
+    address.
+
+    Args:
+        value: The value to describe.
+
+    """
+    return _Describer().describe(value)
+
+
+def build_schema_plan(
+    cls: Type[Any],
+    schema_resolver: SchemaResolver
+) -> Optional[SchemaPlan]:
+    """Build the schema plan for a class, bypassing any cache.
+
+    Args:
+        cls: The class to build the plan for.
+        schema_resolver: Schema resolver used to find schema classes.
+
+    Return:
+        The plan, or None if no schema class was found for cls.
+
+    """
+    schema_classes = list(_get_schema_classes(cls, schema_resolver))
+    if len(schema_classes) == 0:
+        return None
+
+    fields = {}
+    for schema_it in schema_classes:
+        for name, field in getmembers(schema_it, _is_field):
+            fields[name] = field
+
+    return SchemaPlan(
+        fields,
+        _get_methods(cls, 'validate', schema_resolver),
+        _get_methods(cls, 'post_load', schema_resolver),
+        schema_classes
+    )
+
+
+def _is_field(member: Any) -> bool:
+    return isinstance(member, BaseField)
+
+
+def _get_schema_classes(
+    cls: Type[Any],
+    schema_resolver: SchemaResolver
+) -> Iterable[Type[Any]]:
+    for base in cls.__bases__:
+        for schema_class in _get_schema_classes(base, schema_resolver):
+            yield schema_class
+
+    schema = schema_resolver(cls)
+    if schema is not None:
+        yield schema
+
+
+def _get_methods(
+    cls: Type[Any],
+    method_name: str,
+    schema_resolver: SchemaResolver
+) -> List[Hook]:
+    def _method_filter(member: Any) -> bool:
+        return ismethod(member) and member.__name__ == method_name
+
+    methods: List[Hook] = []
+    for base in cls.__bases__:
+        methods.extend(_get_methods(base, method_name, schema_resolver))
+
+    schema_class = schema_resolver(cls)
+    for __, method in getmembers(schema_class, _method_filter):
+        methods.append(method)
+
+    return methods
+
+
+class _Describer:
+    """Describe field parameters in a deterministic string.
+
+    Classes are described by name, those having a schema are added to
+    references, so that their own schema can be described.
+    """
+
+    def __init__(self) -> None:
+        self.references: List[Type[Any]] = []
+
+    def describe(self, value: Any) -> str:
+        """Return the description of the given value."""
+        # pylint: disable=too-many-return-statements
+        if value is None or isinstance(value, (bool, int, float, str, bytes)):
+            return repr(value)
+
+        if isinstance(value, Enum):
+            return '{}.{}'.format(_describe_type(type(value)), value.name)
+
+        if isclass(value):
+            return self._describe_class(value)
+
+        if isinstance(value, BaseField):
+            return '{}({})'.format(
+                _describe_type(type(value)),
+                self.describe(vars(value))
+            )
+
+        if isinstance(value, dict):
+            items = sorted(
+                '{}: {}'.format(self.describe(key), self.describe(item))
+                for key, item in value.items()
+            )
+            return '{{{}}}'.format(', '.join(items))
+
+        if isinstance(value, (set, frozenset)):
+            return '{{{}}}'.format(
+                ', '.join(sorted(self.describe(item) for item in value))
+            )
+
+        if isinstance(value, (list, tuple)):
+            return '[{}]'.format(
+                ', '.join(self.describe(item) for item in value)
+            )
+
+        if isinstance(value, Pattern):
+            return 're({!r}, {})'.format(value.pattern, value.flags)
+
+        if callable(value):
+            # Hooks, validation callbacks, bound methods.
+            function = getattr(value, '__func__', value)
+            return _describe_type(function)
+
+        # Other values (like NumPy data types) are described by their string
+        # representation, their default one would contain their address.
+        text = str(value)
+        if ' at 0x' in text:
+            return _describe_type(type(value))
+
+        return '{}:{}'.format(_describe_type(type(value)), text)
+
+    def _describe_class(self, cls: Type[Any]) -> str:
+        if issubclass(cls, Enum):
+            members = ', '.join(
+                '{}={}'.format(name, self.describe(member.value))
+                for name, member in cls.__members__.items()
+            )
+            return '{}({})'.format(_describe_type(cls), members)
+
+        self.references.append(cls)
+        return _describe_type(cls)
+
+
+def _describe_type(value: Any) -> str:
+    return '{}.{}'.format(
+        getattr(value, '__module__', None),
+        getattr(value, '__qualname__', getattr(value, '__name__', None))
+    )
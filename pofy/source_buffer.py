@@ -0,0 +1,115 @@
+"""Bulk reading of YAML sources.
+
+PyYAML reads streams in small chunks, with a system call for each of them.
+Files are instead read with a single call, or memory-mapped when they're
+large, in a NamedBuffer : a binary stream over the content, holding the file
+name so that node marks point to the file. The libyaml parser reads it as any
+stream, the pure python parser is given the whole content at once, see
+pofy.parser_backend.create_loader. Files are memory-mapped only for libyaml,
+see pofy.parser_backend.should_map_files.
+
+Contents are given to the parser as bytes : encoding detection (UTF-8 or
+UTF-16, with or without BOM) is done by the parser.
+"""
+from io import BytesIO
+from io import IOBase
+from io import TextIOBase
+from mmap import ACCESS_READ
+from mmap import mmap
+from os import fstat
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+from typing import Optional
+from typing import Type
+from typing import Union
+
+# Files at least this large are memory-mapped instead of being read.
+MMAP_THRESHOLD = 1 << 20
+
+
+class NamedBuffer:
+    """Binary stream over an in-memory or memory-mapped content.
+
+    Members:
+        name: Name of the file the content was read from, used in marks.
+        size: Size of the content, in bytes.
+
+    """
+
+    def __init__(self, buffer: Union[BytesIO, mmap], name: str, size: int):
+        """Initialize the buffer. See class documentation for arguments."""
+        self._buffer = buffer
+        self.name = name
+        self.size = size
+
+    def __enter__(self) -> 'NamedBuffer':
+        """Return the buffer itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        """Close the buffer."""
+        self.close()
+
+    def read(self, size: int = -1) -> bytes:
+        """Read at most size bytes, or the remaining content if negative."""
+        if size < 0:
+            size = self.size
+        return self._buffer.read(size)
+
+    def getvalue(self) -> bytes:
+        """Return the whole content.
+
+        This copies memory-mapped contents.
+        """
+        if isinstance(self._buffer, BytesIO):
+            return self._buffer.getvalue()
+        return self._buffer[:]
+
+    def close(self) -> None:
+        """Release the content, unmapping it if it's memory-mapped."""
+        self._buffer.close()
+
+
+def read_file(path: Path, use_mmap: bool = True) -> NamedBuffer:
+    """Read a file in a NamedBuffer.
+
+    Args:
+        path: Path of the file to read.
+        use_mmap: If False, the file is always read, even if it's larger than
+                  MMAP_THRESHOLD.
+
+    """
+    with open(str(path), 'rb') as input_file:
+        size = fstat(input_file.fileno()).st_size
+        if use_mmap and size >= MMAP_THRESHOLD:
+            try:
+                mapped = mmap(input_file.fileno(), 0, access=ACCESS_READ)
+                return NamedBuffer(mapped, str(path), size)
+            except (OSError, ValueError):
+                # Some files can't be mapped (pipes, special file systems).
+                pass
+
+        content = input_file.read()
+
+    return NamedBuffer(BytesIO(content), str(path), len(content))
+
+
+def read_stream(stream: Any) -> NamedBuffer:
+    """Read a binary stream in a NamedBuffer.
+
+    The buffer takes the name of the stream, if it has one.
+    """
+    content = stream.read()
+    name = getattr(stream, 'name', '<file>')
+    return NamedBuffer(BytesIO(content), str(name), len(content))
+
+
+def is_binary_stream(source: Any) -> bool:
+    """Return True if the given source is a binary stream."""
+    return isinstance(source, IOBase) and not isinstance(source, TextIOBase)
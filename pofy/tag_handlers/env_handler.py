@@ -26,15 +26,25 @@ class EnvHandler(TagHandler):
         ):
             return UNDEFINED
 
+        # Environment variables can change between loadings.
+        reload_state = context.get_reload_state()
+        if reload_state is not None:
+            reload_state.mark_volatile()
+
         node = context.current_node()
         var_name = node.value
+        value = environ.get(var_name)
+
+        manifest = context.get_manifest()
+        if manifest is not None:
+            manifest.add_env(var_name, value)
 
-        if var_name not in environ:
+        if value is None:
             return UNDEFINED
 
         fake_node = ScalarNode(
             '',
-            environ[var_name],
+            value,
             node.start_mark,
             node.end_mark
         )
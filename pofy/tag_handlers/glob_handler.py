@@ -1,12 +1,25 @@
 """Tag handler used to import files in YAML documents."""
+from concurrent.futures import Executor
 from gettext import gettext as _
+from itertools import repeat
+from pathlib import Path
 from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from yaml import Node
 from yaml import SequenceNode
 
 from pofy.common import UNDEFINED
 from pofy.interfaces import ILoadingContext
 from pofy.interfaces import IBaseField
+from pofy.load_stats import PHASE_COMPOSE
 from pofy.tag_handlers.path_handler import PathHandler
+from pofy.tag_handlers.path_handler import compose_file
+from pofy.tag_handlers.path_handler import report_parse_error
 
 
 class GlobHandler(PathHandler):
@@ -14,6 +27,41 @@ class GlobHandler(PathHandler):
 
     tag_pattern = '^(glob)$'
 
+    def __init__(
+        self,
+        roots: Optional[Iterable[Path]] = None,
+        allow_relative: bool = True,
+        executor: Optional[Executor] = None
+    ):
+        """Initialize the GlobHandler.
+
+        Args:
+            roots: See PathHandler constructor.
+            allow_relative: See PathHandler constructor.
+            executor: If set, matched files are read and composed concurrently
+                      in this executor. A ThreadPoolExecutor overlaps file
+                      reads, a ProcessPoolExecutor also composes documents in
+                      parallel, at the cost of sending nodes back to the
+                      loading process. The executor isn't shut down by the
+                      handler.
+
+        """
+        super().__init__(roots, allow_relative)
+        if executor is not None:
+            assert isinstance(executor, Executor), \
+                _('executor must be a concurrent.futures.Executor.')
+        self._executor = executor
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the handler without its executor.
+
+        Executors can't be sent to other processes : a handler unpickled in a
+        worker process composes files sequentially.
+        """
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        return state
+
     def load(self, context: ILoadingContext, field: IBaseField) \
             -> Any:
         """See Resolver.resolve for usage."""
@@ -22,18 +70,80 @@ class GlobHandler(PathHandler):
         ):
             return UNDEFINED
 
+        # Files matching the pattern can be added or removed before the next
+        # loading, only the globbed documents themselves can be reused.
+        reload_state = context.get_reload_state()
+        if reload_state is not None:
+            reload_state.mark_volatile()
+
         node = context.current_node()
         glob = node.value
-        result = []
+        manifest = context.get_manifest()
+        paths = []
         for root in self._get_roots(context):
-            for path in root.glob(glob):
-                if not path.is_file():
-                    continue
-
-                content = self._load_file(context, path)
+            root_paths = [path for path in root.glob(glob) if path.is_file()]
+            if manifest is not None:
+                manifest.add_glob(root, glob, root_paths)
+            paths.extend(root_paths)
 
-                if content is not None:
-                    result.append(content)
+        if self._executor is None:
+            documents = [self._load_file(context, path) for path in paths]
+        else:
+            versions = [self._get_version(context, path) for path in paths]
+            documents = self._load_files(context, paths)
+            for path, document, version in zip(paths, documents, versions):
+                if document is not None:
+                    self._add_document(context, path, document, version)
 
+        result = [content for content in documents if content is not None]
         fake_node = SequenceNode('', result, node.start_mark, node.end_mark)
         return context.load(field, fake_node)
+
+    def _load_files(
+        self,
+        context: ILoadingContext,
+        paths: List[Path]
+    ) -> List[Optional[Node]]:
+        """Compose the given files concurrently, using the document cache."""
+        stats = context.get_stats()
+        composed_count = 0
+
+        def _compose_all(paths: List[Path]) -> List[Optional[Node]]:
+            nonlocal composed_count
+            composed_count = len(paths)
+            if stats is None:
+                results = self._compose_concurrently(context, paths)
+            else:
+                # Files are read and composed concurrently : the time spent
+                # waiting for the executor is counted as compose time.
+                stats.files += [(str(path), path.stat().st_size)
+                                for path in paths]
+                with stats.phase(PHASE_COMPOSE):
+                    results = self._compose_concurrently(context, paths)
+
+            # Errors are reported from the loading thread, in paths order.
+            for path, (__, error) in zip(paths, results):
+                if error is not None:
+                    report_parse_error(context, path, error)
+
+            return [node for node, __ in results]
+
+        cache = context.get_document_cache()
+        if cache is None:
+            return _compose_all(paths)
+
+        documents = cache.get_documents(paths, _compose_all)
+        if stats is not None:
+            stats.cache_misses += composed_count
+            stats.cache_hits += len(paths) - composed_count
+
+        return documents
+
+    def _compose_concurrently(
+        self,
+        context: ILoadingContext,
+        paths: List[Path]
+    ) -> List[Tuple[Optional[Node], Optional[str]]]:
+        assert self._executor is not None
+        backend = context.get_parser_backend()
+        return list(self._executor.map(compose_file, paths, repeat(backend)))
@@ -28,6 +28,11 @@ class ImportHandler(PathHandler):
 
         file_path = self._get_file(context)
         if file_path is None:
+            # The file could be created before the next loading.
+            reload_state = context.get_reload_state()
+            if reload_state is not None:
+                reload_state.mark_volatile()
+
             node = context.current_node()
             if node.tag == '!import':
                 context.error(
@@ -52,9 +57,14 @@ class ImportHandler(PathHandler):
         if file_path.is_absolute():
             return file_path
 
+        # Files missing from the roots looked at before the one containing the
+        # imported file change the result if they're created.
+        manifest = context.get_manifest()
         for root in self._get_roots(context):
             path = root / file_path
             if path.is_file():
                 return path
+            if manifest is not None:
+                manifest.add_missing(path)
 
         return None
@@ -6,15 +6,23 @@ from typing import Any
 from typing import Iterable
 from typing import Iterator
 from typing import Optional
-from typing import cast
+from typing import Tuple
 
 from yaml import Node
-from yaml import compose
 from yaml.parser import ParserError
 
 from pofy.common import ErrorCode
+from pofy.document_cache import FileVersion
+from pofy.document_cache import get_file_version
 from pofy.interfaces import IBaseField
 from pofy.interfaces import ILoadingContext
+from pofy.load_stats import LoadStats
+from pofy.load_stats import PHASE_COMPOSE
+from pofy.load_stats import PHASE_READ
+from pofy.parser_backend import ParserBackend
+from pofy.parser_backend import compose_document
+from pofy.parser_backend import should_map_files
+from pofy.source_buffer import read_file
 from pofy.tag_handlers.tag_handler import TagHandler
 
 
@@ -71,15 +79,149 @@ class PathHandler(TagHandler):
 
     @staticmethod
     def _load_file(context: ILoadingContext, path: Path) -> Optional[Node]:
-        """Load a YAML document, emit a PofyError on ParseError."""
-        with open(path, 'r') as yaml_file:
+        """Load a YAML document, emit a PofyError on ParseError.
+
+        If the loading context has a document cache, the document will be
+        composed only if it's not in the cache.
+        """
+        version = PathHandler._get_version(context, path)
+        node = PathHandler._get_document(context, path)
+        if node is not None:
+            PathHandler._add_document(context, path, node, version)
+
+        return node
+
+    @staticmethod
+    def _get_version(context: ILoadingContext, path: Path) \
+            -> Optional[FileVersion]:
+        """Return the version of a file about to be read, for the manifest.
+
+        Returns None if the loading has no manifest.
+        """
+        if context.get_manifest() is None:
+            return None
+
+        try:
+            return get_file_version(str(path))
+        except OSError:
+            return None
+
+    @staticmethod
+    def _add_document(
+        context: ILoadingContext,
+        path: Path,
+        node: Node,
+        version: Optional[FileVersion]
+    ) -> None:
+        """Record a document read from a file in the manifest & reload state.
+
+        The node currently loaded, importing the file, is recorded as its
+        origin in the manifest, with the version of the file before it was
+        read, see LoadManifest.add_file.
+        """
+        manifest = context.get_manifest()
+        if manifest is not None:
+            manifest.add_file(path, context.current_node(), version)
+
+        reload_state = context.get_reload_state()
+        if reload_state is not None:
+            reload_state.add_document(path, node)
+
+    @staticmethod
+    def _get_document(context: ILoadingContext, path: Path) -> Optional[Node]:
+        cache = context.get_document_cache()
+        if cache is None:
+            return _compose_file(context, path)
+
+        stats = context.get_stats()
+        if stats is None:
+            return cache.get_document(
+                path,
+                lambda: _compose_file(context, path)
+            )
+
+        misses = stats.cache_misses
+        node = cache.get_document(path, lambda: _count_miss(context, path))
+        if stats.cache_misses == misses:
+            stats.cache_hits += 1
+
+        return node
+
+
+def compose_file(
+    path: Path,
+    backend: ParserBackend
+) -> Tuple[Optional[Node], Optional[str]]:
+    """Compose a YAML file.
+
+    This function doesn't need a loading context, so it can be run in an
+    executor, including a process pool.
+
+    Args:
+        path: Path of the file to compose.
+        backend: The parser backend to use.
+
+    Return:
+        A (node, error) tuple : the root node of the document, and None, or
+        None and the parse error message if the document is invalid.
+
+    """
+    with read_file(path, should_map_files(backend)) as buffer:
+        try:
+            return compose_document(buffer, backend), None
+        except ParserError as error:
+            return None, str(error)
+
+
+def report_parse_error(
+    context: ILoadingContext,
+    path: Path,
+    error: str
+) -> None:
+    """Report a parse error returned by compose_file."""
+    context.error(
+        ErrorCode.VALUE_ERROR,
+        _('Parse error while loading {} : {}'),
+        path,
+        error
+    )
+
+
+def _compose_file(context: ILoadingContext, path: Path) -> Optional[Node]:
+    backend = context.get_parser_backend()
+    stats = context.get_stats()
+    if stats is None:
+        node, error = compose_file(path, backend)
+    else:
+        node, error = _compose_file_with_stats(path, backend, stats)
+
+    if error is not None:
+        report_parse_error(context, path, error)
+
+    return node
+
+
+def _count_miss(context: ILoadingContext, path: Path) -> Optional[Node]:
+    stats = context.get_stats()
+    assert stats is not None
+    stats.cache_misses += 1
+    return _compose_file(context, path)
+
+
+def _compose_file_with_stats(
+    path: Path,
+    backend: ParserBackend,
+    stats: LoadStats
+) -> Tuple[Optional[Node], Optional[str]]:
+    # Large files are memory-mapped : reading their pages is then counted as
+    # compose time.
+    with stats.phase(PHASE_READ):
+        buffer = read_file(path, should_map_files(backend))
+
+    with buffer:
+        stats.files.append((str(path), buffer.size))
+        with stats.phase(PHASE_COMPOSE):
             try:
-                return cast(Node, compose(yaml_file)) # type: ignore
+                return compose_document(buffer, backend), None
             except ParserError as error:
-                context.error(
-                    ErrorCode.VALUE_ERROR,
-                    _('Parse error while loading {} : {}'),
-                    path,
-                    error
-                )
-        return None
+                return None, str(error)
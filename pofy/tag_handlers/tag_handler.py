@@ -35,12 +35,24 @@ class TagHandler(ABC):
 
         """
         assert node.tag is not None
-        assert node.tag[0] == '!'  # Only handle custom tags.
+        return self.match_tag(node.tag)
 
-        pattern = self._compiled_pattern
-        tag = node.tag[1:]  # Remove !
+    def match_tag(self, tag: str) -> bool:
+        """Check if this handler matches the given tag.
+
+        The loading context caches the result of this method for each tag, so
+        it should only depend on the given tag. Handlers needing to inspect
+        the tagged node should override match instead, and will then be
+        tested on each node.
+
+        Args:
+            tag: The tag to test, including the leading !.
 
-        return pattern.match(tag) is not None
+        """
+        assert tag[0] == '!'  # Only handle custom tags.
+
+        pattern = self._compiled_pattern
+        return pattern.match(tag[1:]) is not None  # Remove !
 
     @abstractmethod
     def load(self, context: ILoadingContext, field: IBaseField) -> Any:
@@ -59,6 +59,9 @@ setup(
         "Topic :: Text Processing :: Markup",
     ],
     install_requires=['pyyaml'],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     author="An Otter World",
     author_email="an-otter-world@ki-dour.org",
     url="http://github.com/an-otter-world/pofy/",
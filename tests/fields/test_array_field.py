@@ -0,0 +1,128 @@
+"""Array field tests."""
+from typing import Any
+
+from pytest import importorskip
+from yaml import compose
+
+from pofy.common import ErrorCode
+from pofy.common import UNDEFINED
+from pofy.error_collector import ErrorCollector
+from pofy.fields.array_field import ArrayField
+from pofy.loader import load
+from pofy.loading_context import LoadingContext
+
+from tests.helpers import check_load
+
+numpy = importorskip('numpy')
+
+
+class _Table:
+    class Schema:
+        """Pofy fields."""
+
+        values = ArrayField(shape=(None, 2), maximum=10)
+
+    values: Any
+
+
+def _check_array(yaml: str, field: ArrayField, expected: Any) -> None:
+    result = check_load(yaml, field=field)
+    assert isinstance(result, numpy.ndarray)
+    assert result.dtype == field._dtype # pylint: disable=protected-access
+    assert numpy.array_equal(result, numpy.array(expected))
+
+
+def _check_error(yaml: str, field: ArrayField, code: ErrorCode) -> None:
+    assert check_load(yaml, field=field, expected_error=code) is UNDEFINED
+
+
+def test_array_field() -> None:
+    """Array field should load numeric sequences into arrays."""
+    _check_array('[1, 2.5, 1e3]', ArrayField(), [1, 2.5, 1000])
+    _check_array('[]', ArrayField(), [])
+    _check_array('[1, 2, 3]', ArrayField('int32'), [1, 2, 3])
+    _check_array(
+        '[[1, 2, 3], [4, 5, 6]]',
+        ArrayField('int64', shape=(None, 3)),
+        [[1, 2, 3], [4, 5, 6]]
+    )
+    _check_array(
+        '[[1, 2], [3, 4]]',
+        ArrayField(shape=(2, None)),
+        [[1.0, 2.0], [3.0, 4.0]]
+    )
+
+    # Items numpy can't parse are converted one by one.
+    _check_array('[0x10, 2]', ArrayField('int64'), [16, 2])
+    _check_array('[1, 2]', ArrayField(minimum=0, maximum=2), [1, 2])
+
+
+def test_array_field_error_handling() -> None:
+    """Array field should report errors on the offending nodes."""
+    _check_error('scalar', ArrayField(), ErrorCode.UNEXPECTED_NODE_TYPE)
+    _check_error('[1, abc]', ArrayField(), ErrorCode.VALUE_ERROR)
+    _check_error('[1, [2]]', ArrayField(), ErrorCode.UNEXPECTED_NODE_TYPE)
+    _check_error('[1, 3]', ArrayField(maximum=2),
+                 ErrorCode.VALIDATION_ERROR)
+    _check_error('[1, 2]', ArrayField(shape=(3,)),
+                 ErrorCode.VALIDATION_ERROR)
+    _check_error('[[1, 2], [3]]', ArrayField(shape=(None, None)),
+                 ErrorCode.VALIDATION_ERROR)
+    _check_error('[[1, 2], 3]', ArrayField(shape=(None, 2)),
+                 ErrorCode.UNEXPECTED_NODE_TYPE)
+    _check_error('[300]', ArrayField('int8'), ErrorCode.VALIDATION_ERROR)
+
+
+def test_array_field_error_location() -> None:
+    """Errors should point at the offending item nodes."""
+    collector = ErrorCollector()
+    load('values: [[1, 2], [3, 40], [abc, 6]]', _Table,
+         error_handler=collector)
+    assert [(error.code, error.column) for error in collector] == [
+        (ErrorCode.VALIDATION_ERROR, 21),
+        (ErrorCode.VALUE_ERROR, 27),
+    ]
+
+    # Out of bounds values found by the vectorized pass.
+    collector = ErrorCollector()
+    load('values: [[1, 20], [3, 40]]', _Table, error_handler=collector)
+    assert [(error.code, error.column) for error in collector] == [
+        (ErrorCode.VALIDATION_ERROR, 13),
+        (ErrorCode.VALIDATION_ERROR, 22),
+    ]
+
+
+def test_array_field_dtype_overflow() -> None:
+    """Items overflowing the dtype should be reported on their node."""
+    def _check_overflow(yaml: str, dtype: str, column: int) -> None:
+        collector = ErrorCollector()
+        context = LoadingContext(collector, [])
+        assert context.load(ArrayField(dtype), compose(yaml)) is UNDEFINED
+        assert [
+            (error.code, error.line, error.column) for error in collector
+        ] == [(ErrorCode.VALIDATION_ERROR, 0, column)]
+
+    _check_overflow('[1, 300]', 'int8', 4)
+    _check_overflow('[1, -1]', 'uint8', 4)
+    _check_overflow('[1, 1e100]', 'float32', 4)
+    _check_overflow('[99999999999999999999, 1]', 'int64', 1)
+
+    # User bounds wider than the dtype are clamped to its range.
+    _check_array('[1, 127]', ArrayField('int8', maximum=1000), [1, 127])
+    _check_error('[1, 128]', ArrayField('int8', maximum=1000),
+                 ErrorCode.VALIDATION_ERROR)
+
+
+def test_array_field_streaming() -> None:
+    """Array field should load arrays in streaming mode."""
+    for streaming in [False, True]:
+        result = load('values: [[1, 2], [3, 4], [5, 6]]', _Table,
+                      streaming=streaming)
+        assert isinstance(result, _Table)
+        assert numpy.array_equal(result.values, [[1, 2], [3, 4], [5, 6]])
+
+        collector = ErrorCollector()
+        load('values: [[1, 2], [3]]', _Table, error_handler=collector,
+             streaming=streaming)
+        assert [error.code for error in collector] == \
+            [ErrorCode.VALIDATION_ERROR]
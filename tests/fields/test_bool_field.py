@@ -42,7 +42,7 @@ def test_bool_field() -> None:
 
     false_values = [
         'n', 'N', 'no', 'No', 'NO',
-        'false', 'False', 'FALSE'
+        'false', 'False', 'FALSE',
         'off', 'Off', 'OFF'
     ]
 
@@ -56,3 +56,4 @@ def test_bool_field_error_handling() -> None:
     _check_field_error('{a: dict}', ErrorCode.UNEXPECTED_NODE_TYPE)
 
     _check_field_error('bad_value', ErrorCode.VALUE_ERROR)
+    _check_field_error('FALSEoff', ErrorCode.VALUE_ERROR)
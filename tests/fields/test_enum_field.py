@@ -20,6 +20,9 @@ class _EnumObject:
         """Pofy fields."""
 
         field = EnumField(enum_class=_TestEnum)
+        by_value = EnumField(_TestEnum, by_value=True)
+        insensitive = EnumField(_TestEnum, case_sensitive=False)
+        aliased = EnumField(_TestEnum, aliases={'first': _TestEnum.FIRST})
 
 
 def _check_field(yml_value: str, expected_value: _TestEnum) -> None:
@@ -36,6 +39,12 @@ def test_enum_field() -> None:
     _check_field('SECOND', _TestEnum.SECOND)
     _check_field('THIRD', _TestEnum.THIRD)
 
+    check_field(_EnumObject, 'by_value', '20', _TestEnum.SECOND)
+    check_field(_EnumObject, 'insensitive', 'Second', _TestEnum.SECOND)
+    check_field(_EnumObject, 'insensitive', 'THIRD', _TestEnum.THIRD)
+    check_field(_EnumObject, 'aliased', 'first', _TestEnum.FIRST)
+    check_field(_EnumObject, 'aliased', 'FIRST', _TestEnum.FIRST)
+
 
 def test_enum_field_error_handling() -> None:
     """String field should correctly handle errors."""
@@ -43,3 +52,9 @@ def test_enum_field_error_handling() -> None:
     _check_field_error('{a: dict}', ErrorCode.UNEXPECTED_NODE_TYPE)
 
     _check_field_error('BAD_ENUM', ErrorCode.VALIDATION_ERROR)
+    _check_field_error('first', ErrorCode.VALIDATION_ERROR)
+
+    check_field_error(_EnumObject, 'by_value', 'SECOND',
+                      ErrorCode.VALIDATION_ERROR)
+    check_field_error(_EnumObject, 'aliased', 'First',
+                      ErrorCode.VALIDATION_ERROR)
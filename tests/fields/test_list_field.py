@@ -1,10 +1,15 @@
 """List field tests."""
 from typing import List
 from typing import Optional
+from typing import Tuple
+
+from yaml import Node
 
 from pofy.common import ErrorCode
+from pofy.fields.int_field import IntField
 from pofy.fields.list_field import ListField
 from pofy.fields.string_field import StringField
+from pofy.loader import load
 
 from tests.helpers import check_field
 from tests.helpers import check_field_error
@@ -42,3 +47,20 @@ def test_list_field_error_handling() -> None:
     """List field should correctly handle errors."""
     _check_field_error('scalar_value', ErrorCode.UNEXPECTED_NODE_TYPE)
     _check_field_error('{a, dict}', ErrorCode.UNEXPECTED_NODE_TYPE)
+
+
+def test_lazy_list_field() -> None:
+    """Lazy list field should load items when iterated."""
+    errors: List[Tuple[int, ErrorCode]] = []
+
+    def _handler(node: Node, code: ErrorCode, __: str) -> None:
+        errors.append((node.start_mark.line, code))
+
+    field = ListField(IntField(), lazy=True)
+    result = load('- 1\n- error\n- 3\n', list, root_field=field,
+                  error_handler=_handler)
+    assert not isinstance(result, list)
+    assert errors == []
+
+    assert list(result) == [1, 3]
+    assert errors == [(1, ErrorCode.VALUE_ERROR)]
@@ -1,10 +1,15 @@
 """Object field tests."""
+from pickle import dumps
+from pickle import loads
 from typing import Any
+from typing import NamedTuple
 from typing import Optional
 
 from pofy.common import ErrorCode
 from pofy.common import UNDEFINED
 from pofy.fields.bool_field import BoolField
+from pofy.fields.int_field import IntField
+from pofy.fields.object_field import Construction
 from pofy.fields.object_field import ObjectField
 from pofy.fields.string_field import StringField
 from pofy.interfaces import ILoadingContext
@@ -113,6 +118,69 @@ class _Simple:
         field = StringField()
 
 
+class _Point:
+    class Schema:
+        """Pofy fields."""
+
+        x = IntField()
+        y = IntField()
+        label = StringField()
+
+        @classmethod
+        def post_load(cls, obj: Any) -> None:
+            """Post load, should be called on slotted instances too."""
+            if obj.label == 'default':
+                obj.label = 'point_{}'.format(obj.twice())
+
+    label = 'default'
+
+    def twice(self) -> int:
+        """Return x multiplied by two."""
+        return int(self.x * 2)
+
+
+class _SlottedPoint:
+    __slots__ = ('x', 'y', 'label')
+
+    class Schema:
+        """Pofy fields."""
+
+        x = IntField()
+        y = IntField()
+        label = StringField()
+
+
+class _Initialized:
+    class Schema:
+        """Pofy fields."""
+
+        x = IntField()
+        y = IntField()
+
+    def __init__(self) -> None:
+        """Should be bypassed by the DICT_UPDATE construction."""
+        self.init_called = True
+
+
+class _Tuple(NamedTuple):
+    x: int
+    y: int = 0
+
+    class Schema:
+        """Pofy fields."""
+
+        x = IntField(required=True)
+        y = IntField()
+
+        @classmethod
+        def validate(cls, context: ILoadingContext, obj: Any) -> bool:
+            """Validate, should receive the constructed tuple."""
+            if obj.x < 0:
+                context.error(ErrorCode.VALIDATION_ERROR, 'Error')
+                return False
+            return True
+
+
 def _check_field_error(yaml_value: str, expected_error: ErrorCode) -> None:
     check_field_error(_Owner, 'field', yaml_value, expected_error)
 
@@ -173,3 +241,58 @@ def test_object_field_error_handling() -> None:
 
     obj = check_load('{ }', _NoSchema, ErrorCode.SCHEMA_ERROR)
     assert obj == UNDEFINED
+
+
+def test_object_field_slots() -> None:
+    """Slotted companion classes should be loaded when slots is set."""
+    field = ObjectField(_Point, slots=True)
+    result = check_load('{ x: 1, y: 2 }', field=field)
+    assert not hasattr(result, '__dict__')
+    assert not hasattr(result, '__weakref__')
+    assert type(result).__name__ == '_Point'
+    assert result.x == 1
+    assert result.y == 2
+    assert result.label == 'point_2'
+    assert result.twice() == 2
+
+    # The companion class is built once.
+    other = check_load('{ x: 3, label: other }', field=field)
+    assert type(other) is type(result)
+    assert other.label == 'other'
+    assert not hasattr(other, 'y')
+
+    copy = loads(dumps(result))
+    assert type(copy) is type(result)
+    assert (copy.x, copy.y, copy.label) == (1, 2, 'point_2')
+
+    # Classes already slotted are used as they are.
+    field = ObjectField(_SlottedPoint, slots=True)
+    result = check_load('{ x: 1, y: 2 }', field=field)
+    assert type(result) is _SlottedPoint
+    assert result.x == 1
+    assert not hasattr(result, 'label')
+
+
+def test_object_field_construction() -> None:
+    """Objects should be created with the given construction strategy."""
+    field = ObjectField(_Initialized, construction=Construction.DICT_UPDATE)
+    result = check_load('{ x: 1, y: !fail 2 }', field=field)
+    assert isinstance(result, _Initialized)
+    assert result.__dict__ == {'x': 1}
+
+    field = ObjectField(_Tuple, construction=Construction.KWARGS)
+    assert check_load('{ x: 1, y: 2 }', field=field) == _Tuple(1, 2)
+    assert check_load('{ x: 1 }', field=field) == _Tuple(1, 0)
+
+    result = check_load('{ y: 2 }', field=field,
+                        expected_error=ErrorCode.MISSING_REQUIRED_FIELD)
+    assert result is UNDEFINED
+
+    result = check_load('{ x: -1 }', field=field,
+                        expected_error=ErrorCode.VALIDATION_ERROR)
+    assert result is UNDEFINED
+
+    field = ObjectField(_Simple, construction=Construction.KWARGS)
+    result = check_load('{ field: value }', field=field,
+                        expected_error=ErrorCode.VALUE_ERROR)
+    assert result is UNDEFINED
@@ -12,6 +12,7 @@ class _StringObject:
         """Pofy fields."""
 
         field = StringField(pattern='^matching$')
+        choice = StringField(choices={'first', 'second'})
 
 
 def _check_field(yml_value: str, expected_value: str) -> None:
@@ -25,6 +26,7 @@ def _check_field_error(yml_value: str, expected_error: ErrorCode) -> None:
 def test_string_field() -> None:
     """String field should load correct values."""
     _check_field('matching', 'matching')
+    check_field(_StringObject, 'choice', 'second', 'second')
 
 
 def test_string_field_error_handling() -> None:
@@ -33,3 +35,5 @@ def test_string_field_error_handling() -> None:
     _check_field_error('{a: dict}', ErrorCode.UNEXPECTED_NODE_TYPE)
 
     _check_field_error('not_matching', ErrorCode.VALIDATION_ERROR)
+    check_field_error(_StringObject, 'choice', 'third',
+                      ErrorCode.VALIDATION_ERROR)
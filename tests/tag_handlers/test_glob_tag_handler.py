@@ -1,7 +1,18 @@
 """Glob handler tests."""
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Type
+
+from pytest import mark
+from yaml import Node
 
 from pofy.common import ErrorCode
+from pofy.document_cache import DocumentCache
+from pofy.loader import load
 from pofy.tag_handlers.glob_handler import GlobHandler
 
 from tests.tag_handlers.path_handler_helpers import check_path_tag
@@ -54,3 +65,45 @@ def test_glob_tag_handler_error_handling(datadir: Path) -> None:
         roots=[datadir],
         expected_value=[]
     )
+
+
+@mark.parametrize('executor_class', [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_glob_tag_handler_executor(
+    executor_class: Type[Executor],
+    datadir: Path
+) -> None:
+    """Glob tag should load files concurrently when given an executor."""
+    expected = load(
+        '!glob "**/*.yaml"',
+        list,
+        resolve_roots=[datadir],
+        error_handler=lambda *__: None
+    )
+    assert len(expected) == 2
+
+    with executor_class(max_workers=2) as executor:
+        errors: List[Any] = []
+
+        def _handler(__: Node, code: ErrorCode, message: str) -> None:
+            errors.append((code, message))
+
+        cache = DocumentCache()
+        for __ in range(2):
+            result = load(
+                '!glob "**/*.yaml"',
+                list,
+                resolve_roots=[datadir],
+                error_handler=_handler,
+                document_cache=cache,
+                glob_executor=executor
+            )
+            assert result == expected
+
+        assert len(errors) == 2
+        for code, message in errors:
+            assert code == ErrorCode.VALUE_ERROR
+            assert 'yaml_error.yaml' in message
+
+        # The invalid file is composed again, the others are cached.
+        assert cache.hits == 2
+        assert cache.misses == 4
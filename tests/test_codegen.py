@@ -0,0 +1,133 @@
+"""Generated object loaders tests."""
+from enum import Enum
+from typing import Any
+
+from pofy.common import ErrorCode
+from pofy.fields.bool_field import BoolField
+from pofy.fields.enum_field import EnumField
+from pofy.fields.float_field import FloatField
+from pofy.fields.int_field import IntField
+from pofy.fields.list_field import ListField
+from pofy.fields.string_field import StringField
+from pofy.interfaces import ILoadingContext
+
+from tests.helpers import check_load
+
+
+class _TestEnum(Enum):
+    FIRST = 1
+    SECOND = 2
+
+
+def _validate(__: ILoadingContext, value: Any) -> bool:
+    return bool(value != 'invalid')
+
+
+class _Object:
+    class Schema:
+        """Pofy fields."""
+
+        string_field = StringField()
+        pattern_field = StringField(pattern='^[0-9]*$')
+        choice_field = StringField(choices=['a', 'b'])
+        validated_field = StringField(validate=_validate)
+        int_field = IntField(minimum=0, maximum=10)
+        hex_field = IntField(base=16)
+        float_field = FloatField(minimum=0.0)
+        bool_field = BoolField()
+        enum_field = EnumField(_TestEnum)
+        enum_value_field = EnumField(_TestEnum, by_value=True,
+                                     case_sensitive=False,
+                                     aliases={'One': _TestEnum.FIRST})
+        list_field = ListField(StringField())
+
+    # Names that aren't valid identifiers should be set too.
+    setattr(Schema, 'invalid-identifier', StringField())
+    setattr(Schema, 'class', StringField())
+
+
+def _check(yaml: str, field_name: str, expected_value: Any) -> None:
+    result = check_load(yaml, _Object)
+    assert getattr(result, field_name) == expected_value
+
+
+def _check_error(yaml: str, field_name: str, code: ErrorCode) -> None:
+    result = check_load(yaml, _Object, expected_error=code)
+    assert not hasattr(result, field_name)
+
+
+def test_generated_loader_fast_path() -> None:
+    """Generated loader should load values of built-in fields."""
+    _check('string_field: value', 'string_field', 'value')
+    _check('pattern_field: 10', 'pattern_field', '10')
+    _check('validated_field: valid', 'validated_field', 'valid')
+    _check('int_field: 0xA', 'int_field', 10)
+    _check('hex_field: FF', 'hex_field', 255)
+    _check('float_field: 1.5', 'float_field', 1.5)
+    _check('bool_field: on', 'bool_field', True)
+    _check('bool_field: No', 'bool_field', False)
+    _check('enum_field: SECOND', 'enum_field', _TestEnum.SECOND)
+    _check('enum_value_field: 2', 'enum_value_field', _TestEnum.SECOND)
+    _check('enum_value_field: ONE', 'enum_value_field', _TestEnum.FIRST)
+    _check('choice_field: b', 'choice_field', 'b')
+    _check('list_field: [a, b]', 'list_field', ['a', 'b'])
+    _check('invalid-identifier: value', 'invalid-identifier', 'value')
+    _check('class: value', 'class', 'value')
+
+
+def test_generated_loader_falls_back() -> None:
+    """Generated loader should use the generic path for unusual nodes."""
+    for yaml in [
+            '!fail string_field: value',
+            'string_field: !fail value',
+            'validated_field: invalid',
+    ]:
+        result = check_load(yaml, _Object)
+        assert not hasattr(result, 'string_field')
+        assert not hasattr(result, 'validated_field')
+
+    _check_error('int_field: 11', 'int_field', ErrorCode.VALIDATION_ERROR)
+    _check_error('int_field: -1', 'int_field', ErrorCode.VALIDATION_ERROR)
+    _check_error('int_field: abc', 'int_field', ErrorCode.VALUE_ERROR)
+    _check_error(
+        'int_field: [a, list]',
+        'int_field',
+        ErrorCode.UNEXPECTED_NODE_TYPE
+    )
+    _check_error(
+        'float_field: -1.0',
+        'float_field',
+        ErrorCode.VALIDATION_ERROR
+    )
+    _check_error('float_field: abc', 'float_field', ErrorCode.VALUE_ERROR)
+    _check_error(
+        'pattern_field: abc',
+        'pattern_field',
+        ErrorCode.VALIDATION_ERROR
+    )
+    _check_error('bool_field: maybe', 'bool_field', ErrorCode.VALUE_ERROR)
+    _check_error(
+        'enum_field: THIRD',
+        'enum_field',
+        ErrorCode.VALIDATION_ERROR
+    )
+    _check_error(
+        'enum_value_field: SECOND',
+        'enum_value_field',
+        ErrorCode.VALIDATION_ERROR
+    )
+    _check_error(
+        'choice_field: c',
+        'choice_field',
+        ErrorCode.VALIDATION_ERROR
+    )
+    _check_error(
+        'unknown_field: value',
+        'unknown_field',
+        ErrorCode.FIELD_NOT_DECLARED
+    )
+    _check_error(
+        '[a, list]: value',
+        'string_field',
+        ErrorCode.UNEXPECTED_NODE_TYPE
+    )
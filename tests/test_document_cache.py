@@ -0,0 +1,98 @@
+"""Document cache tests."""
+from os import utime
+from pathlib import Path
+
+from yaml import Node
+
+from pofy.common import ErrorCode
+from pofy.document_cache import DocumentCache
+from pofy.loader import load
+
+
+def test_document_cache_is_used_by_path_handlers(tmp_path: Path) -> None:
+    """Imported and globbed documents should be taken from the cache."""
+    (tmp_path / 'file_1.yaml').write_text('value_1')
+    (tmp_path / 'file_2.yaml').write_text('value_2')
+
+    cache = DocumentCache()
+
+    def _load(source: str) -> object:
+        return load(source, list, resolve_roots=[tmp_path],
+                    document_cache=cache)
+
+    assert _load('!glob file_*.yaml') is not None
+    assert cache.misses == 2
+    assert cache.hits == 0
+    assert len(cache) == 2
+
+    assert _load('[!import file_1.yaml, !import file_2.yaml]') == \
+        ['value_1', 'value_2']
+    assert cache.misses == 2
+    assert cache.hits == 2
+
+
+def test_document_cache_invalidation(tmp_path: Path) -> None:
+    """Modified files should be composed again."""
+    file_path = tmp_path / 'file.yaml'
+    file_path.write_text('value')
+    cache = DocumentCache()
+
+    def _load() -> object:
+        return load('!import file.yaml', str, resolve_roots=[tmp_path],
+                    document_cache=cache)
+
+    assert _load() == 'value'
+    assert _load() == 'value'
+    assert cache.hits == 1
+
+    file_path.write_text('new_value')
+    # Make sure the modification time changes even on coarse file systems.
+    utime(str(file_path), ns=(0, 0))
+    assert _load() == 'new_value'
+    assert cache.misses == 2
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_document_cache_eviction(tmp_path: Path) -> None:
+    """Least recently used documents should be evicted first."""
+    for index in range(3):
+        (tmp_path / 'file_{}.yaml'.format(index)).write_text(str(index))
+
+    cache = DocumentCache(max_size=2)
+
+    def _load(index: int) -> object:
+        return load('!import file_{}.yaml'.format(index), int,
+                    resolve_roots=[tmp_path], document_cache=cache)
+
+    assert _load(0) == 0
+    assert _load(1) == 1
+    assert _load(0) == 0
+    assert _load(2) == 2
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+    # 1 was the least recently used, it should have been evicted
+    assert _load(1) == 1
+    assert cache.hits == 1
+    assert cache.misses == 4
+
+
+def test_document_cache_does_not_store_errors(tmp_path: Path) -> None:
+    """Documents that can't be parsed shouldn't be cached."""
+    (tmp_path / 'error.yaml').write_text('[value')
+    cache = DocumentCache()
+    errors = []
+
+    def _handler(__: Node, code: ErrorCode, ___: str) -> None:
+        errors.append(code)
+
+    for __ in range(2):
+        load('!import error.yaml', str, resolve_roots=[tmp_path],
+             document_cache=cache, error_handler=_handler)
+
+    assert errors == [ErrorCode.VALUE_ERROR, ErrorCode.VALUE_ERROR]
+    assert cache.misses == 2
+    assert len(cache) == 0
@@ -0,0 +1,103 @@
+"""Error collector tests."""
+from typing import Any
+from typing import List
+
+from yaml import compose
+
+from pofy.common import ErrorCode
+from pofy.error_collector import ErrorCollector
+from pofy.fields.int_field import IntField
+from pofy.fields.list_field import ListField
+from pofy.fields.object_field import ObjectField
+from pofy.loader import load
+
+
+class _Item:
+    class Schema:
+        """Pofy fields."""
+
+        value = IntField()
+
+
+class _Root:
+    class Schema:
+        """Pofy fields."""
+
+        items = ListField(ObjectField(_Item))
+
+
+def _get_source(count: int) -> str:
+    return 'items:\n' + ''.join(
+        '  - value: bad_{}\n'.format(index)
+        for index in range(count)
+    )
+
+
+def test_error_collector_collects_all_errors() -> None:
+    """All errors should be recorded, instead of raising the first one."""
+    collector = ErrorCollector()
+    result = load(_get_source(3), _Root, error_handler=collector)
+
+    assert isinstance(result, _Root)
+    assert collector.count == 3
+    assert len(collector) == 3
+    assert not collector.truncated
+
+    errors = list(collector)
+    assert [error.code for error in errors] == [ErrorCode.VALUE_ERROR] * 3
+    assert [error.line for error in errors] == [1, 2, 3]
+    assert all('bad_{}'.format(index) in error.message
+               for index, error in enumerate(errors))
+    assert str(errors[0]).endswith(' : ' + errors[0].message)
+
+
+def test_error_collector_formats_lazily() -> None:
+    """Messages should be formatted when read, not when reported."""
+    formatted: List[str] = []
+
+    class _Argument:
+        def __format__(self, spec: str) -> str:
+            formatted.append(spec)
+            return 'argument'
+
+    class _LazyField(IntField):
+        def _load(self, context: Any) -> Any:
+            context.error(ErrorCode.VALIDATION_ERROR, 'Error {}', _Argument())
+            return None
+
+    class _Owner:
+        class Schema:
+            """Pofy fields."""
+
+            value = _LazyField()
+
+    collector = ErrorCollector()
+    load('value: 1', _Owner, error_handler=collector)
+    assert formatted == []
+    assert collector.errors[0].message == 'Error argument'
+    assert formatted == ['']
+
+
+def test_error_collector_caps_retained_errors() -> None:
+    """Errors past max_errors should be counted, but not retained."""
+    collector = ErrorCollector(max_errors=2)
+    load(_get_source(5), _Root, error_handler=collector)
+
+    assert collector.count == 5
+    assert len(collector) == 2
+    assert collector.truncated
+
+    collector.clear()
+    assert collector.count == 0
+    assert len(collector) == 0
+
+
+def test_error_collector_as_regular_handler() -> None:
+    """Collectors should accept already formatted messages."""
+    collector = ErrorCollector()
+    node = compose('value')
+    collector(node, ErrorCode.VALUE_ERROR, 'Message {}')
+
+    assert collector.count == 1
+    assert collector.errors[0].code == ErrorCode.VALUE_ERROR
+    assert collector.errors[0].message == 'Message {}'
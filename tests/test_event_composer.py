@@ -0,0 +1,242 @@
+"""Streaming composer tests."""
+from io import StringIO
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Optional
+
+from pytest import mark
+from pytest import raises
+from yaml import MappingNode
+from yaml import Node
+from yaml.composer import ComposerError
+
+from pofy.common import ErrorCode
+from pofy.event_composer import LazyMappingNode
+from pofy.event_composer import LazySequenceNode
+from pofy.event_composer import StreamingComposer
+from pofy.event_composer import drain
+from pofy.fields.dict_field import DictField
+from pofy.fields.int_field import IntField
+from pofy.fields.list_field import ListField
+from pofy.fields.object_field import ObjectField
+from pofy.fields.string_field import StringField
+from pofy.loader import load
+from pofy.parser_backend import LIBYAML_AVAILABLE
+from pofy.parser_backend import ParserBackend
+
+_BACKENDS = [ParserBackend.PYTHON]
+if LIBYAML_AVAILABLE:
+    _BACKENDS.append(ParserBackend.LIBYAML)
+
+
+class _Child:
+    class Schema:
+        """Pofy fields."""
+
+        name = StringField()
+        values = ListField(IntField())
+
+
+class _Parent:
+    class Schema:
+        """Pofy fields."""
+
+        children = ListField(ObjectField(_Child))
+        mapping = DictField(StringField())
+        imported = ObjectField(_Child)
+        last = StringField()
+
+    children: List[_Child]
+    imported: _Child
+    last: Optional[str]
+
+
+_DOCUMENT = '''\
+children:
+  - &child
+    name: first
+    values: [1, 2, 3]
+  - *child
+  - name: third
+    values: [!if(flag) 4, 5]
+mapping: {key_1: value_1, key_2: !if(flag) value_2}
+imported: !import child.yaml
+last: value
+'''
+
+
+@mark.parametrize('backend', _BACKENDS)
+def test_streaming_composer_is_lazy(backend: ParserBackend) -> None:
+    """Collection nodes should be composed when iterated."""
+    composer = StreamingComposer(
+        'first: {a: [b]}\n'
+        'anchored: &anchor [c]\n'
+        'tagged: !tag {d: e}\n'
+        'alias: *anchor\n',
+        backend
+    )
+    root = composer.get_root()
+    assert isinstance(root, LazyMappingNode)
+
+    children = list(root.value)
+    assert [key.value for key, __ in children] == \
+        ['first', 'anchored', 'tagged', 'alias']
+
+    # first wasn't iterated, it should have been buffered.
+    first = children[0][1]
+    assert isinstance(first, LazyMappingNode)
+    (key, value), = list(first.value)
+    assert key.value == 'a'
+    assert isinstance(value, LazySequenceNode)
+    assert [item.value for item in value.value] == ['b']
+    assert first.end_mark is not None
+
+    anchored = children[1][1]
+    assert not isinstance(anchored, LazySequenceNode)
+    assert children[3][1] is anchored
+
+    tagged = children[2][1]
+    assert isinstance(tagged, MappingNode)
+    assert not isinstance(tagged, LazyMappingNode)
+    assert tagged.tag == '!tag'
+
+    composer.close()
+    composer.dispose()
+
+
+@mark.parametrize('backend', _BACKENDS)
+def test_streaming_composer_sequence_fallback(backend: ParserBackend) -> None:
+    """Lazy values should behave as lists when read before iterating."""
+    composer = StreamingComposer('[[a, b], [c], [d]]', backend)
+    root = composer.get_root()
+    assert isinstance(root, LazySequenceNode)
+
+    first = root.value[0]
+    assert len(root.value) == 3
+    assert len(first.value) == 2
+    assert root.value[2].value[0].value == 'd'
+    assert list(root.value)[0] is first
+
+    # Once lazily iterated, children aren't kept.
+    second = root.value[1]
+    assert [item.value for item in second.value] == ['c']
+    with raises(RuntimeError):
+        list(second.value)
+    with raises(TypeError):
+        len(second.value)
+
+    composer.close()
+    composer.dispose()
+
+
+@mark.parametrize('backend', _BACKENDS)
+def test_streaming_composer_errors(backend: ParserBackend) -> None:
+    """Composer errors should be reported as in non-streaming mode."""
+    def _compose(source: str) -> None:
+        composer = StreamingComposer(source, backend)
+        root = composer.get_root()
+        assert root is not None
+        drain(root)
+        composer.close()
+
+    with raises(ComposerError):
+        _compose('[a]\n---\n[b]')
+
+    with raises(ComposerError):
+        _compose('[*undefined]')
+
+    with raises(ComposerError):
+        _compose('[&anchor a, &anchor b]')
+
+    composer = StreamingComposer('', backend)
+    assert composer.get_root() is None
+    composer.close()
+
+
+@mark.parametrize('backend', _BACKENDS)
+def test_streaming_load(backend: ParserBackend, tmp_path: Path) -> None:
+    """Streaming load should give the same results as standard load."""
+    (tmp_path / 'child.yaml').write_text('{name: imported, values: [6]}')
+
+    results = []
+    for streaming in [False, True]:
+        result = load(
+            _DOCUMENT,
+            _Parent,
+            resolve_roots=[tmp_path],
+            flags={'flag'},
+            parser_backend=backend,
+            streaming=streaming
+        )
+        assert isinstance(result, _Parent)
+        results.append(result)
+
+    for result in results:
+        assert [child.name for child in result.children] == \
+            ['first', 'first', 'third']
+        assert [child.values for child in result.children] == \
+            [[1, 2, 3], [1, 2, 3], [4, 5]]
+        assert result.mapping == {'key_1': 'value_1', 'key_2': 'value_2'}
+        assert result.imported.name == 'imported'
+        assert result.last == 'value'
+
+
+@mark.parametrize('backend', _BACKENDS)
+def test_streaming_load_error_handling(backend: ParserBackend) -> None:
+    """Skipped nodes shouldn't prevent loading following ones."""
+    errors: List[Any] = []
+
+    def _handler(node: Node, code: ErrorCode, __: str) -> None:
+        errors.append((node.start_mark.line, code))
+
+    result = load(
+        'unknown: {a: [b, c], d: e}\n'
+        'children: [{name: [error], values: [1, a, 3]}]\n'
+        'last: value\n',
+        _Parent,
+        parser_backend=backend,
+        streaming=True,
+        error_handler=_handler
+    )
+    assert isinstance(result, _Parent)
+    assert result.last == 'value'
+    assert result.children[0].values == [1, 3]
+    assert errors == [
+        (0, ErrorCode.FIELD_NOT_DECLARED),
+        (1, ErrorCode.UNEXPECTED_NODE_TYPE),
+        (1, ErrorCode.VALUE_ERROR),
+    ]
+
+
+@mark.parametrize('backend', _BACKENDS)
+def test_streaming_lazy_root_list(backend: ParserBackend) -> None:
+    """Items of a lazy root list should be composed when iterated."""
+    source = StringIO(''.join(
+        '- {{name: child_{}}}\n'.format(index) for index in range(3000)
+    ))
+    result = load(
+        source,
+        list,
+        root_field=ListField(ObjectField(_Child), lazy=True),
+        parser_backend=backend,
+        streaming=True
+    )
+
+    first = next(result)
+    assert first.name == 'child_0'
+    # The parser reads the source by chunks, but shouldn't have read it all.
+    assert source.tell() < len(source.getvalue()) // 2
+
+    names = [child.name for child in result]
+    assert len(names) == 2999
+    assert names[-1] == 'child_2999'
+
+    with raises(ComposerError):
+        list(load(
+            '[a]\n---\n[b]',
+            list,
+            root_field=ListField(StringField(), lazy=True),
+            parser_backend=backend,
+            streaming=True
+        ))
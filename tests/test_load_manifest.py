@@ -0,0 +1,164 @@
+"""Load manifest tests."""
+from hashlib import sha256
+from os import environ
+from os import utime
+from pathlib import Path
+
+from pofy.document_cache import DocumentCache
+from pofy.document_cache import get_file_version
+from pofy.fields.list_field import ListField
+from pofy.fields.string_field import StringField
+from pofy.load_manifest import LoadManifest
+from pofy.loader import load
+
+
+class _Root:
+    class Schema:
+        """Pofy fields."""
+
+        first = StringField()
+        all = ListField(StringField())
+
+
+def _load(source: str, tmp_path: Path, manifest: LoadManifest) -> object:
+    return load(source, list, root_field=ListField(StringField()),
+                resolve_roots=[tmp_path], flags={'enabled'},
+                document_cache=DocumentCache(), manifest=manifest)
+
+
+def test_manifest_records_files(tmp_path: Path) -> None:
+    """Read files should be recorded with their importing node."""
+    (tmp_path / 'file_1.yaml').write_text('value_1')
+    (tmp_path / 'file_2.yaml').write_text('value_2')
+    root_path = tmp_path / 'root.yaml'
+    root_path.write_text(
+        'first: !import file_1.yaml\n'
+        'all: !glob file_*.yaml\n'
+    )
+
+    manifest = LoadManifest()
+    with open(str(root_path), 'r') as root_file:
+        load(root_file, _Root, resolve_roots=[tmp_path], manifest=manifest)
+
+    records = [(Path(record.path).name, record.location, record.line)
+               for record in manifest.files]
+    assert records == [
+        ('root.yaml', None, 0),
+        ('file_1.yaml', str(root_path), 0),
+        ('file_2.yaml', str(root_path), 1),
+    ]
+
+    record = manifest.files[1]
+    assert record.digest == sha256(b'value_1').hexdigest()
+    assert record.size == len('value_1')
+    assert record.mtime_ns == (tmp_path / 'file_1.yaml').stat().st_mtime_ns
+    assert record.column == 7
+
+
+def test_manifest_records_env_and_flags(tmp_path: Path) -> None:
+    """Environment variables and flags read should be recorded."""
+    environ['POFY_MANIFEST_TEST'] = 'value'
+    environ.pop('POFY_MANIFEST_UNDEFINED', None)
+    manifest = LoadManifest()
+    assert _load(
+        '[!env POFY_MANIFEST_TEST, !env POFY_MANIFEST_UNDEFINED, '
+        '!if(enabled) yes, !if(disabled) no]',
+        tmp_path,
+        manifest
+    ) == ['value', 'yes']
+
+    assert manifest.env == {
+        'POFY_MANIFEST_TEST': 'value',
+        'POFY_MANIFEST_UNDEFINED': None,
+    }
+    assert manifest.flags == {'enabled': True, 'disabled': False}
+    assert manifest.as_dict() == {
+        'files': [],
+        'env': manifest.env,
+        'flags': manifest.flags,
+        'missing': [],
+        'globs': [],
+    }
+
+    assert not manifest.is_stale()
+    environ['POFY_MANIFEST_TEST'] = 'other'
+    assert manifest.is_stale()
+    del environ['POFY_MANIFEST_TEST']
+
+
+def test_manifest_staleness(tmp_path: Path) -> None:
+    """Files should be reported as changed only if their content changed."""
+    file_path = tmp_path / 'file.yaml'
+    file_path.write_text('value')
+    manifest = LoadManifest()
+    _load('[!import file.yaml]', tmp_path, manifest)
+    digest = manifest.digest()
+
+    # Touching the file doesn't change its content.
+    stat = file_path.stat()
+    utime(str(file_path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert manifest.changed_files() == []
+    assert not manifest.is_stale()
+
+    file_path.write_text('other value')
+    assert manifest.changed_files() == [file_path.resolve()]
+    assert manifest.is_stale()
+
+    other_manifest = LoadManifest()
+    _load('[!import file.yaml]', tmp_path, other_manifest)
+    assert other_manifest.digest() != digest
+
+    file_path.unlink()
+    assert other_manifest.changed_files() == [file_path.resolve()]
+
+
+def test_files_modified_while_loading(tmp_path: Path) -> None:
+    """Files modified after being read should be recorded as modified."""
+    file_path = tmp_path / 'file.yaml'
+    file_path.write_text('value')
+    version = get_file_version(str(file_path))
+    stat = file_path.stat()
+    file_path.write_text('other value')
+    utime(str(file_path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    manifest = LoadManifest()
+    manifest.add_file(file_path, version=version)
+    assert manifest.files[0].digest == ''
+    assert manifest.changed_files() == [file_path.resolve()]
+    assert manifest.is_stale()
+
+
+def test_manifest_records_lookups(tmp_path: Path) -> None:
+    """Creating a file looked for or matched by a glob should be detected."""
+    first_root = tmp_path / 'first'
+    second_root = tmp_path / 'second'
+    first_root.mkdir()
+    second_root.mkdir()
+    (second_root / 'file.yaml').write_text('second')
+
+    manifest = LoadManifest()
+    assert load('[!import file.yaml, !try-import missing.yaml]', list,
+                root_field=ListField(StringField()),
+                resolve_roots=[first_root, second_root],
+                manifest=manifest) == ['second']
+    assert sorted(manifest.missing) == sorted([
+        str((first_root / 'file.yaml').resolve()),
+        str((first_root / 'missing.yaml').resolve()),
+        str((second_root / 'missing.yaml').resolve()),
+    ])
+    assert not manifest.is_stale()
+
+    (first_root / 'file.yaml').write_text('first')
+    assert manifest.is_stale()
+
+    manifest = LoadManifest()
+    _load('!glob first/*.yaml', tmp_path, manifest)
+    assert manifest.globs == [(
+        str(tmp_path.resolve()),
+        'first/*.yaml',
+        [str((first_root / 'file.yaml').resolve())]
+    )]
+    assert not manifest.is_stale()
+
+    (first_root / 'other.yaml').write_text('other')
+    assert manifest.is_stale()
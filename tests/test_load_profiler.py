@@ -0,0 +1,84 @@
+"""Load profiler tests."""
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from pofy.fields.list_field import ListField
+from pofy.fields.object_field import ObjectField
+from pofy.fields.string_field import StringField
+from pofy.load_profiler import LoadProfiler
+from pofy.loader import load
+
+
+class _Route:
+    class Schema:
+        """Pofy fields."""
+
+        name = StringField()
+
+        @classmethod
+        def validate(cls, __: Any, ___: Any) -> bool:
+            """Validation hook, should get its own frame."""
+            return True
+
+
+class _Service:
+    class Schema:
+        """Pofy fields."""
+
+        routes = ListField(ObjectField(_Route))
+
+
+class _Config:
+    class Schema:
+        """Pofy fields."""
+
+        services = ListField(ObjectField(_Service))
+
+
+def test_load_profiler(datadir: Path) -> None:
+    """Profiler should attribute time to schema paths and YAML positions."""
+    source = StringIO(
+        'services:\n'
+        '  - routes: []\n'
+        '  - routes:\n'
+        '      - name: local\n'
+        '      - !import route.yaml\n'
+    )
+    source.name = 'config.yaml'
+
+    profiler = LoadProfiler()
+    load(source, _Config, resolve_roots=[datadir], profiler=profiler)
+
+    stacks = [entry.stack for entry in profiler.get_entries()]
+    route = (
+        '<root> (config.yaml:1)',
+        'services (config.yaml:2)',
+        '[1] (config.yaml:3)',
+        'routes (config.yaml:4)',
+    )
+    assert route + ('[0] (config.yaml:4)', 'name (config.yaml:4)') in stacks
+    assert route + ('[0] (config.yaml:4)', '_Route.Schema.validate()') \
+        in stacks
+
+    imported_root = route + (
+        '[1] (config.yaml:5)',
+        '!import ({}:1)'.format(datadir / 'route.yaml'),
+    )
+    assert imported_root in stacks
+    assert imported_root + ('name ({}:1)'.format(datadir / 'route.yaml'),) \
+        in stacks
+
+    root = profiler.get_entries()[0]
+    assert root.stack == ('<root> (config.yaml:1)',)
+    assert root.calls == 1
+    assert root.total_time >= root.self_time
+
+    folded = StringIO()
+    profiler.write_folded_stacks(folded)
+    lines = folded.getvalue().splitlines()
+    assert len(lines) == len(stacks)
+    for line in lines:
+        stack, self_time = line.rsplit(' ', 1)
+        assert tuple(stack.split(';')) in stacks
+        assert int(self_time) >= 0
@@ -0,0 +1,106 @@
+"""Load statistics tests."""
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from pofy.common import ErrorCode
+from pofy.document_cache import DocumentCache
+from pofy.fields.int_field import IntField
+from pofy.fields.list_field import ListField
+from pofy.fields.object_field import ObjectField
+from pofy.fields.string_field import StringField
+from pofy.load_stats import LoadStats
+from pofy.load_stats import PHASE_COMPOSE
+from pofy.load_stats import PHASE_CONVERT
+from pofy.load_stats import PHASE_POST_LOAD
+from pofy.load_stats import PHASE_READ
+from pofy.load_stats import PHASE_VALIDATE
+from pofy.load_stats import get_class_name
+from pofy.loader import Loader
+
+
+class _Child:
+    class Schema:
+        """Pofy fields."""
+
+        name = StringField()
+        value = IntField(validate=lambda __, value: bool(value < 10))
+
+        @classmethod
+        def post_load(cls, __: Any) -> None:
+            """Post load hook, should be timed."""
+
+    name: Optional[str] = None
+
+
+class _Parent:
+    class Schema:
+        """Pofy fields."""
+
+        children = ListField(ObjectField(_Child))
+
+
+def test_load_stats(datadir: Path) -> None:
+    """Stats should count nodes, objects, handlers, files and errors."""
+    cache = DocumentCache()
+    loader = Loader(
+        resolve_roots=[datadir],
+        document_cache=cache,
+        flags={'flag'},
+        error_handler=lambda *__: None
+    )
+    source = (
+        'children:\n'
+        '  - !import child.yaml\n'
+        '  - !import child.yaml\n'
+        '  - name: !if(flag) local\n'
+        '    value: 20\n'
+        '    unknown: value\n'
+    )
+
+    stats = LoadStats()
+    result = loader.load(source, _Parent, stats=stats)
+    assert isinstance(result, _Parent)
+    assert [child.name for child in result.children] == \
+        ['imported', 'imported', 'local']
+
+    # Root, children, 3 items, 2 imported roots, name and value of each
+    # child, and the copy of the !if node.
+    assert stats.nodes == 14
+    assert stats.objects == {
+        get_class_name(_Parent): 1,
+        get_class_name(_Child): 3,
+    }
+    assert stats.tag_handlers == {'ImportHandler': 2, 'IfHandler': 1}
+    child_path = datadir / 'child.yaml'
+    assert stats.files == [(str(child_path), child_path.stat().st_size)]
+    assert stats.bytes_read == child_path.stat().st_size
+    assert stats.cache_hits == 1
+    assert stats.cache_misses == 1
+    assert stats.errors == {ErrorCode.FIELD_NOT_DECLARED: 1}
+
+    for phase in [PHASE_READ, PHASE_COMPOSE, PHASE_CONVERT, PHASE_VALIDATE,
+                  PHASE_POST_LOAD]:
+        assert stats.phase_times[phase] > 0
+
+    assert stats.as_dict()['errors'] == {'FIELD_NOT_DECLARED': 1}
+
+    # Stats are only collected when requested.
+    assert loader.load(source, _Parent) is not None
+    assert stats.nodes == 14
+
+
+def test_load_stats_phases() -> None:
+    """Nested phases time shouldn't be counted in the enclosing phase."""
+    stats = LoadStats()
+    with stats.phase(PHASE_CONVERT):
+        with stats.phase(PHASE_VALIDATE):
+            with stats.phase(PHASE_POST_LOAD):
+                pass
+
+    times = stats.phase_times
+    assert times[PHASE_CONVERT] >= 0
+    assert times[PHASE_VALIDATE] >= 0
+    assert times[PHASE_POST_LOAD] >= 0
+    assert times[PHASE_READ] == 0
+    assert times[PHASE_COMPOSE] == 0
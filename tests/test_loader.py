@@ -1,23 +1,41 @@
 """Yaml object loading tests."""
+from io import BytesIO
 from io import StringIO
 from pathlib import Path
 from typing import Any
 from typing import Optional
 from typing import Type
 
+from pytest import mark
 from yaml import Node
 
 from pofy.common import ErrorCode
 from pofy.common import UNDEFINED
+from pofy.common import default_schema_resolver
+from pofy.document_cache import DocumentCache
+from pofy.fields.int_field import IntField
 from pofy.fields.list_field import ListField
 from pofy.fields.object_field import ObjectField
 from pofy.fields.string_field import StringField
 from pofy.interfaces import ILoadingContext
+from pofy.loader import Loader
 from pofy.loader import load
+from pofy.loader import load_all
+from pofy.loader import load_many
 
 from tests.helpers import FailTagHandler
 
 
+class _ManyObject:
+    """Object loaded by load_many tests, must be picklable."""
+
+    class Schema:
+        """Pofy fields."""
+
+        test_field = StringField()
+        int_field = IntField()
+
+
 def test_resolve_root_works(datadir: Path) -> None:
     """Resolve root should be forwarded to glob and import tag handler."""
     class _Owned:
@@ -106,6 +124,30 @@ def test_load_handles_stream(datadir: Path) -> None:
     assert test == {'test_field': 'test_value'}
 
 
+@mark.parametrize('streaming', [False, True])
+def test_load_handles_path_and_bytes(datadir: Path, streaming: bool) -> None:
+    """Path, bytes and binary streams should be accepted as sources."""
+    file_path = datadir / 'object.yaml'
+    expected = {'test_field': 'test_value'}
+    assert load(file_path, dict, streaming=streaming) == expected
+    assert load(file_path.read_bytes(), dict, streaming=streaming) == expected
+    with open(file_path, 'rb') as yaml_file:
+        assert load(yaml_file, dict, streaming=streaming) == expected
+
+    utf_16 = '\ufefftest_field: test_value'.encode('utf-16-le')
+    assert load(BytesIO(utf_16), dict, streaming=streaming) == expected
+
+    locations = []
+
+    def _error_handler(node: Node, __: ErrorCode, ___: str) -> None:
+        locations.append(node.start_mark.name)
+
+    load(file_path, int, error_handler=_error_handler, streaming=streaming)
+    with open(file_path, 'rb') as yaml_file:
+        load(yaml_file, int, error_handler=_error_handler, streaming=streaming)
+    assert locations == [str(file_path)] * 2
+
+
 def test_load_defines_node_path(datadir: Path) -> None:
     """Calling load with a stream should set the location of the root node."""
     file_path = datadir / 'object.yaml'
@@ -129,6 +171,10 @@ def test_load_defines_node_path(datadir: Path) -> None:
         load(yaml_file, _TestObject)
         assert validate_called
 
+    validate_called = False
+    load(file_path, _TestObject)
+    assert validate_called
+
 
 def test_error_hanlder_is_called() -> None:
     """The given error_handler should be called when defined."""
@@ -140,3 +186,143 @@ def test_error_hanlder_is_called() -> None:
 
     load('[a, list]', str, error_handler=_handler)
     assert handler_called
+
+
+def test_loader_can_be_reused(datadir: Path) -> None:
+    """Loader should share its configuration and caches between calls."""
+    class _Object:
+        class Schema:
+            """Pofy fields."""
+
+            test_field = StringField()
+            flag_field = StringField()
+
+    cache = DocumentCache()
+    loader = Loader(
+        resolve_roots=[datadir],
+        flags={'some_flag'},
+        document_cache=cache
+    )
+    assert loader.document_cache is cache
+
+    for __ in range(3):
+        result = loader.load('!import object.yaml', _Object)
+        assert isinstance(result, _Object)
+        assert result.test_field == 'test_value'
+
+        result = loader.load('flag_field: !if(some_flag) value', _Object)
+        assert isinstance(result, _Object)
+        assert result.flag_field == 'value'
+
+        assert loader.load('10', int) == 10
+
+    assert cache.misses == 1
+    assert cache.hits == 2
+    plan = loader.schema_plans.get(_Object, default_schema_resolver)
+    assert plan is not None
+    assert 'test_field' in plan.fields
+
+
+def test_load_all() -> None:
+    """load_all should load each document of the stream, with its index."""
+    class _Object:
+        class Schema:
+            """Pofy fields."""
+
+            test_field = StringField()
+
+    source = (
+        'test_field: first\n'
+        '---\n'
+        'test_field: [error]\n'
+        '---\n'
+        'test_field: third\n'
+    )
+
+    for streaming in [False, True]:
+        errors = []
+
+        def _handler(node: Node, __: ErrorCode, ___: str) -> None:
+            errors.append(node.start_mark.line)
+
+        results = list(load_all(
+            StringIO(source),
+            _Object,
+            error_handler=_handler,
+            streaming=streaming
+        ))
+        assert [index for index, __ in results] == [0, 1, 2]
+        assert [getattr(result, 'test_field', None)
+                for __, result in results] == ['first', None, 'third']
+        assert errors == [2]
+
+    assert list(load_all('', _Object)) == []
+    documents = load_all('10\n---\n20\n---\n[error]\n', int)
+    assert next(documents) == (0, 10)
+    assert next(documents) == (1, 20)
+
+
+@mark.parametrize('workers', [1, 2])
+def test_load_many(workers: int, datadir: Path) -> None:
+    """load_many should return results and collected errors per source."""
+    sources = [
+        datadir / 'object.yaml',
+        'test_field: [error]\nint_field: error',
+        'int_field: 10',
+        '[unclosed',
+        'import: !import object.yaml',
+    ]
+
+    outcomes = list(load_many(
+        sources,
+        _ManyObject,
+        workers=workers,
+        resolve_roots=[datadir]
+    ))
+    assert [outcome.index for outcome in outcomes] == [0, 1, 2, 3, 4]
+    assert [outcome.succeeded for outcome in outcomes] == \
+        [True, False, True, False, False]
+
+    first = outcomes[0]
+    assert isinstance(first.result, _ManyObject)
+    assert first.result.test_field == 'test_value'
+    assert first.location == str(datadir / 'object.yaml')
+
+    second = outcomes[1]
+    assert [(error.code, error.line) for error in second.errors] == [
+        (ErrorCode.UNEXPECTED_NODE_TYPE, 0),
+        (ErrorCode.VALUE_ERROR, 1)
+    ]
+    assert isinstance(second.result, _ManyObject)
+
+    assert outcomes[2].result.int_field == 10
+
+    third = outcomes[3]
+    assert third.result is UNDEFINED
+    assert len(third.errors) == 1
+    assert third.errors[0].code is None
+
+    assert outcomes[4].errors[0].code == ErrorCode.FIELD_NOT_DECLARED
+
+
+@mark.parametrize('workers', [1, 2])
+def test_load_many_source_failure(workers: int, datadir: Path) -> None:
+    """A source failing to load shouldn't stop the following ones."""
+    missing = datadir / 'missing.yaml'
+    outcomes = list(load_many(
+        [missing, 'int_field: 10', datadir / 'object.yaml'],
+        _ManyObject,
+        workers=workers
+    ))
+    assert [outcome.succeeded for outcome in outcomes] == \
+        [False, True, True]
+
+    failed = outcomes[0]
+    assert failed.result is UNDEFINED
+    assert failed.location == str(missing)
+    assert len(failed.errors) == 1
+    assert failed.errors[0].code is None
+    assert 'FileNotFoundError' in failed.errors[0].message
+
+    assert outcomes[1].result.int_field == 10
+    assert outcomes[2].result.test_field == 'test_value'
@@ -1,13 +1,17 @@
 """Loading context tests."""
+from typing import Any
 from typing import Optional
 
 from pytest import raises
 from yaml import Node
+from yaml import compose
 from yaml.error import Mark
 
 from pofy.common import ErrorCode
 from pofy.common import PofyValueError
 from pofy.fields.base_field import BaseField
+from pofy.fields.list_field import ListField
+from pofy.fields.string_field import StringField
 from pofy.interfaces import IBaseField
 from pofy.interfaces import ILoadingContext
 from pofy.loading_context import LoadingContext
@@ -67,6 +71,101 @@ def test_loading_context_returns_node_location() -> None:
     _check(None)
 
 
+def test_loading_context_restores_parent_location() -> None:
+    """Location of a nested document should be popped with its node."""
+    locations = []
+
+    class _LeafField(BaseField):
+        def _load(self, context: ILoadingContext) -> None:
+            locations.append(context.current_location())
+
+    class _ParentField(BaseField):
+        def _load(self, context: ILoadingContext) -> None:
+            context.load(_LeafField(), _get_dummy_node())
+            context.load(_LeafField(), _get_dummy_node(), 'child')
+            context.load(_LeafField(), _get_dummy_node())
+
+    context = LoadingContext(error_handler=None, tag_handlers=[])
+    context.load(_ParentField(), _get_dummy_node(), 'parent')
+    assert locations == ['parent', 'child', 'parent']
+    assert context.current_location() is None
+
+
+def test_loading_context_caches_tag_resolution() -> None:
+    """Tag handlers should be resolved once per distinct tag."""
+    match_calls = []
+
+    class _CountingHandler(TagHandler):
+        tag_pattern = '^(first|second)$'
+
+        def match_tag(self, tag: str) -> bool:
+            match_calls.append(tag)
+            return super().match_tag(tag)
+
+        def load(self, context: ILoadingContext, field: IBaseField) -> Any:
+            return context.current_node().value.upper()
+
+    result = check_load(
+        '[!first a, !first b, !second c, !first d]',
+        field=ListField(StringField()),
+        tag_handlers=[_CountingHandler()]
+    )
+    assert result == ['A', 'B', 'C', 'D']
+    assert match_calls == ['!first', '!second']
+
+
+def test_loading_context_reports_ambiguous_tags_on_each_node() -> None:
+    """Each node with an ambiguous tag should emit an error."""
+    class _DummyHandler(TagHandler):
+        tag_pattern = '^dummy$'
+
+        def load(self, context: ILoadingContext, field: IBaseField) -> Any:
+            return context.current_node().value
+
+    errors = []
+
+    def _handler(node: Node, code: ErrorCode, __: str) -> None:
+        errors.append((node.value, code))
+
+    context = LoadingContext(_handler, [_DummyHandler(), _DummyHandler()])
+    result = context.load(
+        ListField(StringField()),
+        compose('[!dummy a, !dummy b]')
+    )
+    assert result == ['a', 'b']
+    assert errors == [
+        ('a', ErrorCode.MULTIPLE_MATCHING_HANDLERS),
+        ('b', ErrorCode.MULTIPLE_MATCHING_HANDLERS),
+    ]
+
+
+def test_loading_context_honors_late_handlers() -> None:
+    """Handlers added after tags were resolved should be taken into account."""
+    class _UpperHandler(TagHandler):
+        tag_pattern = '^upper$'
+
+        def load(self, context: ILoadingContext, field: IBaseField) -> Any:
+            return context.current_node().value.upper()
+
+    class _NodeHandler(TagHandler):
+        tag_pattern = '^node$'
+
+        def match(self, node: Node) -> bool:
+            return bool(node.value == 'matched')
+
+        def load(self, context: ILoadingContext, field: IBaseField) -> Any:
+            return 'node_handler'
+
+    context = LoadingContext(None, [])
+    field = ListField(StringField())
+    node = compose('[!upper a, !node matched, !node other]')
+    assert context.load(field, node) == ['a', 'matched', 'other']
+
+    context.add_tag_handler(_UpperHandler())
+    context.add_tag_handler(_NodeHandler())
+    assert context.load(field, node) == ['A', 'node_handler', 'other']
+
+
 def _get_dummy_node() -> Node:
     return Node(
         'tag',
@@ -0,0 +1,96 @@
+"""Parser backend tests."""
+from io import StringIO
+from pathlib import Path
+from typing import Any
+from typing import List
+
+from pytest import mark
+from pytest import raises
+from yaml import MappingNode
+from yaml import Node
+from yaml.parser import ParserError
+
+from pofy.common import ErrorCode
+from pofy.fields.string_field import StringField
+from pofy.loader import load
+from pofy.parser_backend import LIBYAML_AVAILABLE
+from pofy.parser_backend import ParserBackend
+from pofy.parser_backend import compose_document
+from pofy.parser_backend import resolve_parser_backend
+
+_BACKENDS = [ParserBackend.PYTHON]
+if LIBYAML_AVAILABLE:
+    _BACKENDS.append(ParserBackend.LIBYAML)
+
+
+class _Object:
+    class Schema:
+        """Pofy fields."""
+
+        field = StringField()
+
+
+def test_resolve_parser_backend() -> None:
+    """Auto backend should resolve to libyaml only if it's available."""
+    expected = ParserBackend.PYTHON
+    if LIBYAML_AVAILABLE:
+        expected = ParserBackend.LIBYAML
+
+    assert resolve_parser_backend(ParserBackend.AUTO) == expected
+    assert resolve_parser_backend(ParserBackend.PYTHON) == ParserBackend.PYTHON
+
+
+@mark.parametrize('backend', _BACKENDS)
+def test_compose_document(backend: ParserBackend) -> None:
+    """Documents should be composed the same way by all backends."""
+    source = StringIO('key: [!tag value, 10]\n')
+    setattr(source, 'name', 'file.yaml')
+    node = compose_document(source, backend)
+
+    assert isinstance(node, MappingNode)
+    key_node, value_node = node.value[0]
+    assert key_node.value == 'key'
+    assert value_node.value[0].tag == '!tag'
+    assert value_node.value[1].tag == 'tag:yaml.org,2002:int'
+
+    start_mark = value_node.value[1].start_mark
+    assert start_mark.name == 'file.yaml'
+    assert start_mark.line == 0
+    assert start_mark.column == 18
+
+    with raises(ParserError):
+        compose_document('key: [value', backend)
+
+
+@mark.parametrize('backend', _BACKENDS)
+def test_load_uses_parser_backend(backend: ParserBackend, datadir: Path) \
+        -> None:
+    """Load should use the given parser backend for imported files too."""
+    result = load(
+        'field: !import object.yaml',
+        dict,
+        resolve_roots=[datadir],
+        parser_backend=backend
+    )
+    assert result == {'field': 'value'}
+
+    errors: List[Any] = []
+
+    def _handler(node: Node, code: ErrorCode, message: str) -> None:
+        errors.append((node.start_mark.line, code, message))
+
+    load(
+        'first: !import object.yaml\n'
+        'second: !import parse_error.yaml',
+        dict,
+        resolve_roots=[datadir],
+        parser_backend=backend,
+        error_handler=_handler
+    )
+    assert len(errors) == 1
+    assert errors[0][0] == 1
+    assert errors[0][1] == ErrorCode.VALUE_ERROR
+    assert 'parse_error.yaml' in errors[0][2]
+
+    with raises(ParserError):
+        load('field: [value', _Object, parser_backend=backend)
@@ -0,0 +1,134 @@
+"""Reload state tests."""
+from os import utime
+from pathlib import Path
+from typing import Any
+from typing import List
+
+from pofy.common import ErrorCode
+from pofy.document_cache import DocumentCache
+from pofy.error_collector import ErrorCollector
+from pofy.fields.list_field import ListField
+from pofy.fields.object_field import ObjectField
+from pofy.fields.string_field import StringField
+from pofy.loader import Loader
+from pofy.reload_state import ReloadState
+
+
+class _Leaf:
+    class Schema:
+        """Pofy fields."""
+
+        value = StringField()
+
+
+class _Node:
+    class Schema:
+        """Pofy fields."""
+
+        children = ListField(ObjectField(_Leaf))
+
+
+def _touch(path: Path, content: str) -> None:
+    stat = path.stat()
+    path.write_text(content)
+    # Ensure the modification is detected even on coarse mtime resolution.
+    utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def _create_files(tmp_path: Path) -> None:
+    (tmp_path / 'leaf_1.yaml').write_text('value: one')
+    (tmp_path / 'leaf_2.yaml').write_text('value: two')
+    (tmp_path / 'node.yaml').write_text(
+        'children: [!import leaf_1.yaml, !import leaf_2.yaml]'
+    )
+
+
+def test_unchanged_documents_are_reused(tmp_path: Path) -> None:
+    """Documents should be reused when their files didn't change."""
+    _create_files(tmp_path)
+    loader = Loader(resolve_roots=[tmp_path], document_cache=DocumentCache())
+    state = ReloadState()
+    root_field = ListField(ObjectField(_Node))
+
+    def _load() -> Any:
+        return loader.load('[!import node.yaml]', list, root_field=root_field,
+                           reload_state=state)
+
+    first = _load()
+    assert state.misses == 3
+    assert state.hits == 0
+    assert state.changed_files() == []
+
+    second = _load()
+    assert state.misses == 3
+    assert state.hits == 1
+    assert second is not first
+    assert second[0] is first[0]
+
+    _touch(tmp_path / 'leaf_2.yaml', 'value: deux')
+    assert state.changed_files() == [(tmp_path / 'leaf_2.yaml').resolve()]
+
+    third = _load()
+    # node.yaml and leaf_2.yaml are converted again, leaf_1.yaml is reused.
+    assert state.misses == 5
+    assert state.hits == 2
+    assert third[0] is not first[0]
+    assert third[0].children[0] is first[0].children[0]
+    assert third[0].children[1].value == 'deux'
+    assert state.changed_files() == []
+
+
+def test_objects_are_not_shared_in_a_load(tmp_path: Path) -> None:
+    """Importing a document twice in a load should give distinct objects."""
+    _create_files(tmp_path)
+    loader = Loader(resolve_roots=[tmp_path], document_cache=DocumentCache())
+    state = ReloadState()
+    root_field = ListField(ObjectField(_Leaf))
+
+    def _load() -> Any:
+        return loader.load('[!import leaf_1.yaml, !import leaf_1.yaml]', list,
+                           root_field=root_field, reload_state=state)
+
+    first = _load()
+    assert first[0] is not first[1]
+    assert state.misses == 2
+
+    second = _load()
+    assert second[0] is not second[1]
+    assert state.hits == 1
+    assert state.misses == 3
+    assert second[0] in first
+
+
+def test_volatile_documents_are_not_reused(tmp_path: Path) -> None:
+    """Documents using !env or a missing !try-import shouldn't be reused."""
+    (tmp_path / 'env.yaml').write_text('value: !env POFY_RELOAD_TEST')
+    (tmp_path / 'try.yaml').write_text('[!try-import missing.yaml]')
+    loader = Loader(resolve_roots=[tmp_path], document_cache=DocumentCache())
+    state = ReloadState()
+
+    for _ in range(2):
+        loader.load('!import env.yaml', _Leaf, reload_state=state)
+        loader.load('!import try.yaml', list,
+                    root_field=ListField(StringField()), reload_state=state)
+
+    assert state.hits == 0
+    assert state.misses == 4
+
+
+def test_documents_with_errors_are_not_reused(tmp_path: Path) -> None:
+    """Documents whose conversion reported errors should be loaded again."""
+    (tmp_path / 'leaf.yaml').write_text('value: [not, a, string]')
+    errors = ErrorCollector()
+    loader = Loader(resolve_roots=[tmp_path], document_cache=DocumentCache(),
+                    error_handler=errors)
+    state = ReloadState()
+
+    codes: List[ErrorCode] = []
+    for _ in range(2):
+        loader.load('!import leaf.yaml', _Leaf, reload_state=state)
+        codes.extend(error.code for error in errors)
+        errors.clear()
+
+    assert state.hits == 0
+    assert codes == [ErrorCode.UNEXPECTED_NODE_TYPE] * 2
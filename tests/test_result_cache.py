@@ -0,0 +1,253 @@
+"""Result cache tests."""
+from os import environ
+from os import utime
+from pathlib import Path
+from typing import Any
+from typing import List
+
+from pofy.error_collector import ErrorCollector
+from pofy.fields.int_field import IntField
+from pofy.fields.list_field import ListField
+from pofy.fields.object_field import ObjectField
+from pofy.fields.string_field import StringField
+from pofy.load_manifest import LoadManifest
+from pofy.loader import Loader
+from pofy.interfaces import IBaseField
+from pofy.interfaces import ILoadingContext
+from pofy.result_cache import ResultCache
+from pofy.tag_handlers.tag_handler import TagHandler
+
+_POST_LOADS: List[str] = []
+
+
+class _Item:
+    class Schema:
+        """Pofy fields."""
+
+        name = StringField()
+        value = IntField()
+
+        @classmethod
+        def post_load(cls, item: '_Item') -> None:
+            """Count conversions."""
+            _POST_LOADS.append(item.name)
+
+    name: str
+    value: int
+
+
+class _Config:
+    class Schema:
+        """Pofy fields."""
+
+        items = ListField(ObjectField(_Item))
+
+
+class _Modifying:
+    """Modifies the file it's loaded from, after it has been read."""
+
+    class Schema:
+        """Pofy fields."""
+
+        path = StringField()
+
+        @classmethod
+        def post_load(cls, obj: '_Modifying') -> None:
+            """Modify the loaded file."""
+            _touch(Path(obj.path), 'path: {}\n# Modified'.format(obj.path))
+
+    path: str
+
+
+class _ConstantHandler(TagHandler):
+    tag_pattern = '^constant$'
+
+    def __init__(self, value: str):
+        super().__init__()
+        self._value = value
+
+    def load(self, context: ILoadingContext, field: IBaseField) -> Any:
+        return self._value
+
+
+def _touch(path: Path, content: str) -> None:
+    stat = path.stat()
+    path.write_text(content)
+    utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def _create_loader(tmp_path: Path, **kwargs: Any) -> Loader:
+    cache = ResultCache(tmp_path / 'cache', **kwargs)
+    return Loader(resolve_roots=[tmp_path], result_cache=cache)
+
+
+def test_results_are_cached(tmp_path: Path) -> None:
+    """Results should be returned from the cache until inputs change."""
+    item_path = tmp_path / 'item.yaml'
+    item_path.write_text('{name: item, value: 1}')
+    root_path = tmp_path / 'root.yaml'
+    root_path.write_text('items: [!import item.yaml]')
+
+    _POST_LOADS.clear()
+
+    def _load() -> Any:
+        # Each call uses a new loader, like a new process would.
+        loader = _create_loader(tmp_path)
+        with open(str(root_path), 'r') as root_file:
+            return loader.load(root_file, _Config)
+
+    assert _load().items[0].value == 1
+    assert _POST_LOADS == ['item']
+
+    manifest = LoadManifest()
+    loader = _create_loader(tmp_path)
+    with open(str(root_path), 'r') as root_file:
+        config = loader.load(root_file, _Config, manifest=manifest)
+    assert config.items[0].value == 1
+    assert _POST_LOADS == ['item']
+    assert [Path(record.path) for record in manifest.files] == \
+        [root_path.resolve(), item_path.resolve()]
+
+    _touch(item_path, '{name: item, value: 2}')
+    assert _load().items[0].value == 2
+    assert _POST_LOADS == ['item', 'item']
+    assert _load().items[0].value == 2
+    assert _POST_LOADS == ['item', 'item']
+
+
+def test_cache_key(tmp_path: Path) -> None:
+    """Different sources, flags or env values shouldn't share entries."""
+    environ['POFY_RESULT_CACHE_TEST'] = 'first'
+    cache = ResultCache(tmp_path / 'cache')
+
+    def _load(source: str, **kwargs: Any) -> Any:
+        loader = Loader(result_cache=cache, **kwargs)
+        return loader.load(source, list)
+
+    assert _load('[a]') == ['a']
+    assert _load('[b]') == ['b']
+    assert _load('[!if(flag) c]', flags={'flag'}) == ['c']
+    assert _load('[!if(flag) c]') == []
+    assert cache.misses == 4
+
+    assert _load('[!env POFY_RESULT_CACHE_TEST]') == ['first']
+    environ['POFY_RESULT_CACHE_TEST'] = 'second'
+    assert _load('[!env POFY_RESULT_CACHE_TEST]') == ['second']
+    assert cache.misses == 6
+
+    assert _load('[a]') == ['a']
+    assert _load('[!if(flag) c]', flags={'flag'}) == ['c']
+    assert _load('[!env POFY_RESULT_CACHE_TEST]') == ['second']
+    assert cache.hits == 3
+    del environ['POFY_RESULT_CACHE_TEST']
+
+
+def test_cache_key_configuration(tmp_path: Path) -> None:
+    """Tag handler attributes and cache salts should be part of the key."""
+    def _load(value: str, salt: str = '') -> Any:
+        cache = ResultCache(tmp_path / 'cache', salt=salt)
+        loader = Loader(tag_handlers=[_ConstantHandler(value)],
+                        result_cache=cache)
+        return loader.load('[!constant value]', list), cache.hits
+
+    assert _load('first') == (['first'], 0)
+    assert _load('second') == (['second'], 0)
+    assert _load('first') == (['first'], 1)
+
+    assert _load('first', salt='1.0') == (['first'], 0)
+    assert _load('first', salt='1.0') == (['first'], 1)
+
+
+def test_results_with_errors_are_not_cached(tmp_path: Path) -> None:
+    """Loadings reporting errors should be done again."""
+    errors = ErrorCollector()
+    cache = ResultCache(tmp_path / 'cache')
+    loader = Loader(result_cache=cache, error_handler=errors)
+    for _ in range(2):
+        loader.load('items: [{name: item, value: error}]', _Config)
+
+    assert len(errors) == 2
+    # The collector is used directly, formatting messages lazily.
+    assert all(error.message_format != '{}' for error in errors)
+    assert cache.hits == 0
+    assert list((tmp_path / 'cache').iterdir()) == []
+
+
+def test_inputs_modified_while_loading(tmp_path: Path) -> None:
+    """Results of files modified while loading shouldn't be cached."""
+    file_path = tmp_path / 'file.yaml'
+    file_path.write_text('path: {}'.format(file_path))
+    cache = ResultCache(tmp_path / 'cache')
+    loader = Loader(resolve_roots=[tmp_path], result_cache=cache)
+    loader.load('!import file.yaml', _Modifying)
+
+    assert list((tmp_path / 'cache').iterdir()) == []
+
+
+def test_corrupted_entries(tmp_path: Path) -> None:
+    """Unreadable entries should be removed and loaded again."""
+    cache = ResultCache(tmp_path / 'cache')
+    loader = Loader(result_cache=cache)
+    assert loader.load('[value]', list) == ['value']
+    entries = list((tmp_path / 'cache').iterdir())
+    assert len(entries) == 1
+
+    entries[0].write_bytes(b'garbage')
+    assert loader.load('[value]', list) == ['value']
+    assert cache.hits == 0
+    assert cache.misses == 2
+
+    data = entries[0].read_bytes()
+    entries[0].write_bytes(data[:len(data) // 2])
+    assert loader.load('[value]', list) == ['value']
+    assert loader.load('[value]', list) == ['value']
+    assert cache.hits == 1
+
+
+def test_eviction(tmp_path: Path) -> None:
+    """Least recently used entries should be evicted when the cache is full."""
+    cache = ResultCache(tmp_path / 'cache', max_size=1)
+    loader = Loader(result_cache=cache)
+    loader.load('[first]', list)
+    loader.load('[second]', list)
+    assert cache.evictions == 2
+    assert list((tmp_path / 'cache').iterdir()) == []
+
+    cache = ResultCache(tmp_path / 'cache')
+    loader = Loader(result_cache=cache)
+    entries: List[Path] = []
+    for index, value in enumerate(['first', 'second', 'third']):
+        loader.load('[{}]'.format(value), list)
+        entry = next(path for path in (tmp_path / 'cache').iterdir()
+                     if path not in entries)
+        utime(str(entry), ns=(0, index * 10 ** 9))
+        entries.append(entry)
+    size = sum(path.stat().st_size for path in entries)
+
+    # Using the first entry makes the second one the least recently used.
+    assert loader.load('[first]', list) == ['first']
+    cache = ResultCache(tmp_path / 'cache', max_size=size)
+    loader = Loader(result_cache=cache)
+    loader.load('[fourth]', list)
+    assert cache.evictions == 1
+    assert not entries[1].exists()
+    assert entries[0].exists()
+    assert entries[2].exists()
+
+
+def test_schema_changes_invalidate_entries(tmp_path: Path) -> None:
+    """Entries loaded with another schema definition shouldn't be used."""
+    cache = ResultCache(tmp_path / 'cache')
+
+    def _load(root_field: Any) -> Any:
+        loader = Loader(result_cache=cache)
+        return loader.load('[1, 2]', list, root_field=root_field)
+
+    assert _load(ListField(IntField())) == [1, 2]
+    assert _load(ListField(IntField())) == [1, 2]
+    assert cache.hits == 1
+
+    assert _load(ListField(StringField())) == ['1', '2']
+    assert _load(ListField(IntField(minimum=0))) == [1, 2]
+    assert cache.hits == 1
+    assert cache.misses == 3
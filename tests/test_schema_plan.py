@@ -0,0 +1,217 @@
+"""Schema plan tests."""
+from enum import Enum
+from gc import collect
+from typing import Any
+from typing import Optional
+from typing import Type
+from weakref import ref
+
+from pofy.common import default_schema_resolver
+from pofy.fields.enum_field import EnumField
+from pofy.fields.int_field import IntField
+from pofy.fields.list_field import ListField
+from pofy.fields.object_field import ObjectField
+from pofy.fields.string_field import StringField
+from pofy.interfaces import ILoadingContext
+from pofy.schema_plan import SchemaPlanCache
+from pofy.schema_plan import build_schema_plan
+from pofy.schema_plan import schema_fingerprint
+
+
+class _Parent:
+    class Schema:
+        """Pofy fields."""
+
+        parent_field = StringField(required=True)
+
+        @classmethod
+        def validate(cls, __: ILoadingContext, ___: Any) -> bool:
+            """Validate."""
+            return True
+
+        @classmethod
+        def post_load(cls, __: Any) -> None:
+            """Post load."""
+
+
+class _Child(_Parent):
+    class Schema:
+        """Pofy fields."""
+
+        child_field = IntField()
+
+        @classmethod
+        def post_load(cls, __: Any) -> None:
+            """Post load."""
+
+
+class _NoSchema:
+    pass
+
+
+def test_build_schema_plan() -> None:
+    """Schema plan should aggregate inherited fields and hooks."""
+    plan = build_schema_plan(_Child, default_schema_resolver)
+    assert plan is not None
+    assert set(plan.fields.keys()) == {'parent_field', 'child_field'}
+    assert plan.required_fields == ('parent_field',)
+    assert len(plan.validate_hooks) == 1
+    assert len(plan.post_load_hooks) == 2
+    assert plan.post_load_hooks[0] == _Parent.Schema.post_load
+    assert plan.post_load_hooks[1] == _Child.Schema.post_load
+
+    assert build_schema_plan(_NoSchema, default_schema_resolver) is None
+
+
+def test_schema_plan_cache() -> None:
+    """Schema plans should be built once, and correctly invalidated."""
+    cache = SchemaPlanCache()
+    plan = cache.get(_Child, default_schema_resolver)
+    assert plan is not None
+    assert cache.get(_Child, default_schema_resolver) is plan
+    assert cache.get(_NoSchema, default_schema_resolver) is None
+
+    def _resolver(__: Any) -> None:
+        return None
+
+    assert cache.get(_Child, _resolver) is None
+    assert cache.get(_Child, default_schema_resolver) is plan
+
+    parent_plan = cache.get(_Parent, default_schema_resolver)
+    cache.invalidate(_Parent)
+    assert cache.get(_Parent, default_schema_resolver) is not parent_plan
+    assert cache.get(_Child, default_schema_resolver) is not plan
+
+    plan = cache.get(_Child, default_schema_resolver)
+    cache.clear()
+    assert cache.get(_Child, default_schema_resolver) is not plan
+
+
+def _make_class(item_field: Any, base: type = object) -> type:
+    class _Item:
+        class Schema:
+            """Pofy fields."""
+
+            value = IntField(minimum=0)
+
+    class _Object(base): # type: ignore
+        class Schema:
+            """Pofy fields."""
+
+            name = StringField(pattern='^[a-z]+$')
+            items = ListField(item_field)
+            item = ObjectField(_Item)
+            color = EnumField(_Color)
+
+    return _Object
+
+
+class _Color(Enum):
+    RED = 'red'
+    GREEN = 'green'
+
+
+def test_schema_plan_cache_references() -> None:
+    """Cached plans shouldn't keep classes or schema resolvers alive."""
+    cache = SchemaPlanCache()
+    cls = _make_class(StringField())
+    item_class = cls.Schema.item._object_class # type: ignore
+    cache.get_fingerprint(cls, default_schema_resolver)
+    plan = cache.get(item_class, default_schema_resolver)
+    assert plan is not None
+    plan.get_slotted_class(item_class)
+
+    class_refs = [ref(cls), ref(item_class)]
+    del cls, item_class, plan
+    # Plans of collected classes are released by a first collection.
+    collect()
+    collect()
+    assert [class_ref() for class_ref in class_refs] == [None, None]
+
+    def _resolver(cls: Type[Any]) -> Optional[Type[Any]]:
+        return default_schema_resolver(cls)
+
+    resolver_ref = ref(_resolver)
+    cache.get(_Parent, _resolver)
+    del _resolver
+    for __ in range(100):
+        cache.get(_Parent, lambda cls: default_schema_resolver(cls))
+    collect()
+    assert resolver_ref() is None
+
+
+def test_schema_fingerprint() -> None:
+    """Fingerprints should be stable, and change with field definitions."""
+    def _get(cls: type) -> str:
+        return schema_fingerprint(cls, schema_plans=SchemaPlanCache())
+
+    reference = _get(_make_class(StringField()))
+    assert len(reference) == 64
+    assert _get(_make_class(StringField())) == reference
+    assert _get(_make_class(StringField(required=True))) != reference
+    assert _get(_make_class(IntField())) != reference
+    assert _get(_make_class(StringField(), _Parent)) != reference
+    assert _get(_make_class(StringField(), _Child)) != \
+        _get(_make_class(StringField(), _Parent))
+
+    cls = _make_class(StringField())
+    item_schema = cls.Schema.item._object_class.Schema # type: ignore
+    item_schema.value = IntField(minimum=1)
+    assert _get(cls) != reference
+
+    cls = _make_class(StringField())
+    cls.Schema.name = StringField(pattern='^[a-z]*$') # type: ignore
+    assert _get(cls) != reference
+
+    def validate(__: Any, ___: ILoadingContext, ____: Any) -> bool:
+        return True
+
+    cls = _make_class(StringField())
+    cls.Schema.validate = classmethod(validate) # type: ignore
+    assert _get(cls) != reference
+
+
+def test_schema_fingerprint_memoization() -> None:
+    """Fingerprints should be computed once, until the plan is invalidated."""
+    cache = SchemaPlanCache()
+    cls = _make_class(StringField())
+    fingerprint = cache.get_fingerprint(cls, default_schema_resolver)
+    cls.Schema.name = StringField() # type: ignore
+    assert cache.get_fingerprint(cls, default_schema_resolver) == fingerprint
+
+    cache.invalidate(cls)
+    assert cache.get_fingerprint(cls, default_schema_resolver) != fingerprint
+
+    # Invalidating a referenced class resets the fingerprint of the root.
+    fingerprint = cache.get_fingerprint(cls, default_schema_resolver)
+    item_class = cls.Schema.item._object_class # type: ignore
+    item_class.Schema.value = IntField(minimum=1)
+    cache.invalidate(item_class)
+    assert cache.get_fingerprint(cls, default_schema_resolver) != fingerprint
+
+
+def test_recursive_schema_fingerprint() -> None:
+    """Recursive schemas shouldn't depend on the order plans are built in."""
+    class _Node:
+        class Schema:
+            """Pofy fields."""
+
+    class _Tree:
+        class Schema:
+            """Pofy fields."""
+
+            root = ObjectField(_Node)
+
+    _Node.Schema.children = ListField(ObjectField(_Node)) # type: ignore
+    _Node.Schema.tree = ObjectField(_Tree) # type: ignore
+
+    first_cache = SchemaPlanCache()
+    node_fingerprint = schema_fingerprint(_Node, schema_plans=first_cache)
+    tree_fingerprint = schema_fingerprint(_Tree, schema_plans=first_cache)
+
+    second_cache = SchemaPlanCache()
+    assert schema_fingerprint(_Tree, schema_plans=second_cache) == \
+        tree_fingerprint
+    assert schema_fingerprint(_Node, schema_plans=second_cache) == \
+        node_fingerprint
+    assert node_fingerprint != tree_fingerprint
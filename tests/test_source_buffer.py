@@ -0,0 +1,92 @@
+"""Source buffer tests."""
+from pathlib import Path
+from typing import Any
+from typing import List
+
+from _pytest.monkeypatch import MonkeyPatch
+
+from pofy.common import UNDEFINED
+from pofy.fields.string_field import StringField
+from pofy.loader import load
+from pofy.parser_backend import LIBYAML_AVAILABLE
+from pofy.parser_backend import ParserBackend
+from pofy.parser_backend import compose_document
+from pofy.parser_backend import should_map_files
+from pofy.source_buffer import NamedBuffer
+from pofy.source_buffer import read_file
+
+
+def _get_backends() -> List[ParserBackend]:
+    backends = [ParserBackend.PYTHON]
+    if LIBYAML_AVAILABLE:
+        backends.append(ParserBackend.LIBYAML)
+    return backends
+
+
+def test_read_file(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """Files should be composed the same, whether mapped or read."""
+    file_path = tmp_path / 'file.yaml'
+    file_path.write_bytes('﻿key: [välue]\n'.encode('utf-8'))
+
+    for threshold in [1 << 20, 0]:
+        monkeypatch.setattr('pofy.source_buffer.MMAP_THRESHOLD', threshold)
+        for backend in _get_backends():
+            with read_file(file_path) as buffer:
+                assert buffer.name == str(file_path)
+                assert buffer.size == file_path.stat().st_size
+                node = compose_document(buffer, backend)
+
+            assert node is not None
+            value_node = node.value[0][1].value[0]
+            assert value_node.value == 'välue'
+            assert value_node.start_mark.name == str(file_path)
+            assert value_node.start_mark.line == 0
+            assert value_node.start_mark.column == 6
+
+
+def test_imported_files_encoding(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch
+) -> None:
+    """Imported files should be decoded according to their BOM."""
+    # Empty files can't be mapped, they should be read instead.
+    monkeypatch.setattr('pofy.source_buffer.MMAP_THRESHOLD', 0)
+    (tmp_path / 'utf_8.yaml').write_bytes('﻿valué'.encode('utf-8'))
+    (tmp_path / 'utf_16.yaml').write_bytes('﻿valué'.encode('utf-16-le'))
+    (tmp_path / 'empty.yaml').write_bytes(b'')
+
+    assert load('[!import utf_8.yaml, !import utf_16.yaml]', list,
+                resolve_roots=[tmp_path]) == ['valué', 'valué']
+    assert load('!import empty.yaml', str, root_field=StringField(),
+                resolve_roots=[tmp_path]) is UNDEFINED
+
+
+def test_files_are_mapped_for_libyaml_only(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch
+) -> None:
+    """Files parsed by the python parser shouldn't be memory-mapped."""
+    monkeypatch.setattr('pofy.source_buffer.MMAP_THRESHOLD', 0)
+    (tmp_path / 'file.yaml').write_text('value')
+    use_mmap_flags: List[bool] = []
+
+    def _read_file(path: Path, use_mmap: bool = True) -> NamedBuffer:
+        use_mmap_flags.append(use_mmap)
+        return read_file(path, use_mmap)
+
+    monkeypatch.setattr('pofy.loader.read_file', _read_file)
+    monkeypatch.setattr('pofy.tag_handlers.path_handler.read_file',
+                        _read_file)
+
+    for backend in _get_backends():
+        use_mmap_flags.clear()
+        result: Any = load(tmp_path / 'file.yaml', str,
+                           root_field=StringField(), parser_backend=backend)
+        assert result == 'value'
+        result = load('!import file.yaml', str, root_field=StringField(),
+                      resolve_roots=[tmp_path], parser_backend=backend)
+        assert result == 'value'
+
+        expected = backend == ParserBackend.LIBYAML
+        assert should_map_files(backend) == expected
+        assert use_mmap_flags == [expected, expected]